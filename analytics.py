@@ -0,0 +1,228 @@
+import numpy as np
+from cache import LRUCache
+from fantrax import CACHE_MAX_BYTES, CACHE_MAX_LEAGUES, get_gameweeks
+
+# Result codes in the result matrix.
+UNPLAYED = -1
+LOSS = 0
+DRAW = 1
+WIN = 2
+
+RESULT_LETTERS = np.array(["L", "D", "W"])
+NOT_SEEN = np.iinfo(np.int64).max
+
+def _matrix_nbytes(item):
+    return sum(value.nbytes for value in item[1].values() if isinstance(value, np.ndarray))
+
+# league_key -> (gameweeks, matrix). A refetch replaces the gameweeks list,
+# so an identity check is enough to tell the matrix is still current.
+_matrix_cache = LRUCache(CACHE_MAX_LEAGUES, CACHE_MAX_BYTES // 8, sizer=_matrix_nbytes)
+
+def build_score_matrix(gameweeks):
+    """Turn a league's Gameweek models into dense teams × gameweeks arrays.
+
+    Rows follow the order teams first appear in the schedule. Unplayed
+    fixtures (0-0, as Fantrax reports them) and byes are marked UNPLAYED
+    with an opponent index of -1. `seen` holds each team's position in
+    schedule order per gameweek, used to break ties like the old
+    fixture-by-fixture tables did.
+    """
+    index_by_id = {}
+    team_ids = []
+    team_names = []
+    fixtures = []
+
+    for gw_idx, gameweek in enumerate(gameweeks):
+        for f in gameweek.fixtures:
+            sides = []
+            for team_id, name, score in ((f.away_key, f.away_name, f.away_score),
+                                         (f.home_key, f.home_name, f.home_score)):
+                if team_id not in index_by_id:
+                    index_by_id[team_id] = len(team_ids)
+                    team_ids.append(team_id)
+                    team_names.append(name)
+                sides.append((index_by_id[team_id], score))
+            fixtures.append((gw_idx, sides[0], sides[1]))
+
+    team_count = len(team_ids)
+    gw_count = len(gameweeks)
+    pf = np.zeros((team_count, gw_count), dtype=np.float64)
+    pa = np.zeros((team_count, gw_count), dtype=np.float64)
+    opponent = np.full((team_count, gw_count), -1, dtype=np.int32)
+    is_home = np.zeros((team_count, gw_count), dtype=bool)
+    played = np.zeros((team_count, gw_count), dtype=bool)
+    seen = np.full((team_count, gw_count), NOT_SEEN, dtype=np.int64)
+
+    if fixtures:
+        gw = np.array([f[0] for f in fixtures], dtype=np.int32)
+        away = np.array([f[1][0] for f in fixtures], dtype=np.int32)
+        away_score = np.array([f[1][1] for f in fixtures], dtype=np.float64)
+        home = np.array([f[2][0] for f in fixtures], dtype=np.int32)
+        home_score = np.array([f[2][1] for f in fixtures], dtype=np.float64)
+        fixture_played = ~((away_score == 0.0) & (home_score == 0.0))
+
+        pf[away, gw] = away_score
+        pf[home, gw] = home_score
+        pa[away, gw] = home_score
+        pa[home, gw] = away_score
+        opponent[away, gw] = home
+        opponent[home, gw] = away
+        is_home[home, gw] = True
+        played[away, gw] = fixture_played
+        played[home, gw] = fixture_played
+        position = np.arange(len(fixtures), dtype=np.int64) * 2
+        seen[away, gw] = position
+        seen[home, gw] = position + 1
+
+    result = np.full((team_count, gw_count), UNPLAYED, dtype=np.int8)
+    result[played & (pf > pa)] = WIN
+    result[played & (pf == pa)] = DRAW
+    result[played & (pf < pa)] = LOSS
+
+    return {
+        "team_ids": team_ids,
+        "team_names": team_names,
+        "index_by_id": index_by_id,
+        "pf": pf,
+        "pa": pa,
+        "opponent": opponent,
+        "is_home": is_home,
+        "played": played,
+        "seen": seen,
+        "result": result
+    }
+
+def get_score_matrix(league_key, gameweeks=None):
+    """build_score_matrix for a league, built once per fetched schedule."""
+    if gameweeks is None:
+        gameweeks = get_gameweeks(league_key)
+    cached = _matrix_cache.get(league_key)
+    if cached and cached[0] is gameweeks:
+        return cached[1]
+    matrix = build_score_matrix(gameweeks)
+    _matrix_cache.set(league_key, (gameweeks, matrix))
+    return matrix
+
+def _gameweek_mask(matrix, gameweeks):
+    gw_count = matrix["pf"].shape[1]
+    if gameweeks is None:
+        return np.ones(gw_count, dtype=bool)
+    mask = np.zeros(gw_count, dtype=bool)
+    cols = [gw - 1 for gw in gameweeks if 0 < gw <= gw_count]
+    mask[cols] = True
+    return mask
+
+def standings_table(matrix, gameweeks=None):
+    """Points table (3/1/0, PF tiebreak) over all or selected gameweeks.
+
+    Remaining ties go to whichever team appears first in those gameweeks.
+    """
+    gw_mask = _gameweek_mask(matrix, gameweeks)
+    mask = matrix["played"] & gw_mask
+    result = matrix["result"]
+    w = ((result == WIN) & mask).sum(axis=1)
+    d = ((result == DRAW) & mask).sum(axis=1)
+    l = ((result == LOSS) & mask).sum(axis=1)
+    pts = w * 3 + d
+    pf = np.where(mask, matrix["pf"], 0.0).sum(axis=1)
+    pa = np.where(mask, matrix["pa"], 0.0).sum(axis=1)
+
+    first_seen = np.where(gw_mask, matrix["seen"], NOT_SEEN).min(axis=1)
+
+    # lexsort sorts by the last key first.
+    order = np.lexsort((first_seen, -pf, -pts))
+    return [
+        {
+            "rank": rank + 1,
+            "teamId": matrix["team_ids"][i],
+            "team": matrix["team_names"][i],
+            "pts": int(pts[i]),
+            "w": int(w[i]),
+            "d": int(d[i]),
+            "l": int(l[i]),
+            "pf": float(pf[i]),
+            "pa": float(pa[i])
+        }
+        for rank, i in enumerate(order)
+    ]
+
+def points_against(matrix):
+    """Team id -> total points conceded in played fixtures."""
+    pa = np.where(matrix["played"], matrix["pa"], 0.0).sum(axis=1)
+    return dict(zip(matrix["team_ids"], pa.tolist()))
+
+def motm_table(matrix, gameweeks):
+    rows = standings_table(matrix, gameweeks)
+    for row in rows:
+        row["winner"] = row["rank"] == 1
+    return rows
+
+def form(matrix, count=5):
+    """Most recent results per team, newest first, e.g. {"id": "WWDLW"}."""
+    out = {}
+    for i, team_id in enumerate(matrix["team_ids"]):
+        results = matrix["result"][i][matrix["played"][i]]
+        recent = results[-count:][::-1]
+        out[team_id] = "".join(RESULT_LETTERS[recent])
+    return out
+
+def all_play_record(matrix):
+    """Record each team would have if it played every other team every gameweek."""
+    pf = matrix["pf"]
+    played = matrix["played"]
+    # teams × teams × gameweeks comparisons, limited to gameweeks both played.
+    both = played[:, None, :] & played[None, :, :]
+    diagonal = np.arange(len(matrix["team_ids"]))
+    both[diagonal, diagonal, :] = False
+    wins = ((pf[:, None, :] > pf[None, :, :]) & both).sum(axis=(1, 2))
+    draws = ((pf[:, None, :] == pf[None, :, :]) & both).sum(axis=(1, 2))
+    losses = ((pf[:, None, :] < pf[None, :, :]) & both).sum(axis=(1, 2))
+    games = wins + draws + losses
+
+    return {
+        team_id: {
+            "w": int(wins[i]),
+            "d": int(draws[i]),
+            "l": int(losses[i]),
+            "win_pct": round(float((wins[i] + 0.5 * draws[i]) / games[i]), 4) if games[i] else 0.0
+        }
+        for i, team_id in enumerate(matrix["team_ids"])
+    }
+
+def head_to_head(matrix):
+    """Teams × teams wins/draws/losses and points for, from actual fixtures."""
+    team_count = len(matrix["team_ids"])
+    team_idx, gw_idx = np.nonzero(matrix["played"])
+    opp_idx = matrix["opponent"][team_idx, gw_idx]
+    results = matrix["result"][team_idx, gw_idx]
+
+    wins = np.zeros((team_count, team_count), dtype=np.int64)
+    draws = np.zeros((team_count, team_count), dtype=np.int64)
+    losses = np.zeros((team_count, team_count), dtype=np.int64)
+    points_for = np.zeros((team_count, team_count), dtype=np.float64)
+    np.add.at(wins, (team_idx, opp_idx), results == WIN)
+    np.add.at(draws, (team_idx, opp_idx), results == DRAW)
+    np.add.at(losses, (team_idx, opp_idx), results == LOSS)
+    np.add.at(points_for, (team_idx, opp_idx), matrix["pf"][team_idx, gw_idx])
+
+    return {
+        "team_ids": list(matrix["team_ids"]),
+        "w": wins.tolist(),
+        "d": draws.tolist(),
+        "l": losses.tolist(),
+        "pf": np.round(points_for, 2).tolist()
+    }
+
+def get_league_analytics(league_key, gameweeks=None):
+    matrix = get_score_matrix(league_key, gameweeks)
+    table = standings_table(matrix)
+    recent = form(matrix)
+    all_play = all_play_record(matrix)
+    for row in table:
+        row["form"] = recent[row["teamId"]]
+        row["all_play"] = all_play[row["teamId"]]
+    return {
+        "league": league_key,
+        "table": table,
+        "head_to_head": head_to_head(matrix)
+    }
@@ -1,87 +1,153 @@
 import os
-from flask import Flask, render_template, jsonify, request
+import gzip
+import functools
+from flask import Flask, render_template, jsonify, request, abort, g
 from fantrax import (
     LEAGUES as FANTRAX_LEAGUE_IDS,
+    LEAGUE_NAMES,
+    count_ended,
     get_standings,
-    get_all_team_id_maps,
-    get_team_fixtures,
+    get_league_fixtures,
     get_public_team_url,
-    get_league_for_id,
-    get_schedule
+    get_gameweeks,
+    get_schedule_version,
+    get_versioned_gameweeks,
+    get_standings_version
 )
-from motm import calculate_motm, load_motm_config
+from motm import MOTM_CONFIG_FILE, calculate_motm, load_motm_config
+from analytics import get_league_analytics
+from models import CupMatch
+from live import get_changes, get_version as get_change_version, start_live_poller
+from cup_sync import sync_cup_scores, start_cup_sync
+from warmup import readiness, start_warmup
+from teams import get_directory_version, get_team_league, get_team_names
+from archive import all_time_table, get_archive_version, head_to_head, list_seasons, team_honours
+from responses import API_CACHE, GZIP_LEVEL, GZIP_MIN_BYTES, dumps, get_response, store_response
+from assets import (
+    IMMUTABLE_CACHE,
+    PAGE_CACHE,
+    asset_url,
+    find_asset,
+    get_asset,
+    get_page,
+    pick_encoding
+)
+from projections import get_league_projection, get_cup_odds
 from cup import (
+    CUP_CONFIG_FILE,
     load_cup_config,
     save_cup_config,
     calculate_group_standings,
-    get_cup_round_scores,
+    CONFIG_LOCK,
     get_full_cup_status,
     get_draw_options,
-    get_team_cup_progress
+    get_team_cup_progress,
+    get_cup_index
 )
 
 app = Flask(__name__)
 RULES_FILE = "config/rules.md"
 
-LEAGUES = {
-    "premier_league": "Premier League",
-    "championship": "Championship",
-    "league_one": "League One"
-}
+LEAGUES = LEAGUE_NAMES
 
 MONTHS = [
     "August", "September", "October", "November",
     "December", "January", "February", "March", "April", "May"
 ]
 
-def _to_float(value):
-    try:
-        return float(value) if value not in (None, "") else 0.0
-    except (TypeError, ValueError):
-        return 0.0
-
-def _latest_completed_gameweek(schedule):
-    for idx in range(len(schedule) - 1, -1, -1):
-        gw_data = schedule[idx]
-        rows = gw_data.get("rows", [])
-        if not rows:
+def _latest_completed_gameweek(gameweeks):
+    for gameweek in reversed(gameweeks):
+        if not gameweek.fixtures or not all(f.played for f in gameweek.fixtures):
             continue
 
         matches = []
-        complete = True
-        for row in rows:
-            cells = row.get("cells", [])
-            if len(cells) < 4:
-                complete = False
-                break
-
-            away_score = _to_float(cells[1].get("content"))
-            home_score = _to_float(cells[3].get("content"))
-            played = not (away_score == 0.0 and home_score == 0.0)
-            if not played:
-                complete = False
-                break
-
-            away_name = cells[0].get("content", "")
-            home_name = cells[2].get("content", "")
+        for f in gameweek.fixtures:
             winner = None
-            if home_score > away_score:
-                winner = home_name
-            elif away_score > home_score:
-                winner = away_name
+            if f.home_score > f.away_score:
+                winner = f.home_name
+            elif f.away_score > f.home_score:
+                winner = f.away_name
 
             matches.append({
-                "away": away_name,
-                "away_score": away_score,
-                "home": home_name,
-                "home_score": home_score,
+                "away": f.away_name,
+                "away_score": f.away_score,
+                "home": f.home_name,
+                "home_score": f.home_score,
                 "winner": winner
             })
-
-        if complete:
-            return idx + 1, matches
+        return gameweek.number, matches
     return None, []
 
+def _parse_fields(raw):
+    """"a,b.c,d.*.e" -> {"a": {}, "b": {"c": {}}, "d": {"*": {"e": {}}}}; {} means the whole value."""
+    tree = {}
+    for path in raw.split(","):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+def _project(value, tree):
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if isinstance(value, dict):
+        projected = {}
+        for key, item in value.items():
+            subtree = tree.get(key, tree.get("*"))
+            if subtree is not None:
+                projected[key] = _project(item, subtree)
+        return projected
+    return value
+
+def _compact(value):
+    """Lists of same-shaped dicts become {"columns": [...], "rows": [[...], ...]}."""
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value):
+            columns = list(value[0].keys())
+            if all(list(item.keys()) == columns for item in value):
+                return {
+                    "columns": columns,
+                    "rows": [[_compact(item[c]) for c in columns] for item in value]
+                }
+        return [_compact(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _compact(item) for key, item in value.items()}
+    return value
+
+def _success(data):
+    """Success envelope, honouring ?fields= projection and ?compact=1."""
+    fields = request.args.get("fields")
+    if fields:
+        data = _project(data, _parse_fields(fields))
+    if request.args.get("compact") in ("1", "true"):
+        data = _compact(data)
+    body = dumps({"success": True, "data": data})
+    # Picked up by _cached() so the body is encoded only once.
+    g.success_body = body
+    return app.response_class(body, mimetype="application/json")
+
+@app.after_request
+def _gzip_response(response):
+    if (
+        response.mimetype != "application/json"
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or "gzip" not in request.headers.get("Accept-Encoding", "").lower()
+    ):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
 def _require_admin():
     expected = os.environ.get("CUP_ADMIN_KEY", "fantrax13")
     provided = request.headers.get("X-Admin-Key", "")
@@ -101,26 +167,120 @@ def _save_rules_markdown(markdown_text):
 
 # ── MAIN PAGE ──────────────────────────────────────────────────────────────────
 
+def _send_variants(item, cache_control, etag=None):
+    """Serve a pre-compressed body in the best encoding the client accepts."""
+    if etag and request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        encoding = pick_encoding(request.headers.get("Accept-Encoding"), item["variants"])
+        response = app.response_class(item["variants"][encoding], mimetype=item["mimetype"])
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = cache_control
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
+
+def _cached(version):
+    """Serve a view's success body pre-encoded, per path, query and data version.
+
+    `version(**view_args)` must be cheap (cache lookups, file mtimes) and
+    change whenever anything the view reads does. Errors are never cached.
+    """
+    def decorate(view):
+        @functools.wraps(view)
+        def wrapper(**view_args):
+            try:
+                key = (request.path, tuple(sorted(request.args.items(multi=True))), version(**view_args))
+            except Exception:
+                # e.g. an unknown league; the view reports it in its own envelope.
+                return view(**view_args)
+            item = get_response(key)
+            if item is None:
+                g.success_body = None
+                response = view(**view_args)
+                body = g.pop("success_body", None)
+                if body is None:
+                    return response
+                item = store_response(key, body)
+            return _send_variants(item, API_CACHE, etag=item["etag"])
+        return wrapper
+    return decorate
+
+def _file_version(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _league_version(league_key):
+    return get_schedule_version(league_key), get_standings_version(league_key)
+
+def _clock_version(league_key):
+    """Schedule version plus how many gameweeks have ended.
+
+    Results go final (and MOTM months complete) when a gameweek's end date
+    passes, which needn't change any score, so the clock has to be part of
+    the key.
+    """
+    gameweeks, version = get_versioned_gameweeks(league_key)
+    return version, count_ended(gameweeks)
+
+def _motm_version(league_key):
+    return _clock_version(league_key), _file_version(MOTM_CONFIG_FILE)
+
+def _schedules_version(league_keys=None):
+    return tuple(get_schedule_version(league_key) for league_key in (league_keys or LEAGUES))
+
+def _clock_versions():
+    return tuple(_clock_version(league_key) for league_key in LEAGUES)
+
+def _cup_version(**_):
+    return _file_version(CUP_CONFIG_FILE), get_directory_version()
+
+def _page_key():
+    template = os.path.join(app.root_path, app.template_folder, "index.html")
+    return (
+        os.stat(template).st_mtime_ns,
+        get_asset("app.css")["hash"],
+        get_asset("app.js")["hash"],
+        tuple(LEAGUES.items()),
+        tuple(MONTHS)
+    )
+
 @app.route("/")
 def index():
-    return render_template(
+    page = get_page(_page_key(), lambda: render_template(
         "index.html",
         leagues=LEAGUES,
         months=MONTHS,
-        fantrax_league_ids=FANTRAX_LEAGUE_IDS
-    )
+        fantrax_league_ids=FANTRAX_LEAGUE_IDS,
+        asset_url=asset_url
+    ))
+    return _send_variants(page, PAGE_CACHE, etag=page["etag"])
+
+@app.route("/assets/<name>")
+def assets(name):
+    asset = find_asset(name)
+    if asset is None:
+        abort(404)
+    return _send_variants(asset, IMMUTABLE_CACHE, etag=asset["hash"])
 
 # ── STANDINGS ──────────────────────────────────────────────────────────────────
 
 @app.route("/api/standings/<league_key>")
+@_cached(_league_version)
 def api_standings(league_key):
     try:
         data = get_standings(league_key)
-        return jsonify({"success": True, "data": data})
+        return _success(data)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
 @app.route("/api/teams")
+@_cached(lambda: tuple(_league_version(league_key) for league_key in LEAGUES))
 def api_teams():
     try:
         data = {}
@@ -138,30 +298,54 @@ def api_teams():
                     for t in standings
                 ]
             }
-        return jsonify({"success": True, "data": data})
+        return _success(data)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+@app.route("/api/analytics/<league_key>")
+@_cached(get_schedule_version)
+def api_analytics(league_key):
+    try:
+        if league_key not in LEAGUES:
+            return jsonify({"success": False, "error": f"Unknown league: {league_key}"}), 404
+        data = get_league_analytics(league_key)
+        return _success(data)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+@app.route("/api/projections/<league_key>")
+@_cached(_clock_version)
+def api_projections(league_key):
+    try:
+        if league_key not in LEAGUES:
+            return jsonify({"success": False, "error": f"Unknown league: {league_key}"}), 404
+        data = get_league_projection(league_key, request.args.get("sims", type=int))
+        return _success(data)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
 # ── MOTM ───────────────────────────────────────────────────────────────────────
 
 @app.route("/api/motm/<league_key>/<month>")
+@_cached(lambda league_key, month: _motm_version(league_key))
 def api_motm(league_key, month):
     try:
         result = calculate_motm(league_key, month)
-        return jsonify({"success": True, "data": result})
+        return _success(result)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
 # ── RULES ──────────────────────────────────────────────────────────────────────
 
 @app.route("/api/rules")
+@_cached(lambda: _file_version(RULES_FILE))
 def api_rules():
     try:
         markdown = _load_rules_markdown()
         updated_at = None
         if os.path.exists(RULES_FILE):
             updated_at = int(os.path.getmtime(RULES_FILE))
-        return jsonify({"success": True, "data": {"markdown": markdown, "updated_at": updated_at}})
+        return _success({"markdown": markdown, "updated_at": updated_at})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
@@ -193,52 +377,59 @@ def api_rules_save():
 # ── CUP ────────────────────────────────────────────────────────────────────────
 
 @app.route("/api/cup/groups")
+@_cached(_cup_version)
 def api_cup_groups():
     try:
-        config = load_cup_config()
-        id_map = get_all_team_id_maps()
-        groups = calculate_group_standings(config, id_map)
-        return jsonify({"success": True, "data": groups})
+        groups = calculate_group_standings(get_team_names())
+        return _success(groups)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
 @app.route("/api/cup/round/<round_name>")
+@_cached(_cup_version)
 def api_cup_round(round_name):
     try:
+        # Scores are kept current by the cup sync worker; this only reads.
         config = load_cup_config()
-        id_map = get_all_team_id_maps()
-        round_data = get_cup_round_scores(config, round_name, id_map)
-        
+        id_map = get_team_names()
+        round_data = config[round_name]
+
         # Resolve team names for display
         matches = []
-        for match in round_data["matches"]:
+        for match in map(CupMatch.from_dict, round_data["matches"]):
             matches.append({
-                "home_id": match["home"],
-                "home": id_map.get(match["home"], match["home"]),
-                "away_id": match["away"],
-                "away": id_map.get(match["away"], match["away"]),
-                "leg1_gw": match["leg1_gw"],
-                "leg1_home": match["leg1_home"],
-                "leg1_away": match["leg1_away"],
-                "leg2_gw": match.get("leg2_gw"),
-                "leg2_home": match.get("leg2_home"),
-                "leg2_away": match.get("leg2_away"),
-                "home_agg": (match["leg1_home"] or 0) + (match.get("leg2_home") or 0),
-                "away_agg": (match["leg1_away"] or 0) + (match.get("leg2_away") or 0),
-                "winner_id": match["winner"],
-                "winner": id_map.get(match["winner"], match["winner"]) if match["winner"] else None
+                "home_id": match.home,
+                "home": id_map.get(match.home, match.home),
+                "away_id": match.away,
+                "away": id_map.get(match.away, match.away),
+                "leg1_gw": match.leg1_gw,
+                "leg1_home": match.leg1_home,
+                "leg1_away": match.leg1_away,
+                "leg2_gw": match.leg2_gw,
+                "leg2_home": match.leg2_home,
+                "leg2_away": match.leg2_away,
+                "home_agg": match.home_agg,
+                "away_agg": match.away_agg,
+                "winner_id": match.winner,
+                "winner": id_map.get(match.winner, match.winner) if match.winner else None
             })
         
-        return jsonify({"success": True, "data": matches})
+        return _success(matches)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
 @app.route("/api/cup/refresh/<round_name>", methods=["POST"])
 def api_cup_refresh(round_name):
+    """Force an immediate sync of one round, ahead of the background worker"""
     try:
-        config = load_cup_config()
-        id_map = get_all_team_id_maps()
-        get_cup_round_scores(config, round_name, id_map)
+        ok, err = _require_admin()
+        if not ok:
+            message, status = err
+            return jsonify({"success": False, "error": message}), status
+
+        result = sync_cup_scores(rounds=[round_name])
+        if round_name not in result["live"]:
+            return jsonify({"success": True, "message": f"{round_name} has nothing to sync"})
         return jsonify({"success": True, "message": f"{round_name} scores refreshed"})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
@@ -252,54 +443,55 @@ def api_cup_draw(round_name):
             message, status = err
             return jsonify({"success": False, "error": message}), status
 
-        config = load_cup_config()
-        payload = request.get_json(silent=True) or {}
-        raw_matches = payload.get("matches", [])
-        options = get_draw_options(config, round_name, get_all_team_id_maps())
-        allowed_ids = {t["id"] for t in options["teams"]}
-        if not raw_matches:
-            return jsonify({"success": False, "error": "No matches provided"}), 400
-
-        schedule = config.get("schedule", {}).get(round_name, {})
-        leg1_gw = schedule.get("leg1")
-        leg2_gw = schedule.get("leg2")
-
-        used = set()
-        matches = []
-        for m in raw_matches:
-            home = m.get("home")
-            away = m.get("away")
-            if not home or not away:
-                return jsonify({"success": False, "error": "Each match must have home and away teams"}), 400
-            if home == away:
-                return jsonify({"success": False, "error": "A team cannot play itself"}), 400
-            if home not in allowed_ids or away not in allowed_ids:
-                return jsonify({"success": False, "error": "Draw includes teams that have not advanced"}), 400
-            if home in used or away in used:
-                return jsonify({"success": False, "error": "A team can only appear once in the draw"}), 400
-            used.add(home)
-            used.add(away)
-            matches.append({
-                "home": home,
-                "away": away,
-                "leg1_gw": leg1_gw,
-                "leg1_home": None,
-                "leg1_away": None,
-                "leg2_gw": leg2_gw,
-                "leg2_home": None,
-                "leg2_away": None,
-                "winner": None
-            })
+        with CONFIG_LOCK:
+            config = load_cup_config()
+            payload = request.get_json(silent=True) or {}
+            raw_matches = payload.get("matches", [])
+            options = get_draw_options(config, round_name, get_team_names())
+            allowed_ids = {t["id"] for t in options["teams"]}
+            if not raw_matches:
+                return jsonify({"success": False, "error": "No matches provided"}), 400
+
+            schedule = config.get("schedule", {}).get(round_name, {})
+            leg1_gw = schedule.get("leg1")
+            leg2_gw = schedule.get("leg2")
+
+            used = set()
+            matches = []
+            for m in raw_matches:
+                home = m.get("home")
+                away = m.get("away")
+                if not home or not away:
+                    return jsonify({"success": False, "error": "Each match must have home and away teams"}), 400
+                if home == away:
+                    return jsonify({"success": False, "error": "A team cannot play itself"}), 400
+                if home not in allowed_ids or away not in allowed_ids:
+                    return jsonify({"success": False, "error": "Draw includes teams that have not advanced"}), 400
+                if home in used or away in used:
+                    return jsonify({"success": False, "error": "A team can only appear once in the draw"}), 400
+                used.add(home)
+                used.add(away)
+                matches.append({
+                    "home": home,
+                    "away": away,
+                    "leg1_gw": leg1_gw,
+                    "leg1_home": None,
+                    "leg1_away": None,
+                    "leg2_gw": leg2_gw,
+                    "leg2_home": None,
+                    "leg2_away": None,
+                    "winner": None
+                })
 
-        if len(matches) * 2 != len(allowed_ids):
-            return jsonify({"success": False, "error": "All advanced teams must be used exactly once"}), 400
+            if len(matches) * 2 != len(allowed_ids):
+                return jsonify({"success": False, "error": "All advanced teams must be used exactly once"}), 400
 
-        if round_name not in config:
-            return jsonify({"success": False, "error": f"Unknown round: {round_name}"}), 400
+            if round_name not in config:
+                return jsonify({"success": False, "error": f"Unknown round: {round_name}"}), 400
 
-        config[round_name]["matches"] = matches
-        save_cup_config(config)
-        return jsonify({"success": True, "message": "Draw saved"})
+            config[round_name]["matches"] = matches
+            save_cup_config(config)
+            return jsonify({"success": True, "message": "Draw saved"})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
@@ -312,104 +504,250 @@ def api_cup_draw_options(round_name):
             return jsonify({"success": False, "error": message}), status
 
         config = load_cup_config()
-        id_map = get_all_team_id_maps()
+        id_map = get_team_names()
         options = get_draw_options(config, round_name, id_map)
-        return jsonify({"success": True, "data": options})
+        return _success(options)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
 @app.route("/api/cup/current_round")
+@_cached(_cup_version)
 def api_cup_current_round():
     try:
-        config = load_cup_config()
-        from fantrax import get_current_round
-        round_name = get_current_round(config)
-        return jsonify({"success": True, "data": round_name})
+        round_name = get_cup_index()["current_round"]
+        return _success(round_name)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
+def _league_profile_context(league_key, motm_config):
+    """Everything a league's team profiles need, from one schedule fetch."""
+    gameweeks = get_gameweeks(league_key)
+    standings = get_standings(league_key, gameweeks=gameweeks)
+
+    awards_by_team = {}
+    for month in motm_config.keys():
+        result = calculate_motm(league_key, month, gameweeks=gameweeks)
+        if not result.get("month_complete"):
+            continue
+        winner = next((r for r in result["results"] if r.get("winner")), None)
+        winner_played = (winner["w"] + winner["d"] + winner["l"]) if winner else 0
+        if winner and winner_played > 0:
+            awards_by_team.setdefault(winner.get("teamId"), []).append({
+                "month": month,
+                "league": LEAGUES[league_key]
+            })
+
+    return {
+        "standings": standings,
+        "rows_by_team_id": {t["teamId"]: t for t in standings},
+        "rank_by_team_id": {t["teamId"]: t["rank"] for t in standings},
+        "fixtures_by_team_id": get_league_fixtures(league_key, count=5, gameweeks=gameweeks),
+        "awards_by_team_id": awards_by_team
+    }
+
+def _build_team_profile(team_id, league_key, context):
+    team_row = context["rows_by_team_id"].get(team_id)
+    if not team_row:
+        return None
+
+    fixtures = context["fixtures_by_team_id"].get(team_id, {"last5": [], "next5": []})
+    fixtures = {bucket: [f.to_team_dict(team_id) for f in fixtures[bucket]] for bucket in ("last5", "next5")}
+    for bucket in fixtures.values():
+        for fx in bucket:
+            fx["opponent_rank"] = context["rank_by_team_id"].get(fx["opponent_id"])
+    cup = get_team_cup_progress(team_id)
+    awards = context["awards_by_team_id"].get(team_id, [])
+
+    played = team_row["w"] + team_row["d"] + team_row["l"]
+    avg_ppg = round(team_row["pf"] / played, 2) if played else 0.0
+
+    return {
+        "team": {
+            "id": team_id,
+            "name": team_row["teamName"],
+            "league_key": league_key,
+            "league_name": LEAGUES[league_key],
+            "fantrax_url": get_public_team_url(league_key, team_id)
+        },
+        "league": {
+            "rank": team_row["rank"],
+            "played": played,
+            "pf": team_row["pf"],
+            "pa": team_row["pa"],
+            "pd": team_row["pd"],
+            "avg_ppg": avg_ppg
+        },
+        "fixtures": fixtures,
+        "cup": cup,
+        "motm": {
+            "count": len(awards),
+            "awards": list(awards)
+        }
+    }
+
+@app.route("/api/cup/odds")
+@_cached(lambda: (_cup_version(), _clock_versions()))
+def api_cup_odds():
+    try:
+        data = get_cup_odds(request.args.get("sims", type=int))
+        return _success(data)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+def _profile_inputs_version(league_keys):
+    # MOTM awards depend on the clock as well as the data.
+    return (
+        tuple((_league_version(league_key), _motm_version(league_key)) for league_key in league_keys),
+        _cup_version()
+    )
+
+def _profile_version(team_id):
+    league_key = get_team_league(team_id)
+    return _profile_inputs_version([league_key] if league_key else []), league_key
+
+def _profiles_version():
+    league_filter = request.args.get("league")
+    return _profile_inputs_version([league_filter] if league_filter in LEAGUES else LEAGUES)
+
 @app.route("/api/team/profile/<team_id>")
+@_cached(_profile_version)
 def api_team_profile(team_id):
     try:
-        cup_config = load_cup_config()
-        league_key = get_league_for_id(team_id, cup_config)
+        league_key = get_team_league(team_id)
         if not league_key:
             return jsonify({"success": False, "error": "Team not found"}), 404
 
-        standings = get_standings(league_key)
-        team_row = next((t for t in standings if t["teamId"] == team_id), None)
-        if not team_row:
+        context = _league_profile_context(league_key, load_motm_config())
+        data = _build_team_profile(team_id, league_key, context)
+        if not data:
             return jsonify({"success": False, "error": "Team not found in league standings"}), 404
+        return _success(data)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
 
-        fixtures = get_team_fixtures(league_key, team_id, count=5)
-        rank_by_team_id = {t["teamId"]: t["rank"] for t in standings}
-        for bucket in ("last5", "next5"):
-            for fx in fixtures.get(bucket, []):
-                opp_id = fx.get("opponent_id")
-                fx["opponent_rank"] = rank_by_team_id.get(opp_id)
-        cup = get_team_cup_progress(cup_config, team_id, get_all_team_id_maps())
+@app.route("/api/team/profiles")
+@_cached(_profiles_version)
+def api_team_profiles():
+    """Profiles for every team, one league (?league=) or a list (?ids=a,b)."""
+    try:
+        league_filter = request.args.get("league")
+        raw_ids = request.args.get("ids", "")
+        requested_ids = [tid for tid in (s.strip() for s in raw_ids.split(",")) if tid]
+
+        if league_filter and league_filter not in LEAGUES:
+            return jsonify({"success": False, "error": f"Unknown league: {league_filter}"}), 400
+
+        missing = []
+        ids_by_league = {}
+        if requested_ids:
+            for team_id in requested_ids:
+                league_key = get_team_league(team_id)
+                if not league_key or (league_filter and league_key != league_filter):
+                    missing.append(team_id)
+                    continue
+                ids_by_league.setdefault(league_key, []).append(team_id)
+        else:
+            for league_key in ([league_filter] if league_filter else LEAGUES):
+                ids_by_league[league_key] = None
 
         motm_config = load_motm_config()
-        schedule = get_schedule(league_key)
-        awards = []
-        for month in motm_config.keys():
-            result = calculate_motm(league_key, month, schedule=schedule)
-            if not result.get("month_complete"):
-                continue
-            winner = next((r for r in result["results"] if r.get("winner")), None)
-            winner_played = (winner["w"] + winner["d"] + winner["l"]) if winner else 0
-            if winner and winner_played > 0 and winner.get("teamId") == team_id:
-                awards.append({
-                    "month": month,
-                    "league": LEAGUES[league_key]
-                })
-
-        played = team_row["w"] + team_row["d"] + team_row["l"]
-        avg_ppg = round(team_row["pf"] / played, 2) if played else 0.0
-
-        data = {
-            "team": {
-                "id": team_id,
-                "name": team_row["teamName"],
-                "league_key": league_key,
-                "league_name": LEAGUES[league_key],
-                "fantrax_url": get_public_team_url(league_key, team_id)
-            },
-            "league": {
-                "rank": team_row["rank"],
-                "played": played,
-                "pf": team_row["pf"],
-                "pa": team_row["pa"],
-                "pd": team_row["pd"],
-                "avg_ppg": avg_ppg
-            },
-            "fixtures": fixtures,
-            "cup": cup,
-            "motm": {
-                "count": len(awards),
-                "awards": awards
-            }
-        }
-        return jsonify({"success": True, "data": data})
+        profiles = {}
+        for league_key, team_ids in ids_by_league.items():
+            context = _league_profile_context(league_key, motm_config)
+            if team_ids is None:
+                team_ids = [t["teamId"] for t in context["standings"]]
+            for team_id in team_ids:
+                profile = _build_team_profile(team_id, league_key, context)
+                if profile is None:
+                    missing.append(team_id)
+                else:
+                    profiles[team_id] = profile
+
+        return _success({"profiles": profiles, "missing": missing})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
 @app.route("/api/gameweek/current")
+@_cached(_schedules_version)
 def api_current_gameweek():
     try:
         data = {}
         for league_key, league_name in LEAGUES.items():
-            schedule = get_schedule(league_key)
-            gw, matches = _latest_completed_gameweek(schedule)
+            gw, matches = _latest_completed_gameweek(get_gameweeks(league_key))
             data[league_key] = {
                 "league_name": league_name,
                 "gw": gw,
                 "matches": matches
             }
-        return jsonify({"success": True, "data": data})
+        return _success(data)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+# ── ARCHIVE ────────────────────────────────────────────────────────────────────
+
+@app.route("/api/archive/seasons")
+@_cached(get_archive_version)
+def api_archive_seasons():
+    try:
+        return _success(list_seasons())
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+@app.route("/api/archive/table")
+@_cached(get_archive_version)
+def api_archive_table():
+    """All-time table (?league=, ?seasons=a,b)"""
+    try:
+        raw_seasons = request.args.get("seasons")
+        seasons = [s.strip() for s in raw_seasons.split(",") if s.strip()] if raw_seasons else None
+        return _success(all_time_table(request.args.get("league"), seasons))
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+@app.route("/api/archive/h2h/<team_a>/<team_b>")
+@_cached(lambda team_a, team_b: get_archive_version())
+def api_archive_h2h(team_a, team_b):
+    try:
+        return _success(head_to_head(team_a, team_b))
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+@app.route("/api/archive/honours/<team_id>")
+@_cached(lambda team_id: get_archive_version())
+def api_archive_honours(team_id):
+    try:
+        return _success(team_honours(team_id))
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+# ── HEALTH ─────────────────────────────────────────────────────────────────────
+
+@app.route("/healthz")
+def healthz():
+    return jsonify({"status": "ok"})
+
+@app.route("/readyz")
+def readyz():
+    ready, detail = readiness()
+    return jsonify(detail), 200 if ready else 503
+
+def _changes_version():
+    # Refreshing the schedules first is what records any new change.
+    league_key = request.args.get("league")
+    return _schedules_version([league_key] if league_key else None), get_change_version()
+
+@app.route("/api/changes")
+@_cached(_changes_version)
+def api_changes():
+    try:
+        data = get_changes(request.args.get("since", type=int), request.args.get("league"))
+        return _success(data)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
 if __name__ == "__main__":
+    start_warmup()
+    start_live_poller()
+    start_cup_sync()
     port = int(os.environ.get("PORT", 5001))
     app.run(host="0.0.0.0", port=port, debug=False)
@@ -0,0 +1,419 @@
+"""Season archive: fixtures, standings, MOTM winners and the cup, kept across seasons.
+
+    python3 archive.py save SEASON [--force]
+    python3 archive.py seasons
+    python3 archive.py table [--league KEY] [--seasons A,B]
+    python3 archive.py h2h TEAM_A TEAM_B
+    python3 archive.py honours TEAM
+
+`save` snapshots the current season from the live data (run it before the
+next season's config replaces cup.json and motm.json). Each season is a
+directory under ARCHIVE_DIR holding one compressed .npz of numpy columns
+per table; teams are stored once per season and referenced by index.
+index.json records which teams appear in which season, so a query only
+opens the seasons and columns it needs, and recently used columns are
+kept in a size-bounded cache. Teams are keyed by Fantrax team id.
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import argparse
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+from cache import LRUCache
+from fantrax import LEAGUES, LEAGUE_NAMES, get_gameweeks, get_standings
+from motm import calculate_motm, load_motm_config
+from cup import ROUNDS, load_cup_config, calculate_group_standings
+from models import CupMatch
+from teams import get_team_league, get_team_names
+from upstream import BACKGROUND, set_default_priority
+
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", "data/archive")
+INDEX_FILE = "index.json"
+META_FILE = "meta.json"
+ARCHIVE_CACHE_MB = float(os.environ.get("ARCHIVE_CACHE_MB", "32"))
+
+_SEASON_PATTERN = re.compile(r"^[\w.-]+$")
+_NO_TEAM = -1
+
+def _columns_nbytes(columns):
+    return sum(array.nbytes for array in columns.values())
+
+# (season, table) -> {column: array}
+_table_cache = LRUCache(256, int(ARCHIVE_CACHE_MB * 1024 * 1024), sizer=_columns_nbytes)
+_meta_cache = {}  # season -> meta.json contents
+_index = (None, None)  # (index.json mtime, index)
+_index_lock = threading.Lock()
+
+# ── WRITING ──────────────────────────────────────────────────────────────────
+
+class _TeamTable:
+    """Per-season team list; other tables store positions into it."""
+
+    def __init__(self, league_codes):
+        self.league_codes = league_codes
+        self.position = {}
+        self.ids, self.names, self.leagues = [], [], []
+
+    def ref(self, team_id, name=None, league_key=None):
+        if not team_id:
+            return _NO_TEAM
+        if team_id not in self.position:
+            self.position[team_id] = len(self.ids)
+            self.ids.append(team_id)
+            self.names.append(name or get_team_names().get(team_id, team_id))
+            league_key = league_key or get_team_league(team_id)
+            self.leagues.append(self.league_codes.get(league_key, -1))
+        return self.position[team_id]
+
+    def columns(self):
+        return {
+            "id": np.array(self.ids, dtype=str),
+            "name": np.array(self.names, dtype=str),
+            "league": np.array(self.leagues, dtype=np.int16)
+        }
+
+def _score(value):
+    return np.nan if value is None else value
+
+def _collect_season():
+    leagues = list(LEAGUES)
+    if len(leagues) > np.iinfo(np.int16).max:
+        raise ValueError(f"Too many leagues to archive: {len(leagues)}")
+    league_codes = {league_key: code for code, league_key in enumerate(leagues)}
+    months = list(load_motm_config())
+    teams = _TeamTable(league_codes)
+    fixtures = {"league": [], "gw": [], "away": [], "home": [], "away_score": [], "home_score": []}
+    standings = {"league": [], "team": [], "rank": [], "w": [], "d": [], "l": [], "pts": [], "pf": [], "pa": []}
+    motm = {"league": [], "month": [], "team": [], "pts": [], "pf": []}
+    complete = True
+
+    for code, league_key in enumerate(leagues):
+        gameweeks = get_gameweeks(league_key)
+        complete = complete and all(gw.complete() for gw in gameweeks)
+        for gw in gameweeks:
+            for f in gw.fixtures:
+                if not f.played:
+                    continue
+                fixtures["league"].append(code)
+                fixtures["gw"].append(gw.number)
+                fixtures["away"].append(teams.ref(f.away_id, f.away_name, league_key))
+                fixtures["home"].append(teams.ref(f.home_id, f.home_name, league_key))
+                fixtures["away_score"].append(f.away_score)
+                fixtures["home_score"].append(f.home_score)
+
+        for row in get_standings(league_key, gameweeks=gameweeks):
+            standings["league"].append(code)
+            standings["team"].append(teams.ref(row["teamId"], row["teamName"], league_key))
+            for column in ("rank", "w", "d", "l", "pts", "pf", "pa"):
+                standings[column].append(row[column])
+
+        for month_code, month in enumerate(months):
+            result = calculate_motm(league_key, month, gameweeks=gameweeks)
+            winner = next((r for r in result.get("results", []) if r.get("winner")), None)
+            if not result.get("month_complete") or not winner or not (winner["w"] + winner["d"] + winner["l"]):
+                continue
+            motm["league"].append(code)
+            motm["month"].append(month_code)
+            motm["team"].append(teams.ref(winner["teamId"], winner["team"], league_key))
+            motm["pts"].append(winner["pts"])
+            motm["pf"].append(winner["pf"])
+
+    cup_config = load_cup_config()
+    cup = {"round": [], "home": [], "away": [], "leg1_home": [], "leg1_away": [],
+           "leg2_home": [], "leg2_away": [], "winner": []}
+    for round_code, round_name in enumerate(ROUNDS):
+        for match in map(CupMatch.from_dict, cup_config.get(round_name, {}).get("matches", [])):
+            cup["round"].append(round_code)
+            cup["home"].append(teams.ref(match.home))
+            cup["away"].append(teams.ref(match.away))
+            for leg in ("leg1_home", "leg1_away", "leg2_home", "leg2_away"):
+                cup[leg].append(_score(getattr(match, leg)))
+            cup["winner"].append(teams.ref(match.winner))
+
+    cup_groups = {"group": [], "team": [], "rank": [], "pts": [], "pf": [], "pa": []}
+    for group_name, rows in calculate_group_standings(get_team_names()).items():
+        for row in rows:
+            cup_groups["group"].append(group_name)
+            cup_groups["team"].append(teams.ref(row["id"], row["name"], row.get("league")))
+            for column in ("rank", "pts", "pf", "pa"):
+                cup_groups[column].append(row[column])
+
+    int8, int16, float32 = np.int8, np.int16, np.float32
+    dtypes = {
+        "fixtures": {"league": int16, "gw": int16, "away": int16, "home": int16,
+                     "away_score": float32, "home_score": float32},
+        "standings": {"league": int16, "team": int16, "rank": int16, "w": int16, "d": int16, "l": int16,
+                      "pts": int16, "pf": float32, "pa": float32},
+        "motm": {"league": int16, "month": int8, "team": int16, "pts": int16, "pf": float32},
+        "cup": {"round": int8, "home": int16, "away": int16, "leg1_home": float32, "leg1_away": float32,
+                "leg2_home": float32, "leg2_away": float32, "winner": int16},
+        "cup_groups": {"group": str, "team": int16, "rank": int8, "pts": int16, "pf": float32, "pa": float32}
+    }
+    raw = {"fixtures": fixtures, "standings": standings, "motm": motm, "cup": cup, "cup_groups": cup_groups}
+    tables = {
+        table: {column: np.array(values, dtype=dtypes[table][column]) for column, values in columns.items()}
+        for table, columns in raw.items()
+    }
+    tables["teams"] = teams.columns()
+    meta = {
+        "leagues": leagues,
+        "league_names": {league_key: LEAGUE_NAMES[league_key] for league_key in leagues},
+        "months": months,
+        "rounds": ROUNDS,
+        "complete": complete
+    }
+    return tables, meta
+
+def _load_index():
+    global _index
+    path = os.path.join(ARCHIVE_DIR, INDEX_FILE)
+    if not os.path.exists(path):
+        return {"seasons": {}}
+    mtime = os.stat(path).st_mtime_ns
+    with _index_lock:
+        cached_mtime, index = _index
+        if cached_mtime != mtime:
+            with open(path, encoding="utf-8") as f:
+                index = json.load(f)
+            _index = (mtime, index)
+        return index
+
+def get_archive_version():
+    """Changes whenever a season is saved; None with no archive."""
+    path = os.path.join(ARCHIVE_DIR, INDEX_FILE)
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def save_season(season, force=False):
+    """Archive the live season under `season` (e.g. "2025-26"); returns its index entry."""
+    if not _SEASON_PATTERN.match(season):
+        raise ValueError(f"Invalid season name: {season}")
+    season_dir = os.path.join(ARCHIVE_DIR, season)
+    if os.path.exists(season_dir) and not force:
+        raise FileExistsError(f"Season {season} is already archived (use --force to replace it)")
+
+    tables, meta = _collect_season()
+    meta = {"season": season, "archived_at": datetime.now(timezone.utc).isoformat(), **meta}
+
+    tmp_dir = season_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for table, columns in tables.items():
+        with open(os.path.join(tmp_dir, f"{table}.npz"), "wb") as f:
+            np.savez_compressed(f, **columns)
+    _write_json(os.path.join(tmp_dir, META_FILE), meta)
+    shutil.rmtree(season_dir, ignore_errors=True)
+    os.replace(tmp_dir, season_dir)
+
+    for key in [key for key in _table_cache.keys() if key[0] == season]:
+        _table_cache.pop(key)
+    _meta_cache.pop(season, None)
+    index = dict(_load_index())
+    entry = {
+        "archived_at": meta["archived_at"],
+        "complete": meta["complete"],
+        "leagues": meta["leagues"],
+        "teams": tables["teams"]["id"].tolist()
+    }
+    index["seasons"] = {**index.get("seasons", {}), season: entry}
+    _write_json(os.path.join(ARCHIVE_DIR, INDEX_FILE), index)
+    return entry
+
+# ── READING ──────────────────────────────────────────────────────────────────
+
+def _table(season, table):
+    key = (season, table)
+    columns = _table_cache.get(key)
+    if columns is None:
+        with np.load(os.path.join(ARCHIVE_DIR, season, f"{table}.npz")) as data:
+            columns = {name: data[name] for name in data.files}
+        _table_cache.set(key, columns)
+    return columns
+
+def _meta(season):
+    meta = _meta_cache.get(season)
+    if meta is None:
+        with open(os.path.join(ARCHIVE_DIR, season, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        _meta_cache[season] = meta
+    return meta
+
+def _seasons_with(*team_ids, seasons=None):
+    index = _load_index()["seasons"]
+    selected = sorted(index) if seasons is None else [s for s in sorted(index) if s in seasons]
+    return [s for s in selected if all(team_id in index[s]["teams"] for team_id in team_ids)]
+
+def _position(season, team_id):
+    matches = np.flatnonzero(_table(season, "teams")["id"] == team_id)
+    return int(matches[0]) if matches.size else _NO_TEAM
+
+def list_seasons():
+    index = _load_index()["seasons"]
+    return [
+        {"season": season, "archived_at": entry["archived_at"], "complete": entry["complete"],
+         "leagues": entry["leagues"], "teams": len(entry["teams"])}
+        for season, entry in sorted(index.items())
+    ]
+
+def all_time_table(league_key=None, seasons=None):
+    """Standings summed over archived seasons, optionally for one league."""
+    totals = {}
+    for season in _seasons_with(seasons=seasons):
+        meta = _meta(season)
+        if league_key is not None and league_key not in meta["leagues"]:
+            continue
+        standings = _table(season, "standings")
+        teams = _table(season, "teams")
+        rows = np.ones(len(standings["team"]), dtype=bool)
+        if league_key is not None:
+            rows = standings["league"] == meta["leagues"].index(league_key)
+        for i in np.flatnonzero(rows):
+            team = int(standings["team"][i])
+            team_id = str(teams["id"][team])
+            total = totals.setdefault(team_id, {"teamId": team_id, "seasons": 0, "titles": 0,
+                                                "w": 0, "d": 0, "l": 0, "pts": 0, "pf": 0.0, "pa": 0.0})
+            # Seasons are visited oldest first, so the latest name and league win.
+            total["teamName"] = str(teams["name"][team])
+            total["league"] = meta["leagues"][int(standings["league"][i])]
+            total["seasons"] += 1
+            # As in team_honours, a season only awards its title once it is complete.
+            total["titles"] += int(meta["complete"] and standings["rank"][i] == 1)
+            for column in ("w", "d", "l", "pts"):
+                total[column] += int(standings[column][i])
+            for column in ("pf", "pa"):
+                total[column] += float(standings[column][i])
+
+    ranked = sorted(totals.values(), key=lambda t: (t["pts"], t["pf"]), reverse=True)
+    for rank, total in enumerate(ranked, start=1):
+        total["rank"] = rank
+        total["pf"] = round(total["pf"], 2)
+        total["pa"] = round(total["pa"], 2)
+        total["pd"] = round(total["pf"] - total["pa"], 2)
+    return ranked
+
+def head_to_head(team_a, team_b, seasons=None):
+    """Every archived league fixture and cup leg between two teams."""
+    record = {"played": 0, "a_wins": 0, "draws": 0, "b_wins": 0, "a_pf": 0.0, "b_pf": 0.0}
+    matches = []
+    names = {}
+
+    def add(season, competition, gw, a_score, b_score, detail):
+        record["played"] += 1
+        record["a_pf"] += a_score
+        record["b_pf"] += b_score
+        record["a_wins" if a_score > b_score else "b_wins" if b_score > a_score else "draws"] += 1
+        matches.append({"season": season, "competition": competition, "gw": gw,
+                        "a_score": a_score, "b_score": b_score, **detail})
+
+    for season in _seasons_with(team_a, team_b, seasons=seasons):
+        meta = _meta(season)
+        teams = _table(season, "teams")
+        a, b = _position(season, team_a), _position(season, team_b)
+        names[team_a], names[team_b] = str(teams["name"][a]), str(teams["name"][b])
+
+        fixtures = _table(season, "fixtures")
+        away, home = fixtures["away"], fixtures["home"]
+        for i in np.flatnonzero(((away == a) & (home == b)) | ((away == b) & (home == a))):
+            a_home = int(home[i]) == a
+            a_score = float(fixtures["home_score"][i] if a_home else fixtures["away_score"][i])
+            b_score = float(fixtures["away_score"][i] if a_home else fixtures["home_score"][i])
+            add(season, meta["leagues"][int(fixtures["league"][i])], int(fixtures["gw"][i]),
+                a_score, b_score, {"a_home": a_home})
+
+        cup = _table(season, "cup")
+        for i in np.flatnonzero(((cup["home"] == a) & (cup["away"] == b)) | ((cup["home"] == b) & (cup["away"] == a))):
+            a_home = int(cup["home"][i]) == a
+            for leg in (1, 2):
+                home_score, away_score = cup[f"leg{leg}_home"][i], cup[f"leg{leg}_away"][i]
+                if np.isnan(home_score) or np.isnan(away_score):
+                    continue
+                a_score, b_score = (home_score, away_score) if a_home else (away_score, home_score)
+                add(season, "cup", None, float(a_score), float(b_score),
+                    {"a_home": a_home, "round": meta["rounds"][int(cup["round"][i])], "leg": leg})
+
+    record["a_pf"] = round(record["a_pf"], 2)
+    record["b_pf"] = round(record["b_pf"], 2)
+    return {
+        "team_a": {"teamId": team_a, "teamName": names.get(team_a)},
+        "team_b": {"teamId": team_b, "teamName": names.get(team_b)},
+        **record,
+        "matches": matches
+    }
+
+def team_honours(team_id):
+    """League finishes, titles, MOTM awards and cup results for one team."""
+    honours = {"teamId": team_id, "teamName": None, "seasons": [], "league_titles": [],
+               "motm": [], "cup_wins": [], "cup_finals": []}
+    final_round = ROUNDS.index("final")
+    for season in _seasons_with(team_id):
+        meta = _meta(season)
+        position = _position(season, team_id)
+        honours["teamName"] = str(_table(season, "teams")["name"][position])
+
+        standings = _table(season, "standings")
+        for i in np.flatnonzero(standings["team"] == position):
+            league_key = meta["leagues"][int(standings["league"][i])]
+            rank = int(standings["rank"][i])
+            honours["seasons"].append({"season": season, "league": league_key, "rank": rank})
+            if rank == 1 and meta["complete"]:
+                honours["league_titles"].append({"season": season, "league": league_key})
+
+        motm = _table(season, "motm")
+        for i in np.flatnonzero(motm["team"] == position):
+            honours["motm"].append({"season": season, "league": meta["leagues"][int(motm["league"][i])],
+                                    "month": meta["months"][int(motm["month"][i])]})
+
+        cup = _table(season, "cup")
+        finals = (cup["round"] == final_round) & ((cup["home"] == position) | (cup["away"] == position))
+        for i in np.flatnonzero(finals):
+            honours["cup_finals"].append(season)
+            if int(cup["winner"][i]) == position:
+                honours["cup_wins"].append(season)
+    return honours
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive seasons and query the archive.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    save = commands.add_parser("save", help="archive the live season")
+    save.add_argument("season")
+    save.add_argument("--force", action="store_true", help="replace an existing archive of this season")
+    commands.add_parser("seasons", help="list archived seasons")
+    table = commands.add_parser("table", help="all-time table")
+    table.add_argument("--league")
+    table.add_argument("--seasons", help="comma-separated seasons")
+    h2h = commands.add_parser("h2h", help="head-to-head record")
+    h2h.add_argument("team_a")
+    h2h.add_argument("team_b")
+    honours = commands.add_parser("honours", help="a team's honours")
+    honours.add_argument("team")
+    args = parser.parse_args(argv)
+    set_default_priority(BACKGROUND)
+
+    if args.command == "save":
+        result = save_season(args.season, force=args.force)
+        result = {"season": args.season, **result, "teams": len(result["teams"])}
+    elif args.command == "seasons":
+        result = list_seasons()
+    elif args.command == "table":
+        result = all_time_table(args.league, args.seasons.split(",") if args.seasons else None)
+    elif args.command == "h2h":
+        result = head_to_head(args.team_a, args.team_b)
+    else:
+        result = team_honours(args.team)
+    json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import os
+import gzip
+import hashlib
+import mimetypes
+import threading
+
+try:
+    import brotli
+except ImportError:  # listed in requirements.txt; without it only gzip variants are served
+    brotli = None
+
+STATIC_DIR = "static"
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+# Fingerprinted URLs never change content, so browsers may keep them for a year.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# The page shell is revalidated against its ETag on each visit.
+PAGE_CACHE = "no-cache"
+
+_asset_lock = threading.Lock()
+_page_lock = threading.Lock()
+_assets = {}  # name -> asset dict, reloaded when the file's mtime changes
+_page = (None, None)  # (render key, variants)
+
+def _variants(body):
+    variants = {"identity": body, "gzip": gzip.compress(body, compresslevel=GZIP_LEVEL)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return variants
+
+def _load_asset(name, mtime):
+    with open(os.path.join(STATIC_DIR, name), "rb") as f:
+        body = f.read()
+    digest = hashlib.sha256(body).hexdigest()[:12]
+    stem, ext = os.path.splitext(name)
+    return {
+        "name": name,
+        "mtime": mtime,
+        "hash": digest,
+        "url_name": f"{stem}.{digest}{ext}",
+        "mimetype": mimetypes.guess_type(name)[0] or "application/octet-stream",
+        "variants": _variants(body)
+    }
+
+def get_asset(name):
+    mtime = os.stat(os.path.join(STATIC_DIR, name)).st_mtime_ns
+    asset = _assets.get(name)
+    if asset is None or asset["mtime"] != mtime:
+        with _asset_lock:
+            asset = _assets.get(name)
+            if asset is None or asset["mtime"] != mtime:
+                asset = _load_asset(name, mtime)
+                _assets[name] = asset
+    return asset
+
+def asset_url(name):
+    return f"/assets/{get_asset(name)['url_name']}"
+
+def find_asset(url_name):
+    """Asset for a fingerprinted file name, or None if it is unknown or stale."""
+    stem, ext = os.path.splitext(url_name)
+    name = f"{stem.rsplit('.', 1)[0]}{ext}"
+    if not os.path.isfile(os.path.join(STATIC_DIR, name)):
+        return None
+    asset = get_asset(name)
+    return asset if asset["url_name"] == url_name else None
+
+def get_page(key, render):
+    """Rendered page shell variants, re-rendered only when `key` changes."""
+    global _page
+    cached_key, page = _page
+    if cached_key == key:
+        return page
+    with _page_lock:
+        cached_key, page = _page
+        if cached_key == key:
+            return page
+        body = render().encode("utf-8")
+        page = {
+            "etag": hashlib.sha256(body).hexdigest()[:16],
+            "mimetype": "text/html",
+            "variants": _variants(body)
+        }
+        _page = (key, page)
+        return page
+
+def pick_encoding(accept_encoding, variants):
+    accepted = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+    for encoding in ("br", "gzip"):
+        if encoding in accepted and encoding in variants:
+            return encoding
+    return "identity"
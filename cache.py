@@ -0,0 +1,105 @@
+import sys
+import threading
+from collections import OrderedDict
+
+def deep_sizeof(obj, _seen=None):
+    """Approximate in-memory size of a value, following containers and slots."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+    elif hasattr(type(obj), "__slots__"):
+        for slot in type(obj).__slots__:
+            if hasattr(obj, slot):
+                size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+class LRUCache:
+    """Thread-safe LRU map bounded by entry count and approximate bytes.
+
+    Sizes are measured once per insert with deep_sizeof (or a custom sizer),
+    so the ceiling holds however many leagues end up being served.
+    """
+
+    def __init__(self, max_entries, max_bytes=None, sizer=deep_sizeof):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizer = sizer
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def peek(self, key, default=None):
+        """Like get, but without counting as a use."""
+        with self._lock:
+            return self._entries.get(key, default)
+
+    def set(self, key, value):
+        size = self._sizer(value) if self.max_bytes else 0
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes.pop(key)
+                del self._entries[key]
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            self._evict()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._bytes -= self._sizes.pop(key)
+            return self._entries.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the ceiling.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            key, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(key)
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -1,5 +1,14 @@
+import os
+import hashlib
 import json
-from fantrax import get_score_by_id, get_league_for_id, get_all_team_id_maps, is_gameweek_complete
+import threading
+from fantrax import (
+    get_score_by_id,
+    get_league_for_id,
+    get_current_round,
+    is_gameweek_complete
+)
+from models import CupMatch, TeamRecord
 
 DRAW_SOURCE_ROUND = {
     "quarter_final": "round_of_16",
@@ -7,96 +16,180 @@ DRAW_SOURCE_ROUND = {
     "final": "semi_final"
 }
 
+CUP_CONFIG_FILE = "config/cup.json"
+# Held across load-modify-save so the score sync and admin draws don't
+# overwrite each other's changes.
+CONFIG_LOCK = threading.Lock()
+
 def load_cup_config():
-    with open("config/cup.json") as f:
+    with open(CUP_CONFIG_FILE) as f:
         return json.load(f)
 
 def save_cup_config(config):
-    with open("config/cup.json", "w") as f:
+    # Write-and-rename so concurrent readers never see a partial file.
+    tmp = CUP_CONFIG_FILE + ".tmp"
+    with open(tmp, "w") as f:
         json.dump(config, f, indent=2)
+    os.replace(tmp, CUP_CONFIG_FILE)
+
+ROUNDS = ["playoff", "round_of_16", "quarter_final", "semi_final", "final"]
+
+ROUND_LABELS = {
+    "playoff": "Playoff",
+    "round_of_16": "Round of 16",
+    "quarter_final": "Quarter Final",
+    "semi_final": "Semi Final",
+    "final": "Final"
+}
+
+# (cup.json (mtime, size), index) — rebuilt only when the saved config changes.
+_cup_index = (None, None)
 
-def calculate_group_standings(config, id_map):
+def get_config_version(config):
+    raw = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def _build_group_standings(config):
     groups = {}
     for group_name, group_data in config["groups"].items():
         team_stats = {}
         for team in group_data["teams"]:
-            team_stats[team["id"]] = {
-                "name": id_map.get(team["id"], team["name"]),
-                "league": team["league"],
-                "pts": 0, "w": 0, "d": 0, "l": 0,
-                "pf": 0.0, "pa": 0.0
-            }
+            team_stats[team["id"]] = TeamRecord(team["id"], team["name"], team["league"])
 
         for match in group_data["matches"]:
-            home_id = match["home"]
-            away_id = match["away"]
             hs = match["home_score"]
             as_ = match["away_score"]
+            team_stats[match["home"]].add_result(hs, as_)
+            team_stats[match["away"]].add_result(as_, hs)
 
-            team_stats[home_id]["pf"] += hs
-            team_stats[home_id]["pa"] += as_
-            team_stats[away_id]["pf"] += as_
-            team_stats[away_id]["pa"] += hs
-
-            if hs > as_:
-                team_stats[home_id]["pts"] += 3
-                team_stats[home_id]["w"] += 1
-                team_stats[away_id]["l"] += 1
-            elif as_ > hs:
-                team_stats[away_id]["pts"] += 3
-                team_stats[away_id]["w"] += 1
-                team_stats[home_id]["l"] += 1
-            else:
-                team_stats[home_id]["pts"] += 1
-                team_stats[away_id]["pts"] += 1
-                team_stats[home_id]["d"] += 1
-                team_stats[away_id]["d"] += 1
-
-        ranked = sorted(team_stats.items(),
-                       key=lambda x: (x[1]["pts"], x[1]["pf"]), reverse=True)
+        ranked = sorted(team_stats.values(), key=lambda r: r.sort_key, reverse=True)
         groups[group_name] = [
-            {"rank": i + 1, "id": tid, **stats}
-            for i, (tid, stats) in enumerate(ranked)
+            {"rank": i + 1, "id": record.team_id, "name": record.name, "league": record.league, **record.stats()}
+            for i, record in enumerate(ranked)
         ]
 
     return groups
 
-def get_cup_round_scores(config, round_name, id_map):
-    """Pull latest API scores for a cup round and update config."""
+def _team_progress(team_id, group_name, group_rank, matches_by_round):
+    progress = "Group Stage"
+    # Round keys: the last one the team has been drawn in, and the one it went out in.
+    furthest_round = "groups"
+    eliminated_in = None
+    for round_name in ROUNDS:
+        team_matches = matches_by_round.get(round_name)
+        if not team_matches:
+            continue
+
+        furthest_round = round_name
+        label = ROUND_LABELS[round_name]
+        unresolved = any(m.get("winner") is None for m in team_matches)
+        if unresolved:
+            progress = label
+            break
+
+        won_all = all(m.get("winner") == team_id for m in team_matches)
+        if won_all:
+            if round_name == "final":
+                progress = "Winner"
+                break
+            next_round = ROUNDS[ROUNDS.index(round_name) + 1]
+            progress = ROUND_LABELS[next_round]
+        else:
+            progress = f"Defeated in {label}"
+            eliminated_in = round_name
+            break
+
+    if progress == "Group Stage" and group_rank and group_rank > 2:
+        progress = "Defeated in Group Stage"
+        eliminated_in = "groups"
+
+    return {
+        "group": group_name,
+        "group_rank": group_rank,
+        "progress": progress,
+        "furthest_round": furthest_round,
+        "eliminated_in": eliminated_in
+    }
+
+def _build_progress_index(config, groups):
+    placement = {}
+    for group_name, standings in groups.items():
+        for entry in standings:
+            placement.setdefault(entry["id"], (group_name, entry["rank"]))
+
+    matches_by_team = {}
+    for round_name in ROUNDS:
+        for match in config.get(round_name, {}).get("matches", []):
+            for team_id in {match.get("home"), match.get("away")}:
+                if team_id:
+                    rounds = matches_by_team.setdefault(team_id, {})
+                    rounds.setdefault(round_name, []).append(match)
+
+    index = {}
+    for team_id in set(placement) | set(matches_by_team):
+        group_name, group_rank = placement.get(team_id, (None, None))
+        index[team_id] = _team_progress(team_id, group_name, group_rank, matches_by_team.get(team_id, {}))
+    return index
+
+def _config_stamp():
+    stat = os.stat(CUP_CONFIG_FILE)
+    return stat.st_mtime_ns, stat.st_size
+
+def get_cup_index():
+    """Group standings, per-team progress and current round for the saved cup config.
+
+    Keyed on cup.json's mtime and size, so repeated calls are a stat and a
+    lookup; the file is only read and the index rebuilt after a save.
+    """
+    global _cup_index
+    stamp = _config_stamp()
+    cached_stamp, index = _cup_index
+    if cached_stamp != stamp:
+        config = load_cup_config()
+        groups = _build_group_standings(config)
+        index = {
+            "groups": groups,
+            "teams": _build_progress_index(config, groups),
+            "current_round": get_current_round(config)
+        }
+        _cup_index = (stamp, index)
+    return index
+
+def calculate_group_standings(id_map):
+    groups = get_cup_index()["groups"]
+    return {
+        group_name: [
+            {**entry, "name": id_map.get(entry["id"], entry["name"])}
+            for entry in standings
+        ]
+        for group_name, standings in groups.items()
+    }
+
+def sync_round_scores(config, round_name):
+    """Pull latest API scores for a cup round into config, saving if anything changed."""
     round_data = config[round_name]
     updated = False
     gw_complete_cache = {}
 
-    for match in round_data["matches"]:
-        home_id = match["home"]
-        away_id = match["away"]
-        home_league = get_league_for_id(home_id, config)
-        away_league = get_league_for_id(away_id, config)
+    for raw in round_data["matches"]:
+        match = CupMatch.from_dict(raw)
+        home_league = get_league_for_id(match.home, config)
+        away_league = get_league_for_id(match.away, config)
 
         # Always refresh scores so live updates continue after the first write.
-        if home_league:
-            score = get_score_by_id(home_id, match["leg1_gw"], home_league)
-            if score is not None and match.get("leg1_home") != score:
-                match["leg1_home"] = score
-                updated = True
-        if away_league:
-            score = get_score_by_id(away_id, match["leg1_gw"], away_league)
-            if score is not None and match.get("leg1_away") != score:
-                match["leg1_away"] = score
-                updated = True
-
-        if match.get("leg2_gw") and home_league:
-            score = get_score_by_id(home_id, match["leg2_gw"], home_league)
-            if score is not None and match.get("leg2_home") != score:
-                match["leg2_home"] = score
-                updated = True
-        if match.get("leg2_gw") and away_league:
-            score = get_score_by_id(away_id, match["leg2_gw"], away_league)
-            if score is not None and match.get("leg2_away") != score:
-                match["leg2_away"] = score
-                updated = True
-
-        leg2_gw = match.get("leg2_gw")
+        legs = [("leg1_home", match.home, home_league, match.leg1_gw),
+                ("leg1_away", match.away, away_league, match.leg1_gw)]
+        if match.leg2_gw:
+            legs += [("leg2_home", match.home, home_league, match.leg2_gw),
+                     ("leg2_away", match.away, away_league, match.leg2_gw)]
+        for attr, team_id, league_key, gw in legs:
+            if not league_key:
+                continue
+            score = get_score_by_id(team_id, gw, league_key)
+            if score is not None and getattr(match, attr) != score:
+                setattr(match, attr, score)
+
+        leg2_gw = match.leg2_gw
         can_decide = False
         if leg2_gw and home_league and away_league:
             home_key = (home_league, leg2_gw)
@@ -109,32 +202,32 @@ def get_cup_round_scores(config, round_name, id_map):
         elif leg2_gw is None:
             can_decide = True
 
-        has_leg1_scores = match["leg1_home"] is not None and match["leg1_away"] is not None
-        has_leg2_scores = (match.get("leg2_home") is not None and match.get("leg2_away") is not None) if leg2_gw else True
+        has_leg1_scores = match.leg1_home is not None and match.leg1_away is not None
+        has_leg2_scores = (match.leg2_home is not None and match.leg2_away is not None) if leg2_gw else True
 
         # Calculate winner only once the deciding gameweek is complete.
         if can_decide and has_leg1_scores and has_leg2_scores:
-            home_agg = (match["leg1_home"] or 0) + (match.get("leg2_home") or 0)
-            away_agg = (match["leg1_away"] or 0) + (match.get("leg2_away") or 0)
             winner = None
-            if home_agg > away_agg:
-                winner = home_id
-            elif away_agg > home_agg:
-                winner = away_id
-            if match.get("winner") != winner:
-                match["winner"] = winner
-                updated = True
-        elif match.get("winner") is not None:
-            match["winner"] = None
+            if match.home_agg > match.away_agg:
+                winner = match.home
+            elif match.away_agg > match.home_agg:
+                winner = match.away
+            match.winner = winner
+        else:
+            match.winner = None
+
+        fresh = match.to_dict()
+        if any(raw.get(key) != value for key, value in fresh.items()):
+            raw.update(fresh)
             updated = True
 
     if updated:
         save_cup_config(config)
 
-    return round_data
+    return updated
 
 def get_full_cup_status(config, id_map):
-    groups = calculate_group_standings(config, id_map)
+    groups = calculate_group_standings(id_map)
     return {
         "groups": groups,
         "playoff": config["playoff"],
@@ -161,85 +254,8 @@ def get_draw_options(config, round_name, id_map):
     teams = [{"id": tid, "name": id_map.get(tid, tid)} for tid in ordered_unique]
     return {"teams": teams, "match_count": len(teams) // 2}
 
-def get_team_cup_progress(config, team_id, id_map):
-    groups = calculate_group_standings(config, id_map)
-    group_rank = None
-    group_name = None
-    for g_name, standings in groups.items():
-        for entry in standings:
-            if entry["id"] == team_id:
-                group_rank = entry["rank"]
-                group_name = g_name
-                break
-        if group_rank is not None:
-            break
-
-    rounds = ["playoff", "round_of_16", "quarter_final", "semi_final", "final"]
-    round_labels = {
-        "playoff": "Playoff",
-        "round_of_16": "Round of 16",
-        "quarter_final": "Quarter Final",
-        "semi_final": "Semi Final",
-        "final": "Final"
-    }
-
-    progress = "Group Stage"
-    for round_name in rounds:
-        matches = config.get(round_name, {}).get("matches", [])
-        team_matches = [m for m in matches if team_id in (m.get("home"), m.get("away"))]
-        if not team_matches:
-            continue
-
-        label = round_labels[round_name]
-        unresolved = any(m.get("winner") is None for m in team_matches)
-        if unresolved:
-            progress = label
-            break
-
-        won_all = all(m.get("winner") == team_id for m in team_matches)
-        if won_all:
-            if round_name == "final":
-                progress = "Winner"
-                break
-            next_round = rounds[rounds.index(round_name) + 1]
-            progress = round_labels[next_round]
-        else:
-            progress = f"Defeated in {label}"
-            break
-
-    if progress == "Group Stage" and group_rank and group_rank > 2:
-        progress = "Defeated in Group Stage"
-
-    return {
-        "group": group_name,
-        "group_rank": group_rank,
-        "progress": progress
-    }
-
-if __name__ == "__main__":
-    config = load_cup_config()
-    id_map = get_all_team_id_maps()
-
-    print("=== GROUP STANDINGS ===")
-    groups = calculate_group_standings(config, id_map)
-    for group_name, standings in groups.items():
-        print(f"\nGroup {group_name}")
-        print(f"{'Rank':<6} {'Team':<30} {'Pts':>4} {'W':>3} {'D':>3} {'L':>3} {'PF':>8} {'PA':>8}")
-        print("-" * 65)
-        for team in standings:
-            print(f"{team['rank']:<6} {team['name']:<30} {team['pts']:>4} {team['w']:>3} {team['d']:>3} {team['l']:>3} {team['pf']:>8} {team['pa']:>8}")
-
-    print("\n=== ROUND OF 16 ===")
-    r16 = get_cup_round_scores(config, "round_of_16", id_map)
-    for match in r16["matches"]:
-        home_name = id_map.get(match["home"], match["home"])
-        away_name = id_map.get(match["away"], match["away"])
-        l1h = match["leg1_home"] or 0
-        l1a = match["leg1_away"] or 0
-        l2h = match["leg2_home"] or 0
-        l2a = match["leg2_away"] or 0
-        home_agg = l1h + l2h
-        away_agg = l1a + l2a
-        winner_id = match["winner"]
-        winner = f" → {id_map.get(winner_id, winner_id)}" if winner_id else " (in progress)"
-        print(f"{home_name} {home_agg} vs {away_agg} {away_name}{winner}")
+def get_team_cup_progress(team_id):
+    progress = get_cup_index()["teams"].get(team_id)
+    if progress is None:
+        return _team_progress(team_id, None, None, {})
+    return dict(progress)
@@ -0,0 +1,75 @@
+import os
+import time
+import logging
+import threading
+from fantrax import get_gameweeks, get_league_for_id
+from cup import CONFIG_LOCK, ROUNDS, load_cup_config, sync_round_scores
+from live import current_gameweek
+from upstream import LIVE, upstream_priority
+
+logger = logging.getLogger(__name__)
+
+# Seconds between score syncs while a cup round is being played; 0 disables the worker.
+CUP_SYNC_SECONDS = float(os.environ.get("CUP_SYNC_SECONDS", "60"))
+# Before a round's first leg nothing can change, so only check back occasionally.
+CUP_IDLE_SECONDS = float(os.environ.get("CUP_IDLE_SECONDS", "900"))
+
+_worker = None
+
+def _pending_rounds(config):
+    """Drawn rounds that still have a match without a winner."""
+    return [
+        round_name for round_name in ROUNDS
+        if any(m["winner"] is None for m in config.get(round_name, {}).get("matches", []))
+    ]
+
+def _round_started(config, round_name):
+    """True once any league involved has reached the round's first leg gameweek."""
+    matches = config[round_name]["matches"]
+    first_gw = min((m["leg1_gw"] for m in matches if m.get("leg1_gw")), default=None)
+    if first_gw is None:
+        return False
+    leagues = {get_league_for_id(team_id, config) for m in matches for team_id in (m["home"], m["away"])}
+    leagues.discard(None)
+    return any((current_gameweek(get_gameweeks(league_key)) or 0) >= first_gw for league_key in leagues)
+
+def sync_cup_scores(rounds=None):
+    """Sync leg scores and winners for undecided rounds whose legs have started.
+
+    Returns {"live": rounds synced, "updated": rounds whose saved config changed}.
+    """
+    with CONFIG_LOCK:
+        config = load_cup_config()
+        live = [
+            round_name for round_name in _pending_rounds(config)
+            if (rounds is None or round_name in rounds) and _round_started(config, round_name)
+        ]
+        updated = [round_name for round_name in live if sync_round_scores(config, round_name)]
+    return {"live": live, "updated": updated}
+
+def _sync_loop(interval, idle_interval):
+    with upstream_priority(LIVE):
+        while True:
+            delay = idle_interval
+            try:
+                result = sync_cup_scores()
+                if result["live"]:
+                    delay = interval
+                if result["updated"]:
+                    logger.info("Cup scores updated: %s", ", ".join(result["updated"]))
+            except Exception:
+                logger.exception("Cup score sync failed")
+                delay = interval
+            time.sleep(delay)
+
+def start_cup_sync(interval=None, idle_interval=None):
+    """Keep cup leg scores and winners in config/cup.json current in the background."""
+    global _worker
+    interval = CUP_SYNC_SECONDS if interval is None else interval
+    idle_interval = CUP_IDLE_SECONDS if idle_interval is None else idle_interval
+    if interval <= 0 or _worker is not None:
+        return None
+    _worker = threading.Thread(target=_sync_loop, args=(interval, max(interval, idle_interval)),
+                               name="cup-sync", daemon=True)
+    _worker.start()
+    return _worker
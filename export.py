@@ -0,0 +1,163 @@
+"""Export the read-only API as static JSON files for CDN serving.
+
+    python3 export.py [--out DIR] [--force]
+
+Every read-only endpoint is rendered through the Flask app, so the files
+match the live responses byte for byte. Each URL path is written to
+DIR/<path>.json (e.g. /api/standings/premier_league ->
+DIR/api/standings/premier_league.json) and the page shell to
+DIR/index.html, with its fingerprinted CSS/JS under DIR/assets/. The
+CDN should map /api/... requests onto the .json files.
+
+DIR/manifest.json lists each file's URL, SHA-256 and size. Re-running
+only rewrites files whose content hash changed and removes files that
+are no longer produced. Failed endpoints keep their last good file.
+
+Nothing is written outside DIR, so an export can run alongside the web
+app; cup results are whatever config/cup.json holds at the time.
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime, timezone
+
+import fantrax
+from app import app, LEAGUES
+from motm import load_motm_config
+from cup import ROUNDS
+from assets import asset_url
+from upstream import BACKGROUND, set_default_priority
+
+DEFAULT_OUT = "static_export"
+MANIFEST = "manifest.json"
+# Keep each league's fetch for the whole run rather than the live TTL.
+EXPORT_SCHEDULE_TTL = 600
+
+def export_urls():
+    """Every read-only GET endpoint, plus one profile per team."""
+    urls = [
+        "/",
+        asset_url("app.css"),
+        asset_url("app.js"),
+        "/api/teams",
+        "/api/rules",
+        "/api/gameweek/current",
+        "/api/cup/groups",
+        "/api/cup/current_round",
+        *[f"/api/cup/round/{round_name}" for round_name in ROUNDS],
+        "/api/cup/odds",
+        "/api/team/profiles"
+    ]
+    for league_key in LEAGUES:
+        urls.append(f"/api/standings/{league_key}")
+        urls.append(f"/api/analytics/{league_key}")
+        urls.append(f"/api/projections/{league_key}")
+        for month in load_motm_config():
+            urls.append(f"/api/motm/{league_key}/{month}")
+    return urls
+
+def _file_path(url):
+    if url == "/":
+        return "index.html"
+    if url.startswith("/assets/"):
+        return url.lstrip("/")
+    return url.lstrip("/") + ".json"
+
+def _render(client, url):
+    response = client.get(url)
+    if response.status_code != 200:
+        return None, f"HTTP {response.status_code}"
+    if response.is_json and not response.get_json().get("success"):
+        return None, response.get_json().get("error", "request failed")
+    return response.data, None
+
+def _profile_urls(bulk_body):
+    """The per-team /api/team/profile/<id> URL of every team in the bulk profiles payload."""
+    return [f"/api/team/profile/{team_id}" for team_id in json.loads(bulk_body)["data"]["profiles"]]
+
+def _load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {"files": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _write(out_dir, rel_path, body):
+    path = os.path.join(out_dir, rel_path)
+    os.makedirs(os.path.dirname(path) or out_dir, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+def export(out_dir=DEFAULT_OUT, force=False):
+    fantrax.SCHEDULE_TTL = max(fantrax.SCHEDULE_TTL, EXPORT_SCHEDULE_TTL)
+    # Read-only: cup.json is exported as it stands. Only the web app's cup-sync
+    # worker writes it, under the lock it shares with admin draw saves.
+    previous = _load_manifest(out_dir)["files"]
+    files = {}
+    report = {"written": [], "unchanged": [], "removed": [], "errors": {}}
+    client = app.test_client()
+
+    rendered = []
+    pending = export_urls()
+    while pending:
+        url = pending.pop(0)
+        body, error = _render(client, url)
+        if error:
+            report["errors"][url] = error
+            continue
+        rendered.append((url, body))
+        if url == "/api/team/profiles":
+            pending.extend(_profile_urls(body))
+
+    for url, body in rendered:
+        rel_path = _file_path(url)
+        digest = hashlib.sha256(body).hexdigest()
+        files[rel_path] = {"url": url, "sha256": digest, "bytes": len(body)}
+        unchanged = previous.get(rel_path, {}).get("sha256") == digest
+        if unchanged and not force and os.path.exists(os.path.join(out_dir, rel_path)):
+            report["unchanged"].append(rel_path)
+            continue
+        _write(out_dir, rel_path, body)
+        report["written"].append(rel_path)
+
+    # Failed endpoints keep serving their last good export.
+    failed_paths = {_file_path(url) for url in report["errors"]}
+    profiles_failed = "/api/team/profiles" in report["errors"]
+    for rel_path, meta in previous.items():
+        if rel_path in files:
+            continue
+        if rel_path in failed_paths or (profiles_failed and rel_path.startswith("api/team/profile/")):
+            files[rel_path] = meta
+            continue
+        full_path = os.path.join(out_dir, rel_path)
+        if os.path.exists(full_path):
+            os.remove(full_path)
+        report["removed"].append(rel_path)
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "files": dict(sorted(files.items()))
+    }
+    _write(out_dir, MANIFEST, json.dumps(manifest, indent=2).encode("utf-8"))
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export read-only API responses as static JSON.")
+    parser.add_argument("--out", default=DEFAULT_OUT, help=f"output directory (default: {DEFAULT_OUT})")
+    parser.add_argument("--force", action="store_true", help="rewrite every file even if unchanged")
+    args = parser.parse_args(argv)
+    set_default_priority(BACKGROUND)
+
+    report = export(args.out, force=args.force)
+    print(f"Wrote {len(report['written'])}, unchanged {len(report['unchanged'])}, "
+          f"removed {len(report['removed'])}, errors {len(report['errors'])}")
+    for url, error in report["errors"].items():
+        print(f"  ! {url}: {error}")
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,80 @@
 import os
+import time
+import hashlib
+import threading
 import requests
+import glob
 import json
 import unicodedata
 from datetime import datetime, timezone
-
-LEAGUES = {
-    "premier_league": "34wnxersmc1y1272",
-    "championship": "d9ykwqkbmc1y029m",
-    "league_one": "jc4hm3twmc1xxwcv"
-}
+from cache import LRUCache
+from models import Fixture, Gameweek
+from upstream import BACKGROUND, LIVE, USER, UpstreamBusy, current_priority, scheduler
+
+LEAGUES_FILE = "config/leagues.json"
+# Optional directory of extra league files, same shape as leagues.json.
+LEAGUES_DIR = "config/leagues.d"
+
+def load_league_registry(root=""):
+    """League key -> {"name", "id"} from leagues.json plus any leagues.d/*.json.
+
+    Files are applied in name order, so later files can add or override
+    leagues. Entries with "active": false are left out. Paths are relative
+    to `root` (default: the working directory).
+    """
+    registry = {}
+    paths = [os.path.join(root, LEAGUES_FILE)]
+    paths += sorted(glob.glob(os.path.join(root, LEAGUES_DIR, "*.json")))
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            registry.update(json.load(f))
+    return {key: league for key, league in registry.items() if league.get("active", True)}
+
+LEAGUE_REGISTRY = load_league_registry()
+LEAGUES = {key: league["id"] for key, league in LEAGUE_REGISTRY.items()}
+LEAGUE_NAMES = {key: league.get("name", key) for key, league in LEAGUE_REGISTRY.items()}
+
+# Point at a local stand-in (see fantrax_standin.py) for load tests.
+FANTRAX_BASE_URL = os.environ.get("FANTRAX_BASE_URL", "https://www.fantrax.com").rstrip("/")
+
+# Seconds before an upstream HTTP call is abandoned.
+FANTRAX_TIMEOUT = float(os.environ.get("FANTRAX_TIMEOUT", "15"))
+
+# Seconds a refresh waits for request budget when a cached copy can be served instead.
+STALE_WAIT = 0.5
+# Once that wait runs out, stale copies are served without queueing for this long.
+STALE_RETRY_SECONDS = 5.0
+
+# Schedules are reused for this many seconds before Fantrax is asked again.
+SCHEDULE_TTL = float(os.environ.get("FANTRAX_SCHEDULE_TTL", "30"))
+
+# Per-league caches are LRU-bounded by league count and approximate size, so
+# inactive leagues drop out and are fetched again lazily on their next request.
+CACHE_MAX_LEAGUES = int(os.environ.get("FANTRAX_CACHE_LEAGUES", "32"))
+CACHE_MAX_BYTES = int(float(os.environ.get("FANTRAX_CACHE_MB", "64")) * 1024 * 1024)
+
+# Every upstream fetch is also written here so a restarted process can
+# start from the last known data. Empty disables snapshots.
+SNAPSHOT_DIR = os.environ.get("FANTRAX_SNAPSHOT_DIR", "data/snapshot")
+
+# Keep each league's raw Fantrax tableList alongside the parsed gameweeks,
+# for debugging only (see get_raw_schedule); it is several times their size.
+KEEP_RAW_SCHEDULE = os.environ.get("FANTRAX_KEEP_RAW", "") == "1"
+
+# league_key -> {"fetched_at", "version", "live", "gameweeks"[, "raw"]}
+_schedule_cache = LRUCache(CACHE_MAX_LEAGUES, CACHE_MAX_BYTES)
+# league_key -> {"fetched_at", "version", "teams"} (raw getStandings rows)
+_standings_cache = LRUCache(CACHE_MAX_LEAGUES, CACHE_MAX_BYTES // 8)
+_fetch_locks = {}
+_fetch_locks_guard = threading.Lock()
+# league_key -> monotonic time it was last asked for by anything but background jobs.
+_last_requested = {}
+# Monotonic time until which refreshes with a stale copy only take budget that is free now.
+_budget_busy_until = 0.0
+# Called as listener(league_key, previous_gameweeks, gameweeks) when a fetch changes the data.
+_schedule_listeners = []
 
 def normalize(s):
     return unicodedata.normalize('NFC', s.strip()) if s else s
@@ -74,9 +140,9 @@ def _extract_gameweek_end(gw_data):
     walk(gw_data)
     return max(end_candidates) if end_candidates else None
 
-def get_schedule(league_key):
+def _fetch_schedule(league_key):
     league_id = LEAGUES[league_key]
-    url = f"https://www.fantrax.com/fxpa/req?leagueId={league_id}"
+    url = f"{FANTRAX_BASE_URL}/fxpa/req?leagueId={league_id}"
     payload = json.dumps({
         "msgs": [{"method": "getStandings", "data": {"leagueId": league_id, "view": "SCHEDULE"}}],
         "at": 0, "av": "0.0", "dt": 1, "uiv": 3, "v": "179.0.1"
@@ -84,16 +150,304 @@ def get_schedule(league_key):
     headers = {
         "Content-Type": "text/plain",
         "User-Agent": "Mozilla/5.0",
-        "Referer": f"https://www.fantrax.com/fantasy/league/{league_id}/standings;view=SCHEDULE"
+        "Referer": f"{FANTRAX_BASE_URL}/fantasy/league/{league_id}/standings;view=SCHEDULE"
     }
-    response = requests.post(url, data=payload, headers=headers)
+    response = requests.post(url, data=payload, headers=headers, timeout=FANTRAX_TIMEOUT)
     return response.json()["responses"][0]["data"]["tableList"]
 
-def get_standings(league_key):
+def _cell_score(cell):
+    try:
+        return float(cell["content"]) if cell.get("content") else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+def parse_schedule(schedule):
+    """Raw Fantrax tableList -> list of Gameweek models (gameweek N at index N-1).
+
+    Only ids, names, scores and period ends are kept, and each id and name
+    string is shared across gameweeks rather than repeated per fixture.
+    """
+    strings = {}
+
+    def share(s):
+        return strings.setdefault(s, s)
+
+    gameweeks = []
+    for idx, gw_data in enumerate(schedule):
+        gw = idx + 1
+        fixtures = []
+        for row in gw_data.get("rows", []):
+            cells = row.get("cells", [])
+            if len(cells) < 4:
+                continue
+            fixtures.append(Fixture(
+                gw=gw,
+                away_id=share(cells[0].get("teamId")),
+                away_name=share(normalize(cells[0].get("content", ""))),
+                away_score=_cell_score(cells[1]),
+                home_id=share(cells[2].get("teamId")),
+                home_name=share(normalize(cells[2].get("content", ""))),
+                home_score=_cell_score(cells[3])
+            ))
+        gameweeks.append(Gameweek(number=gw, fixtures=fixtures, end=_extract_gameweek_end(gw_data)))
+    return gameweeks
+
+def _schedule_version(gameweeks):
+    digest = hashlib.sha1()
+    for gw in gameweeks:
+        for f in gw.fixtures:
+            digest.update(f"{f.away_id}|{f.away_name}|{f.away_score};{f.home_id}|{f.home_name}|{f.home_score};".encode("utf-8"))
+        digest.update(f"#{gw.end.isoformat() if gw.end else ''}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def _fetch_lock(league_key, kind="schedule"):
+    with _fetch_locks_guard:
+        return _fetch_locks.setdefault((kind, league_key), threading.Lock())
+
+def _snapshot_path(kind, league_key):
+    return os.path.join(SNAPSHOT_DIR, f"{kind}.{league_key}.json")
+
+def _save_snapshot(kind, league_key, data):
+    if not SNAPSHOT_DIR:
+        return
+    path = _snapshot_path(kind, league_key)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"saved_at": time.time(), "league_id": LEAGUES[league_key], "data": data}, f)
+    os.replace(tmp, path)
+
+def _load_snapshot(kind, league_key):
+    """(data, fetched_at) from a snapshot, aged by wall-clock time since it was saved."""
+    path = _snapshot_path(kind, league_key)
+    if not SNAPSHOT_DIR or not os.path.exists(path):
+        return None, None
+    with open(path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    # Ignore snapshots from before a league was repointed at another Fantrax id.
+    if snapshot.get("league_id") != LEAGUES[league_key]:
+        return None, None
+    age = max(0.0, time.time() - snapshot["saved_at"])
+    return snapshot["data"], time.monotonic() - age
+
+def restore_snapshots():
+    """Seed empty caches from saved snapshots; returns the league keys restored.
+
+    Restored entries keep their real age, so anything older than the TTL is
+    still refetched on next use. They also serve as the baseline for change
+    diffs, so /api/changes picks up results that landed during a restart.
+    """
+    restored = []
+    for league_key in LEAGUES:
+        try:
+            if league_key not in _schedule_cache:
+                schedule, fetched_at = _load_snapshot("gameweeks", league_key)
+                if schedule is not None:
+                    gameweeks = [Gameweek.from_dict(gw) for gw in schedule]
+                    _schedule_cache.set(league_key, {
+                        "fetched_at": fetched_at,
+                        "version": _schedule_version(gameweeks),
+                        "live": _in_progress(gameweeks),
+                        "gameweeks": gameweeks
+                    })
+                    restored.append(league_key)
+            if league_key not in _standings_cache:
+                teams, fetched_at = _load_snapshot("standings", league_key)
+                if teams is not None:
+                    _standings_cache.set(league_key, {
+                        "fetched_at": fetched_at,
+                        "version": _standings_version(teams),
+                        "teams": teams
+                    })
+        except (OSError, ValueError, KeyError):
+            # A damaged snapshot just means a normal cold fetch.
+            continue
+    return restored
+
+def get_data_ages(league_key):
+    """Seconds since the cached schedule and standings were fetched (None if not cached)."""
+    now = time.monotonic()
+    ages = {}
+    for kind, cache in (("schedule", _schedule_cache), ("standings", _standings_cache)):
+        entry = cache.peek(league_key)
+        ages[kind] = round(now - entry["fetched_at"], 1) if entry else None
+    return ages
+
+def _note_request(league_key):
+    if current_priority() != BACKGROUND:
+        _last_requested[league_key] = time.monotonic()
+
+def get_active_leagues(within):
+    """Cached leagues that are mid-gameweek or were requested in the last `within` seconds.
+
+    Background jobs don't count as requests, and nothing here touches the
+    LRU order, so keeping these warm never pushes out a league viewers use.
+    """
+    now = time.monotonic()
+    active = []
+    for league_key in _schedule_cache.keys():
+        entry = _schedule_cache.peek(league_key)
+        if entry is None:
+            continue
+        if entry["live"] or now - _last_requested.get(league_key, float("-inf")) <= within:
+            active.append(league_key)
+    return active
+
+def get_cached_leagues():
+    return _schedule_cache.keys()
+
+def _in_progress(gameweeks):
+    """True while a gameweek has scores but hasn't finished."""
+    return any(not gw.complete() and any(f.played for f in gw.fixtures) for gw in gameweeks)
+
+def _reusable(entry, max_age):
+    """Fresh enough, or backing off after the request budget ran out.
+
+    The live workers ignore the back-off and always queue for budget.
+    """
+    if entry is None:
+        return False
+    now = time.monotonic()
+    if now - entry["fetched_at"] < max_age:
+        return True
+    return now < entry.get("retry_at", 0) and current_priority() != LIVE
+
+def _take_budget(entry, live=False):
+    """Wait for request budget for one upstream call.
+
+    Returns the priority the grant was made at, or None if the budget
+    couldn't fit the call in time and `entry` (however old) should be served
+    instead. Refreshing a league mid-gameweek is raised to LIVE priority for
+    viewer requests.
+    """
+    global _budget_busy_until
+    requested = current_priority()
+    priority = LIVE if live and requested == USER else requested
+    timeout = None
+    # With a cached copy to fall back on, only the live workers queue for long.
+    if entry is not None and requested != LIVE:
+        timeout = 0 if time.monotonic() < _budget_busy_until else STALE_WAIT
+    try:
+        scheduler.acquire(priority, timeout)
+    except UpstreamBusy:
+        if entry is None:
+            raise
+        # Other callers serve stale copies straight away too, instead of
+        # each waiting STALE_WAIT per league.
+        retry_at = time.monotonic() + STALE_RETRY_SECONDS
+        entry["retry_at"] = retry_at
+        _budget_busy_until = max(_budget_busy_until, retry_at)
+        return None
+    return priority
+
+def _cached_schedule(league_key, max_age=None):
+    if league_key not in LEAGUES:
+        raise KeyError(league_key)
+    _note_request(league_key)
+    max_age = SCHEDULE_TTL if max_age is None else max_age
+    entry = _schedule_cache.get(league_key)
+    if _reusable(entry, max_age):
+        return entry
+
+    # Budget is waited for before the league lock, so nobody waits on the
+    # lock behind a caller that is itself waiting for budget.
+    priority = _take_budget(entry, live=bool(entry and entry["live"]))
+    if priority is None:
+        return entry
+
+    # One fetch per league at a time; concurrent callers wait and reuse it.
+    with _fetch_lock(league_key):
+        entry = _schedule_cache.get(league_key)
+        if entry and time.monotonic() - entry["fetched_at"] < max_age:
+            scheduler.refund(priority)
+            return entry
+        previous = entry
+        raw = _fetch_schedule(league_key)
+        gameweeks = parse_schedule(raw)
+        entry = {
+            "fetched_at": time.monotonic(),
+            "version": _schedule_version(gameweeks),
+            "live": _in_progress(gameweeks),
+            "gameweeks": gameweeks
+        }
+        if KEEP_RAW_SCHEDULE:
+            entry["raw"] = raw
+        _schedule_cache.set(league_key, entry)
+        _save_snapshot("gameweeks", league_key, [gw.to_dict() for gw in gameweeks])
+        if previous is None or previous["version"] != entry["version"]:
+            for listener in list(_schedule_listeners):
+                listener(league_key, previous["gameweeks"] if previous else None, gameweeks)
+        return entry
+
+def add_schedule_listener(listener):
+    _schedule_listeners.append(listener)
+
+def get_raw_schedule(league_key, max_age=None):
+    """The raw Fantrax tableList, or None unless FANTRAX_KEEP_RAW=1."""
+    return _cached_schedule(league_key, max_age).get("raw")
+
+def get_gameweeks(league_key, max_age=None):
+    """Parsed schedule: Gameweek models holding Fixture rows."""
+    return _cached_schedule(league_key, max_age)["gameweeks"]
+
+def get_schedule_version(league_key, max_age=None):
+    """Short content hash of a league's fixtures and scores."""
+    return _cached_schedule(league_key, max_age)["version"]
+
+def get_versioned_gameweeks(league_key, max_age=None):
+    entry = _cached_schedule(league_key, max_age)
+    return entry["gameweeks"], entry["version"]
+
+def count_ended(gameweeks, now=None):
+    """Gameweeks whose end date has passed.
+
+    Results turn final when that happens without any score changing, so
+    caches of anything built on gw.complete() key on this with the version.
+    """
+    now = now or datetime.now(timezone.utc)
+    return sum(1 for gameweek in gameweeks if gameweek.end is not None and gameweek.end <= now)
+
+def _fetch_standings(league_key):
     league_id = LEAGUES[league_key]
-    url = "https://www.fantrax.com/fxea/general/getStandings"
-    response = requests.get(url, params={"leagueId": league_id}, headers={"User-Agent": "Mozilla/5.0"})
-    raw = response.json()
+    url = f"{FANTRAX_BASE_URL}/fxea/general/getStandings"
+    response = requests.get(url, params={"leagueId": league_id}, headers={"User-Agent": "Mozilla/5.0"},
+                            timeout=FANTRAX_TIMEOUT)
+    return response.json()
+
+def _standings_version(teams):
+    raw = json.dumps(teams, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def _cached_standings(league_key, max_age=None):
+    if league_key not in LEAGUES:
+        raise KeyError(league_key)
+    _note_request(league_key)
+    max_age = SCHEDULE_TTL if max_age is None else max_age
+    entry = _standings_cache.get(league_key)
+    if _reusable(entry, max_age):
+        return entry
+
+    priority = _take_budget(entry)
+    if priority is None:
+        return entry
+
+    with _fetch_lock(league_key, "standings"):
+        entry = _standings_cache.get(league_key)
+        if entry and time.monotonic() - entry["fetched_at"] < max_age:
+            scheduler.refund(priority)
+            return entry
+        teams = _fetch_standings(league_key)
+        entry = {"fetched_at": time.monotonic(), "version": _standings_version(teams), "teams": teams}
+        _standings_cache.set(league_key, entry)
+        _save_snapshot("standings", league_key, teams)
+        return entry
+
+def get_standings_version(league_key, max_age=None):
+    """Short content hash of a league's raw standings rows."""
+    return _cached_standings(league_key, max_age)["version"]
+
+def get_standings(league_key, gameweeks=None, max_age=None):
+    raw = _cached_standings(league_key, max_age)["teams"]
 
     enriched = []
     for team in raw:
@@ -114,24 +468,8 @@ def get_standings(league_key):
         })
 
     # Use teamId for PA matching — avoids emoji encoding mismatches
-    schedule = get_schedule(league_key)
-    pa_by_id = {}
-    for gw_data in schedule:
-        for row in gw_data["rows"]:
-            cells = row["cells"]
-            away_id = cells[0].get("teamId")
-            home_id = cells[2].get("teamId")
-            try:
-                away_score = float(cells[1]["content"]) if cells[1]["content"] else 0.0
-                home_score = float(cells[3]["content"]) if cells[3]["content"] else 0.0
-            except (ValueError, KeyError):
-                continue
-            if away_score == 0.0 and home_score == 0.0:
-                continue
-            if away_id:
-                pa_by_id[away_id] = pa_by_id.get(away_id, 0.0) + home_score
-            if home_id:
-                pa_by_id[home_id] = pa_by_id.get(home_id, 0.0) + away_score
+    from analytics import get_score_matrix, points_against  # analytics imports this module
+    pa_by_id = points_against(get_score_matrix(league_key, gameweeks))
 
     for team in enriched:
         team["pa"] = round(pa_by_id.get(team["teamId"], 0.0), 2)
@@ -139,68 +477,24 @@ def get_standings(league_key):
 
     return enriched
 
-def get_team_id_map(league_key):
-    schedule = get_schedule(league_key)
+def get_team_id_map(league_key, gameweeks=None):
+    if gameweeks is None:
+        gameweeks = get_gameweeks(league_key)
     id_to_name = {}
-    for gw_data in schedule:
-        for row in gw_data["rows"]:
-            cells = row["cells"]
-            if "teamId" in cells[0]:
-                id_to_name[cells[0]["teamId"]] = normalize(cells[0]["content"])
-            if "teamId" in cells[2]:
-                id_to_name[cells[2]["teamId"]] = normalize(cells[2]["content"])
+    for gw in gameweeks:
+        for f in gw.fixtures:
+            if f.away_id:
+                id_to_name[f.away_id] = f.away_name
+            if f.home_id:
+                id_to_name[f.home_id] = f.home_name
     return id_to_name
 
-def get_all_team_id_maps():
-    combined = {}
-    for league_key in LEAGUES:
-        combined.update(get_team_id_map(league_key))
-    return combined
-
-def get_gw_scores(league_key, gw):
-    schedule = get_schedule(league_key)
-    gw_data = schedule[gw - 1]
-    scores = {}
-    for row in gw_data["rows"]:
-        cells = row["cells"]
-        away_team = normalize(cells[0]["content"])
-        away_score = float(cells[1]["content"]) if cells[1]["content"] else 0.0
-        home_team = normalize(cells[2]["content"])
-        home_score = float(cells[3]["content"]) if cells[3]["content"] else 0.0
-        scores[away_team] = away_score
-        scores[home_team] = home_score
-    return scores
-
 def get_score_by_id(team_id, gw, league_key):
-    schedule = get_schedule(league_key)
-    gw_data = schedule[gw - 1]
-    for row in gw_data["rows"]:
-        cells = row["cells"]
-        if cells[0].get("teamId") == team_id:
-            return float(cells[1]["content"]) if cells[1]["content"] else 0.0
-        if cells[2].get("teamId") == team_id:
-            return float(cells[3]["content"]) if cells[3]["content"] else 0.0
-    return None
+    fixture = get_gameweeks(league_key)[gw - 1].fixture_for(team_id)
+    return fixture.score_for(team_id) if fixture else None
 
 def is_gameweek_complete(league_key, gw):
-    schedule = get_schedule(league_key)
-    gw_data = schedule[gw - 1]
-
-    # Prefer explicit period end metadata when available.
-    end_time = _extract_gameweek_end(gw_data)
-    if end_time is not None:
-        return datetime.now(timezone.utc) >= end_time
-
-    # Fallback: treat all-0 fixtures as unplayed.
-    for row in gw_data.get("rows", []):
-        cells = row.get("cells", [])
-        if len(cells) < 4:
-            return False
-        away_score = float(cells[1]["content"]) if cells[1]["content"] else 0.0
-        home_score = float(cells[3]["content"]) if cells[3]["content"] else 0.0
-        if away_score == 0.0 and home_score == 0.0:
-            return False
-    return True
+    return get_gameweeks(league_key)[gw - 1].complete()
 
 def get_league_for_id(team_id, cup_config):
     for league_key, teams in cup_config["team_ids"].items():
@@ -219,69 +513,33 @@ def get_current_round(cup_config):
                 break
     return current
 
-def get_team_fixtures(league_key, team_id, count=5):
-    schedule = get_schedule(league_key)
-    fixtures = []
-
-    for idx, gw_data in enumerate(schedule):
-        gw = idx + 1
-        for row in gw_data.get("rows", []):
-            cells = row["cells"]
-            away_id = cells[0].get("teamId")
-            home_id = cells[2].get("teamId")
-            if team_id not in (away_id, home_id):
-                continue
-
-            away_name = normalize(cells[0].get("content", ""))
-            home_name = normalize(cells[2].get("content", ""))
-            away_score = float(cells[1]["content"]) if cells[1]["content"] else 0.0
-            home_score = float(cells[3]["content"]) if cells[3]["content"] else 0.0
-            played = not (away_score == 0.0 and home_score == 0.0)
-
-            is_home = team_id == home_id
-            team_name = home_name if is_home else away_name
-            opponent = away_name if is_home else home_name
-            opponent_id = away_id if is_home else home_id
-            team_score = home_score if is_home else away_score
-            opp_score = away_score if is_home else home_score
-
-            result = None
-            if played:
-                if team_score > opp_score:
-                    result = "W"
-                elif team_score < opp_score:
-                    result = "L"
-                else:
-                    result = "D"
-
-            fixtures.append({
-                "gw": gw,
-                "team": team_name,
-                "opponent": opponent,
-                "opponent_id": opponent_id,
-                "is_home": is_home,
-                "team_score": team_score if played else None,
-                "opp_score": opp_score if played else None,
-                "played": played,
-                "result": result
-            })
-            break
-
-    played = [f for f in fixtures if f["played"]]
-    upcoming = [f for f in fixtures if not f["played"]]
+def _split_fixtures(fixtures, count):
+    played = [f for f in fixtures if f.played]
+    upcoming = [f for f in fixtures if not f.played]
     return {
         "last5": played[-count:][::-1],
         "next5": upcoming[:count]
     }
 
+def get_league_fixtures(league_key, count=5, gameweeks=None):
+    """Last/next Fixture models per team for a whole league from one pass."""
+    if gameweeks is None:
+        gameweeks = get_gameweeks(league_key)
+    by_team = {}
+
+    for gw in gameweeks:
+        seen = set()
+        for f in gw.fixtures:
+            for team_id in (f.away_id, f.home_id):
+                if not team_id or team_id in seen:
+                    continue
+                seen.add(team_id)
+                by_team.setdefault(team_id, []).append(f)
+
+    return {team_id: _split_fixtures(fixtures, count) for team_id, fixtures in by_team.items()}
+
 def get_public_team_url(league_key, team_id):
     league_id = LEAGUES.get(league_key)
     if not league_id:
         return None
     return f"https://www.fantrax.com/fantasy/league/{league_id}/team/roster;teamId={team_id}"
-
-if __name__ == "__main__":
-    print("Testing standings...")
-    standings = get_standings("premier_league")
-    for team in standings:
-        print(f"{team['rank']}. {team['teamName']} — W{team['w']} D{team['d']} L{team['l']} | Pts:{team['pts']} | PF:{team['pf']} | PA:{team['pa']} | PD:{team['pd']}")
@@ -0,0 +1,210 @@
+"""Local Fantrax stand-in serving synthetic schedules and standings.
+
+    python3 fantrax_standin.py [--port 5100] [--played 30] [--latency-ms 150] [--live-seconds 20]
+
+Serves the two upstream calls the app makes (POST /fxpa/req schedule and
+GET /fxea/general/getStandings) for every league in config/leagues.json,
+with teams taken from config/cup.json. Gameweeks up to --played are
+complete; the next one is in progress and, with --live-seconds, gains
+score updates on that interval. GET /_stats returns call counts.
+Run the app against it with FANTRAX_BASE_URL=http://127.0.0.1:<port>.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from fantrax import load_league_registry
+
+# Config is read next to this file, wherever it is run from.
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CUP_CONFIG_FILE = os.path.join(ROOT, "config", "cup.json")
+
+TOTAL_GAMEWEEKS = 38
+
+def _round_robin(team_ids, gw):
+    """Circle-method pairings for one gameweek; with an odd count one team sits out."""
+    if len(team_ids) < 2:
+        return []
+    if len(team_ids) % 2:
+        team_ids = team_ids + [None]  # bye
+    n = len(team_ids)
+    rest = team_ids[1:]
+    shift = gw % (n - 1)
+    order = team_ids[:1] + rest[shift:] + rest[:shift]
+    pairs = [(order[i], order[n - 1 - i]) for i in range(n // 2)]
+    return [(away, home) for away, home in pairs if away is not None and home is not None]
+
+def _score(rnd):
+    return round(rnd.uniform(50, 150) * 4) / 4
+
+class StandinLeague:
+    def __init__(self, league_key, teams, played, seed=0):
+        self.league_key = league_key
+        self.names = {team_id: name for name, team_id in teams.items()}
+        self.rnd = random.Random(f"{league_key}:{seed}")
+        self.played = played
+        now = datetime.now(timezone.utc)
+        # Gameweek `played` ended yesterday; the live one ends in a week.
+        self.ends = [now + timedelta(days=7 * (gw - played) - 1 if gw <= played else 7 * (gw - played))
+                     for gw in range(1, TOTAL_GAMEWEEKS + 1)]
+        team_ids = sorted(self.names)
+        self.fixtures = []
+        for gw in range(1, TOTAL_GAMEWEEKS + 1):
+            rows = []
+            for away_id, home_id in _round_robin(team_ids, gw):
+                scores = [_score(self.rnd), _score(self.rnd)] if gw <= played else [0.0, 0.0]
+                rows.append([away_id, home_id, scores])
+            self.fixtures.append(rows)
+        self.lock = threading.Lock()
+
+    def tick(self):
+        """Add points to a few fixtures in the live gameweek."""
+        live = self.played
+        if live >= TOTAL_GAMEWEEKS:
+            return
+        with self.lock:
+            for fixture in self.rnd.sample(self.fixtures[live], k=min(3, len(self.fixtures[live]))):
+                side = self.rnd.randrange(2)
+                fixture[2][side] += round(self.rnd.uniform(1, 12) * 4) / 4
+
+    def schedule(self):
+        with self.lock:
+            table = []
+            for gw, rows in enumerate(self.fixtures, start=1):
+                table.append({
+                    "caption": f"Scoring Period {gw}",
+                    "endDate": int(self.ends[gw - 1].timestamp() * 1000),
+                    "rows": [{"cells": [
+                        {"teamId": away_id, "content": self.names[away_id]},
+                        {"content": str(scores[0]) if any(scores) else ""},
+                        {"teamId": home_id, "content": self.names[home_id]},
+                        {"content": str(scores[1]) if any(scores) else ""}
+                    ]} for away_id, home_id, scores in rows]
+                })
+            return table
+
+    def standings(self):
+        records = {team_id: {"w": 0, "d": 0, "l": 0, "pf": 0.0} for team_id in self.names}
+        with self.lock:
+            for rows in self.fixtures[:self.played]:
+                for away_id, home_id, (away_score, home_score) in rows:
+                    for team_id, scored, conceded in ((away_id, away_score, home_score),
+                                                      (home_id, home_score, away_score)):
+                        record = records[team_id]
+                        record["pf"] += scored
+                        record["w" if scored > conceded else "l" if scored < conceded else "d"] += 1
+        ranked = sorted(records.items(), key=lambda item: (item[1]["w"] * 3 + item[1]["d"], item[1]["pf"]),
+                        reverse=True)
+        return [{
+            "teamName": self.names[team_id],
+            "teamId": team_id,
+            "rank": rank,
+            "points": f"{r['w']}-{r['d']}-{r['l']}",
+            "totalPointsFor": round(r["pf"], 2),
+            "winPercentage": round((r["w"] + 0.5 * r["d"]) / max(1, r["w"] + r["d"] + r["l"]), 3)
+        } for rank, (team_id, r) in enumerate(ranked, start=1)]
+
+class Standin:
+    def __init__(self, played=30, latency_ms=0, seed=0):
+        with open(CUP_CONFIG_FILE, encoding="utf-8") as f:
+            team_ids = json.load(f)["team_ids"]
+        self.leagues = {
+            league["id"]: StandinLeague(league_key, team_ids[league_key], played, seed)
+            for league_key, league in load_league_registry(ROOT).items() if league_key in team_ids
+        }
+        self.latency = latency_ms / 1000
+        self.calls = {"schedule": 0, "standings": 0}
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def count(self, kind):
+        with self._lock:
+            self.calls[kind] += 1
+
+    def stats(self):
+        with self._lock:
+            return {"calls": dict(self.calls), "uptime": round(time.monotonic() - self.started_at, 1)}
+
+    def tick(self):
+        for league in self.leagues.values():
+            league.tick()
+
+def _handler(standin):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, data):
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _league(self, url):
+            return standin.leagues.get(parse_qs(url.query).get("leagueId", [None])[0])
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            league = self._league(url)
+            if url.path != "/fxpa/req" or league is None:
+                return self._send(404, {"error": "not found"})
+            standin.count("schedule")
+            time.sleep(standin.latency)
+            self._send(200, {"responses": [{"data": {"tableList": league.schedule()}}]})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/_stats":
+                return self._send(200, standin.stats())
+            league = self._league(url)
+            if url.path != "/fxea/general/getStandings" or league is None:
+                return self._send(404, {"error": "not found"})
+            standin.count("standings")
+            time.sleep(standin.latency)
+            self._send(200, league.standings())
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def serve(port=0, played=30, latency_ms=0, live_seconds=0, seed=0):
+    """Start the stand-in in background threads; returns (server, standin)."""
+    standin = Standin(played=played, latency_ms=latency_ms, seed=seed)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(standin))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fantrax-standin", daemon=True).start()
+    if live_seconds > 0:
+        def _live():
+            while True:
+                time.sleep(live_seconds)
+                standin.tick()
+        threading.Thread(target=_live, name="fantrax-standin-live", daemon=True).start()
+    return server, standin
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic Fantrax data locally.")
+    parser.add_argument("--port", type=int, default=5100)
+    parser.add_argument("--played", type=int, default=30, help="completed gameweeks")
+    parser.add_argument("--latency-ms", type=float, default=0, help="added delay per upstream call")
+    parser.add_argument("--live-seconds", type=float, default=0, help="seconds between live score updates")
+    args = parser.parse_args(argv)
+
+    server, _ = serve(args.port, args.played, args.latency_ms, args.live_seconds)
+    print(f"Fantrax stand-in on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from fantrax import LEAGUES, add_schedule_listener, get_gameweeks
+from analytics import build_score_matrix, standings_table
+from cup import ROUNDS, load_cup_config
+from upstream import LIVE, upstream_priority
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background schedule polls; 0 leaves fetching to requests.
+LIVE_POLL_SECONDS = float(os.environ.get("LIVE_POLL_SECONDS", "0"))
+MAX_CHANGES = 500
+
+_changes = deque(maxlen=MAX_CHANGES)
+_version = 0
+_lock = threading.Lock()
+_poller = None
+
+def current_gameweek(gameweeks):
+    """First gameweek that hasn't finished, or the last one once the season is over."""
+    for gameweek in gameweeks:
+        if not gameweek.complete():
+            return gameweek.number
+    return len(gameweeks) or None
+
+def _changed_fixtures(previous, gameweeks):
+    changed = []
+    for gameweek in gameweeks:
+        before = previous[gameweek.number - 1].fixtures if gameweek.number <= len(previous) else []
+        before_by_pair = {(f.away_key, f.home_key): f for f in before}
+        for f in gameweek.fixtures:
+            old = before_by_pair.get((f.away_key, f.home_key))
+            if old is not None and (old.away_score, old.home_score) == (f.away_score, f.home_score):
+                continue
+            changed.append({
+                "gw": f.gw,
+                "away_id": f.away_id,
+                "away": f.away_name,
+                "away_score": f.away_score,
+                "home_id": f.home_id,
+                "home": f.home_name,
+                "home_score": f.home_score,
+                "previous": [old.away_score, old.home_score] if old else None
+            })
+    return changed
+
+def _affected_cup_legs(changed):
+    touched = {(c["gw"], team_id) for c in changed for team_id in (c["away_id"], c["home_id"]) if team_id}
+    if not touched:
+        return []
+
+    config = load_cup_config()
+    legs = []
+    for round_name in ROUNDS:
+        for match in config.get(round_name, {}).get("matches", []):
+            for leg in (1, 2):
+                gw = match.get(f"leg{leg}_gw")
+                sides = [side for side in ("home", "away") if (gw, match[side]) in touched]
+                if sides:
+                    legs.append({
+                        "round": round_name,
+                        "home": match["home"],
+                        "away": match["away"],
+                        "leg": leg,
+                        "gw": gw,
+                        "sides": sides
+                    })
+    return legs
+
+def _table_order(gameweeks):
+    return [row["teamId"] for row in standings_table(build_score_matrix(gameweeks))]
+
+def build_change(league_key, previous, gameweeks):
+    """Compact diff between two fetches of one league's schedule."""
+    fixtures = _changed_fixtures(previous, gameweeks)
+    before_order = _table_order(previous)
+    after_order = _table_order(gameweeks)
+    moved = before_order != after_order
+    return {
+        "league": league_key,
+        "gw": current_gameweek(gameweeks),
+        "at": int(time.time()),
+        "fixtures": fixtures,
+        "cup_legs": _affected_cup_legs(fixtures),
+        "standings_moved": moved,
+        "standings_order": after_order if moved else None
+    }
+
+def _on_schedule_change(league_key, previous, gameweeks):
+    global _version
+    # The first fetch of a league is the baseline, not a change.
+    if previous is None:
+        return
+    try:
+        change = build_change(league_key, previous, gameweeks)
+    except Exception:
+        # Never let diffing break the fetch that triggered it.
+        logger.exception("Failed to diff %s schedule", league_key)
+        return
+    if not change["fixtures"]:
+        return
+    with _lock:
+        _version += 1
+        change["version"] = _version
+        _changes.append(change)
+
+add_schedule_listener(_on_schedule_change)
+
+def get_changes(since=None, league_key=None):
+    """Changes newer than `since`.
+
+    `reset` is true when the caller has no version yet, is ahead of this
+    process (e.g. after a restart) or has fallen behind the retained log;
+    it should then reload full payloads and continue from `version`.
+    Leagues are refreshed first (within the schedule TTL), so polling this
+    endpoint is enough to pick up new scores.
+    """
+    for key in ([league_key] if league_key else list(LEAGUES)):
+        get_gameweeks(key)
+
+    with _lock:
+        current = _version
+        oldest = _changes[0]["version"] if _changes else current + 1
+        reset = since is None or since > current or since < oldest - 1
+        changes = [] if reset else [c for c in _changes if c["version"] > since]
+
+    if league_key:
+        changes = [c for c in changes if c["league"] == league_key]
+    return {"version": current, "reset": reset, "changes": changes}
+
+def get_version():
+    """Version of the newest recorded change; never refreshes."""
+    return _version
+
+def _poll_loop(interval):
+    with upstream_priority(LIVE):
+        while True:
+            for league_key in list(LEAGUES):
+                try:
+                    get_gameweeks(league_key, max_age=interval)
+                except Exception:
+                    logger.exception("Live poll failed for %s", league_key)
+            time.sleep(interval)
+
+def start_live_poller(interval=None):
+    """Refresh every league in the background so changes are picked up without viewers."""
+    global _poller
+    interval = LIVE_POLL_SECONDS if interval is None else interval
+    if interval <= 0 or _poller is not None:
+        return None
+    _poller = threading.Thread(target=_poll_loop, args=(interval,), name="live-poller", daemon=True)
+    _poller.start()
+    return _poller
@@ -0,0 +1,445 @@
+"""Simulate many concurrent dashboard viewers and report latency and upstream load.
+
+    python3 loadtest.py [--viewers 50] [--duration 60] [--speed 10] [--latency-ms 150]
+                        [--target URL --standin URL] [--draw-seconds 30] [--json]
+
+By default a Fantrax stand-in (fantrax_standin.py) and the app (python3
+app.py, as in the Procfile) are started locally. The app runs against a
+temporary copy of config/ and static/, so cup syncs and draw saves never
+touch the real files. --target points at an already running instance
+instead; pass --standin with it to report upstream calls.
+
+Each viewer follows the page's own traffic pattern in static/app.js:
+- Load the page shell and its assets, then the home section, sending
+  its requests together over up to six connections as a browser does.
+- Navigate between sections after a random dwell time.
+- Poll /api/changes on the home timer, reloading home when it reports
+  a change and otherwise just its cup and MOTM blocks.
+- Re-read the active cup round on the cup timer.
+- Open team profiles, which are served from the prefetched bulk
+  profiles once the teams section has loaded, until they expire.
+- Revalidate API responses with their ETags, as the browser cache does.
+An admin thread saves a cup draw every --draw-seconds.
+
+--speed divides the page's 60s refresh timers and the dwell times, so a
+short run covers many refresh cycles.
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import fantrax_standin
+from fantrax import LEAGUES
+from cup import DRAW_SOURCE_ROUND
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+HOME_REFRESH_SECONDS = 60
+CUP_REFRESH_SECONDS = 60
+PROFILE_TTL_SECONDS = 60
+# Concurrent requests a browser makes to one HTTP/1.1 host.
+BROWSER_CONNECTIONS = 6
+# Mean seconds a viewer stays on a section; home and cup are left open through matches.
+DWELL_SECONDS = {"home": 180, "cup": 120, "standings": 30, "teams": 20, "profile": 20, "motm": 20}
+ADMIN_KEY = os.environ.get("CUP_ADMIN_KEY", "fantrax13")
+
+# Section weights for each navigation, roughly how the page is used on matchday.
+SECTIONS = {"home": 35, "cup": 25, "standings": 15, "teams": 10, "profile": 10, "motm": 5}
+MONTHS = ["August", "September", "October", "November", "December",
+          "January", "February", "March", "April", "May"]
+
+# Path segments that name a route; anything else (league, team, month, round) is grouped as *.
+_ROUTE_WORDS = {
+    "api", "assets", "standings", "teams", "analytics", "projections", "motm", "rules", "auth",
+    "cup", "groups", "round", "refresh", "draw", "options", "current_round", "odds", "team",
+    "profile", "profiles", "gameweek", "current", "changes", "healthz", "readyz"
+}
+
+def _label(method, path):
+    """Group URLs by route so per-endpoint stats don't fan out per team or league."""
+    parts = path.split("?")[0].strip("/").split("/")
+    return f"{method} /" + "/".join(part if part in _ROUTE_WORDS else "*" for part in parts)
+
+def _current_month():
+    # Same rule as getCurrentMOTMMonth() in static/app.js.
+    month = datetime.now().strftime("%B")
+    return month if month in MONTHS else "May"
+
+class Stats:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.not_modified = {}
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def record(self, label, seconds, ok, size, not_modified=False):
+        with self._lock:
+            self.samples.setdefault(label, []).append(seconds)
+            self.bytes += size
+            if not ok:
+                self.errors[label] = self.errors.get(label, 0) + 1
+            if not_modified:
+                self.not_modified[label] = self.not_modified.get(label, 0) + 1
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def _summary(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50_ms": round(_percentile(values, 50) * 1000, 1),
+        "p90_ms": round(_percentile(values, 90) * 1000, 1),
+        "p99_ms": round(_percentile(values, 99) * 1000, 1),
+        "max_ms": round(values[-1] * 1000, 1)
+    }
+
+class Viewer:
+    def __init__(self, base_url, stats, speed, stop, seed):
+        self.base_url = base_url
+        self.stats = stats
+        self.speed = speed
+        self.stop = stop
+        self.rnd = random.Random(seed)
+        self.session = requests.Session()
+        self.pool = ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS)
+        # path -> (ETag, body) of the last 200, like the browser's HTTP cache.
+        self.etags = {}
+        self.live_version = None
+        self.profiles = {}
+        self.team_ids = []
+        self.section = "home"
+        self.cup_round = "groups"
+        self.next_home_poll = self.next_cup_poll = 0.0
+
+    def request(self, path, method="GET", **kwargs):
+        cached = self.etags.get(path) if method == "GET" else None
+        if cached:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": cached[0]}
+        started = time.perf_counter()
+        not_modified = False
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=60, **kwargs)
+            ok = response.status_code < 400
+            if cached and response.status_code == 304:
+                body, not_modified = cached[1], True
+            elif ok and response.headers.get("Content-Type", "").startswith("application/json"):
+                body = response.json()
+                ok = body.get("success", True)
+                etag = response.headers.get("ETag")
+                if ok and etag and method == "GET":
+                    self.etags[path] = (etag, body)
+            else:
+                body = None
+            size = len(response.content)
+        except (requests.RequestException, ValueError):
+            ok, body, size = False, None, 0
+        self.stats.record(_label(method, path), time.perf_counter() - started, ok, size, not_modified)
+        return body if ok else None
+
+    def parallel(self, calls):
+        """Run (fn, *args) calls together, like the page's Promise.all."""
+        futures = [self.pool.submit(*call) for call in calls]
+        return [future.result() for future in futures]
+
+    def load_page(self):
+        started = time.perf_counter()
+        try:
+            response = self.session.get(self.base_url + "/", timeout=60)
+            ok = response.status_code == 200
+            html = response.text
+        except requests.RequestException:
+            ok, html = False, ""
+        self.stats.record("GET /", time.perf_counter() - started, ok, len(html))
+        for asset in sorted(set(re.findall(r'/assets/[\w.-]+', html))):
+            self.request(asset)
+
+    def home_cup(self):
+        current = self.request("/api/cup/current_round")
+        self.request(f"/api/cup/round/{current['data'] if current else 'groups'}")
+
+    def home_blocks(self):
+        """The home cup and MOTM blocks, which refresh even without score changes."""
+        month = _current_month()
+        return [(self.request, f"/api/motm/{league_key}/{month}") for league_key in LEAGUES] + [(self.home_cup,)]
+
+    def load_home(self):
+        self.parallel(
+            [(self.request, f"/api/standings/{league_key}") for league_key in LEAGUES] +
+            [(self.request, "/api/gameweek/current")] +
+            self.home_blocks()
+        )
+
+    def poll_changes(self):
+        query = "" if self.live_version is None else f"?since={self.live_version}"
+        body = self.request(f"/api/changes{query}")
+        if body is None:
+            return True
+        data = body["data"]
+        changed = self.live_version is None or data["reset"] or bool(data["changes"])
+        self.live_version = data["version"]
+        return changed
+
+    def load_cup(self):
+        current = self.request("/api/cup/current_round")
+        round_name = current["data"] if current else "groups"
+        if round_name == "groups":
+            self.request("/api/cup/groups")
+        else:
+            self.request(f"/api/cup/round/{round_name}")
+        self.cup_round = round_name
+
+    def load_teams(self):
+        teams = self.request("/api/teams")
+        if teams:
+            self.team_ids = [team["teamId"] for league in teams["data"].values() for team in league["teams"]]
+        if not self.profiles:
+            bulk = self.request("/api/team/profiles")
+            if bulk:
+                fetched_at = time.monotonic()
+                self.profiles = {team_id: (data, fetched_at) for team_id, data in bulk["data"]["profiles"].items()}
+
+    def open_profile(self):
+        if not self.team_ids:
+            standings = self.request(f"/api/standings/{self.rnd.choice(list(LEAGUES))}")
+            if standings:
+                self.team_ids = [row["teamId"] for row in standings["data"]]
+        if not self.team_ids:
+            return
+        team_id = self.rnd.choice(self.team_ids)
+        cached = self.profiles.get(team_id)
+        if cached is None or time.monotonic() - cached[1] >= PROFILE_TTL_SECONDS / self.speed:
+            profile = self.request(f"/api/team/profile/{team_id}")
+            if profile:
+                self.profiles[team_id] = (profile["data"], time.monotonic())
+
+    def navigate(self, section):
+        self.section = section
+        now = time.monotonic()
+        if section == "home":
+            self.next_home_poll = now + HOME_REFRESH_SECONDS / self.speed
+            self.load_home()
+        elif section == "cup":
+            self.next_cup_poll = now + CUP_REFRESH_SECONDS / self.speed
+            self.load_cup()
+        elif section == "standings":
+            self.request(f"/api/standings/{self.rnd.choice(list(LEAGUES))}")
+        elif section == "motm":
+            self.request(f"/api/motm/{self.rnd.choice(list(LEAGUES))}/{self.rnd.choice(MONTHS)}")
+        elif section == "teams":
+            self.load_teams()
+        elif section == "profile":
+            self.open_profile()
+
+    def timers(self):
+        now = time.monotonic()
+        if self.section == "home" and now >= self.next_home_poll:
+            self.next_home_poll = now + HOME_REFRESH_SECONDS / self.speed
+            if self.poll_changes():
+                self.load_home()
+            else:
+                self.parallel(self.home_blocks())
+        if self.section == "cup" and now >= self.next_cup_poll:
+            self.next_cup_poll = now + CUP_REFRESH_SECONDS / self.speed
+            if self.cup_round != "groups":
+                self.request(f"/api/cup/round/{self.cup_round}")
+
+    def run(self):
+        self.load_page()
+        self.navigate("home")
+        sections, weights = zip(*SECTIONS.items())
+        while not self.stop.is_set():
+            dwell = self.rnd.expovariate(1 / DWELL_SECONDS[self.section])
+            deadline = time.monotonic() + dwell / self.speed
+            # Stay on the section, letting its refresh timer fire, until the viewer moves on.
+            while not self.stop.is_set() and time.monotonic() < deadline:
+                self.timers()
+                self.stop.wait(max(0.0, min(1.0, deadline - time.monotonic())))
+            if not self.stop.is_set():
+                self.navigate(self.rnd.choices(sections, weights)[0])
+        self.pool.shutdown()
+
+def _admin_draws(base_url, stats, interval, stop):
+    """Periodically save a cup draw, like an admin using the draw builder."""
+    viewer = Viewer(base_url, stats, 1, stop, seed=-1)
+    headers = {"X-Admin-Key": ADMIN_KEY}
+    while not stop.wait(interval):
+        for round_name in DRAW_SOURCE_ROUND:
+            options = viewer.request(f"/api/cup/draw/options/{round_name}", headers=headers)
+            team_ids = [team["id"] for team in options["data"]["teams"]] if options else []
+            if len(team_ids) < 2 or len(team_ids) % 2:
+                continue
+            viewer.rnd.shuffle(team_ids)
+            matches = [{"home": team_ids[i], "away": team_ids[i + 1]} for i in range(0, len(team_ids), 2)]
+            viewer.request(f"/api/cup/draw/{round_name}", method="POST", headers=headers,
+                           json={"matches": matches})
+            break
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _start_local_app(standin_url, workdir):
+    for name in ("config", "static"):
+        shutil.copytree(os.path.join(REPO_DIR, name), os.path.join(workdir, name))
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port), FANTRAX_BASE_URL=standin_url, CUP_ADMIN_KEY=ADMIN_KEY,
+               FANTRAX_SNAPSHOT_DIR=os.path.join(workdir, "snapshot"))
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, "app.py")], cwd=workdir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return process, f"http://127.0.0.1:{port}"
+
+def _wait_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(base_url + "/readyz", timeout=5).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    return False
+
+def _upstream_calls(standin_url):
+    if not standin_url:
+        return None
+    try:
+        return requests.get(standin_url + "/_stats", timeout=5).json()["calls"]
+    except (requests.RequestException, ValueError, KeyError):
+        return None
+
+def run(base_url, viewers=50, duration=60, speed=10, draw_seconds=30, standin_url=None, ramp=5):
+    stats = Stats()
+    stop = threading.Event()
+    threads = []
+    upstream_before = _upstream_calls(standin_url)
+    started = time.monotonic()
+    for i in range(viewers):
+        viewer = Viewer(base_url, stats, speed, stop, seed=i)
+        thread = threading.Thread(target=viewer.run, name=f"viewer-{i}", daemon=True)
+        thread.start()
+        threads.append(thread)
+        # Spread arrivals over the ramp so the first page loads don't all coincide.
+        time.sleep(ramp / max(1, viewers))
+    if draw_seconds > 0:
+        threads.append(threading.Thread(target=_admin_draws, args=(base_url, stats, draw_seconds, stop),
+                                        name="admin", daemon=True))
+        threads[-1].start()
+
+    time.sleep(max(0.0, duration - (time.monotonic() - started)))
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=60)
+    elapsed = time.monotonic() - started
+    upstream_after = _upstream_calls(standin_url)
+
+    all_samples = [s for samples in stats.samples.values() for s in samples]
+    report = {
+        "viewers": viewers,
+        "duration_s": round(elapsed, 1),
+        "speed": speed,
+        "requests": len(all_samples),
+        "errors": sum(stats.errors.values()),
+        "throughput_rps": round(len(all_samples) / elapsed, 1),
+        "mb_sent": round(stats.bytes / 1024 / 1024, 2),
+        "latency": _summary(all_samples) if all_samples else None,
+        "not_modified": sum(stats.not_modified.values()),
+        "endpoints": {
+            label: {**_summary(samples), "not_modified": stats.not_modified.get(label, 0),
+                    "errors": stats.errors.get(label, 0)}
+            for label, samples in sorted(stats.samples.items())
+        }
+    }
+    if upstream_before is not None and upstream_after is not None:
+        calls = {kind: upstream_after[kind] - upstream_before.get(kind, 0) for kind in upstream_after}
+        report["upstream"] = {
+            "calls": calls,
+            "per_minute": round(sum(calls.values()) / elapsed * 60, 1)
+        }
+    return report
+
+def print_report(report):
+    latency = report["latency"] or {}
+    print(f"{report['viewers']} viewers for {report['duration_s']}s (timers x{report['speed']})")
+    print(f"  {report['requests']} requests, {report['not_modified']} not modified, {report['errors']} errors, "
+          f"{report['throughput_rps']} req/s, {report['mb_sent']} MB")
+    print(f"  latency p50 {latency.get('p50_ms')}ms  p90 {latency.get('p90_ms')}ms  "
+          f"p99 {latency.get('p99_ms')}ms  max {latency.get('max_ms')}ms")
+    if "upstream" in report:
+        upstream = report["upstream"]
+        calls = ", ".join(f"{kind} {count}" for kind, count in upstream["calls"].items())
+        print(f"  upstream calls: {calls} ({upstream['per_minute']}/min)")
+    print()
+    width = max(len(label) for label in report["endpoints"]) if report["endpoints"] else 10
+    print(f"  {'endpoint':<{width}}  {'count':>6}  {'p50':>8}  {'p90':>8}  {'p99':>8}  {'max':>8}  "
+          f"{'304':>5}  {'err':>4}")
+    for label, row in report["endpoints"].items():
+        print(f"  {label:<{width}}  {row['count']:>6}  {row['p50_ms']:>8}  {row['p90_ms']:>8}  "
+              f"{row['p99_ms']:>8}  {row['max_ms']:>8}  {row['not_modified']:>5}  {row['errors']:>4}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with simulated viewers.")
+    parser.add_argument("--viewers", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--speed", type=float, default=10, help="divide refresh timers and dwell times by this")
+    parser.add_argument("--draw-seconds", type=float, default=None,
+                        help="seconds between admin draw saves (default 30 locally, off with --target)")
+    parser.add_argument("--target", help="base URL of a running instance instead of starting one")
+    parser.add_argument("--standin", help="stand-in URL to read upstream call counts from (with --target)")
+    parser.add_argument("--latency-ms", type=float, default=150, help="stand-in delay per upstream call")
+    parser.add_argument("--live-seconds", type=float, default=5, help="stand-in seconds between score updates")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    process = workdir = None
+    standin_url = args.standin
+    base_url = args.target
+    draw_seconds = args.draw_seconds
+    try:
+        if not base_url:
+            server, _ = fantrax_standin.serve(latency_ms=args.latency_ms, live_seconds=args.live_seconds)
+            standin_url = f"http://127.0.0.1:{server.server_address[1]}"
+            workdir = tempfile.mkdtemp(prefix="loadtest-")
+            process, base_url = _start_local_app(standin_url, workdir)
+            if not _wait_ready(base_url):
+                print("App did not become ready", file=sys.stderr)
+                return 1
+            draw_seconds = 30 if draw_seconds is None else draw_seconds
+        else:
+            base_url = base_url.rstrip("/")
+            # Never write draws to a real deployment unless asked to.
+            draw_seconds = 0 if draw_seconds is None else draw_seconds
+
+        report = run(base_url, args.viewers, args.duration, args.speed, draw_seconds, standin_url)
+        if args.json:
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            print_report(report)
+        return 1 if report["errors"] else 0
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+@dataclass(slots=True)
+class Fixture:
+    """One head-to-head fixture. Fantrax reports unplayed fixtures as 0-0."""
+    gw: int
+    away_id: str | None
+    away_name: str
+    away_score: float
+    home_id: str | None
+    home_name: str
+    home_score: float
+
+    @property
+    def played(self):
+        return not (self.away_score == 0.0 and self.home_score == 0.0)
+
+    @property
+    def away_key(self):
+        return self.away_id or self.away_name
+
+    @property
+    def home_key(self):
+        return self.home_id or self.home_name
+
+    def involves(self, team_id):
+        return team_id in (self.away_id, self.home_id)
+
+    def score_for(self, team_id):
+        if team_id == self.away_id:
+            return self.away_score
+        if team_id == self.home_id:
+            return self.home_score
+        return None
+
+    def to_row(self):
+        """Compact [away_id, away_name, away_score, home_id, home_name, home_score] form."""
+        return [self.away_id, self.away_name, self.away_score, self.home_id, self.home_name, self.home_score]
+
+    @classmethod
+    def from_row(cls, gw, row):
+        away_id, away_name, away_score, home_id, home_name, home_score = row
+        return cls(gw=gw, away_id=away_id, away_name=away_name, away_score=away_score,
+                   home_id=home_id, home_name=home_name, home_score=home_score)
+
+    def to_team_dict(self, team_id):
+        """The fixture from one team's side, as served in team profiles."""
+        played = self.played
+        is_home = team_id == self.home_id
+        team_score = self.home_score if is_home else self.away_score
+        opp_score = self.away_score if is_home else self.home_score
+
+        result = None
+        if played:
+            if team_score > opp_score:
+                result = "W"
+            elif team_score < opp_score:
+                result = "L"
+            else:
+                result = "D"
+
+        return {
+            "gw": self.gw,
+            "team": self.home_name if is_home else self.away_name,
+            "opponent": self.away_name if is_home else self.home_name,
+            "opponent_id": self.away_id if is_home else self.home_id,
+            "is_home": is_home,
+            "team_score": team_score if played else None,
+            "opp_score": opp_score if played else None,
+            "played": played,
+            "result": result
+        }
+
+@dataclass(slots=True)
+class Gameweek:
+    number: int
+    fixtures: list = field(default_factory=list)
+    end: datetime | None = None
+
+    def complete(self, now=None):
+        # Prefer explicit period end metadata when available.
+        if self.end is not None:
+            return (now or datetime.now(timezone.utc)) >= self.end
+        # Fallback: treat all-0 fixtures as unplayed.
+        return all(f.played for f in self.fixtures)
+
+    def to_dict(self):
+        return {
+            "gw": self.number,
+            "end": self.end.isoformat() if self.end else None,
+            "fixtures": [f.to_row() for f in self.fixtures]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        end = datetime.fromisoformat(data["end"]) if data.get("end") else None
+        return cls(number=data["gw"], fixtures=[Fixture.from_row(data["gw"], row) for row in data["fixtures"]],
+                   end=end)
+
+    def fixture_for(self, team_id):
+        for fixture in self.fixtures:
+            if fixture.involves(team_id):
+                return fixture
+        return None
+
+@dataclass(slots=True)
+class TeamRecord:
+    """Running W/D/L, 3-1-0 points and PF/PA totals for one team."""
+    team_id: str
+    name: str
+    league: str | None = None
+    pts: int = 0
+    w: int = 0
+    d: int = 0
+    l: int = 0
+    pf: float = 0.0
+    pa: float = 0.0
+
+    def add_result(self, score_for, score_against):
+        self.pf += score_for
+        self.pa += score_against
+        if score_for > score_against:
+            self.pts += 3
+            self.w += 1
+        elif score_for < score_against:
+            self.l += 1
+        else:
+            self.pts += 1
+            self.d += 1
+
+    @property
+    def sort_key(self):
+        return (self.pts, self.pf)
+
+    def stats(self):
+        return {
+            "pts": self.pts,
+            "w": self.w,
+            "d": self.d,
+            "l": self.l,
+            "pf": self.pf,
+            "pa": self.pa
+        }
+
+@dataclass(slots=True)
+class CupMatch:
+    """A two-legged knockout tie as stored in config/cup.json."""
+    home: str
+    away: str
+    leg1_gw: int | None = None
+    leg1_home: float | None = None
+    leg1_away: float | None = None
+    leg2_gw: int | None = None
+    leg2_home: float | None = None
+    leg2_away: float | None = None
+    winner: str | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            home=data["home"],
+            away=data["away"],
+            leg1_gw=data.get("leg1_gw"),
+            leg1_home=data.get("leg1_home"),
+            leg1_away=data.get("leg1_away"),
+            leg2_gw=data.get("leg2_gw"),
+            leg2_home=data.get("leg2_home"),
+            leg2_away=data.get("leg2_away"),
+            winner=data.get("winner")
+        )
+
+    @property
+    def home_agg(self):
+        return (self.leg1_home or 0) + (self.leg2_home or 0)
+
+    @property
+    def away_agg(self):
+        return (self.leg1_away or 0) + (self.leg2_away or 0)
+
+    def to_dict(self):
+        return {
+            "home": self.home,
+            "away": self.away,
+            "leg1_gw": self.leg1_gw,
+            "leg1_home": self.leg1_home,
+            "leg1_away": self.leg1_away,
+            "leg2_gw": self.leg2_gw,
+            "leg2_home": self.leg2_home,
+            "leg2_away": self.leg2_away,
+            "winner": self.winner
+        }
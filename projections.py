@@ -0,0 +1,360 @@
+import os
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from cache import LRUCache
+from fantrax import LEAGUES, CACHE_MAX_LEAGUES, CACHE_MAX_BYTES, count_ended, get_versioned_gameweeks
+from analytics import build_score_matrix, WIN, DRAW
+from cup import ROUNDS, DRAW_SOURCE_ROUND, load_cup_config, get_config_version
+
+DEFAULT_SIMS = int(os.environ.get("PROJECTION_SIMS", "20000"))
+# ?sims= is rounded down to one of these, so each league has few cached variants.
+SIM_STEPS = (1000, 5000, 20000, 50000)
+# Simulations run in chunks of at most this many; memory grows with chunk size.
+CHUNK_SIMS = 10000
+# Above 1, chunks are spread across a process pool.
+WORKERS = int(os.environ.get("PROJECTION_WORKERS", "1"))
+
+# (kind, league_key, sims) -> ((data version, ended gameweeks), result)
+_projection_cache = LRUCache((CACHE_MAX_LEAGUES + 1) * len(SIM_STEPS), CACHE_MAX_BYTES // 4)
+_projection_lock = threading.Lock()
+_pool = None
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=WORKERS)
+    return _pool
+
+def _run_chunks(fn, args, n_sims, seed):
+    """Run fn(*args, chunk_sims, seed) over n_sims in chunks, optionally across processes."""
+    chunks = max(1, min(n_sims, max(WORKERS, -(-n_sims // CHUNK_SIMS))))
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+    sizes = [n_sims // chunks + (1 if i < n_sims % chunks else 0) for i in range(chunks)]
+    if WORKERS <= 1:
+        return [fn(*args, size, s) for size, s in zip(sizes, seeds)]
+    pool = _get_pool()
+    futures = [pool.submit(fn, *args, size, s) for size, s in zip(sizes, seeds)]
+    return [f.result() for f in futures]
+
+def _clamp_sims(sims):
+    if sims is None:
+        return DEFAULT_SIMS
+    return max([step for step in SIM_STEPS if step <= sims], default=SIM_STEPS[0])
+
+def _seed_for(version):
+    return int(version[:8], 16)
+
+def _sample(history, counts, teams, rng):
+    idx = (rng.random(teams.shape) * counts[teams]).astype(np.int64)
+    return history[teams, idx]
+
+def _score_history(pf, fixed, pooled):
+    """Padded per-team completed scores; teams with none use the pooled scores."""
+    counts = fixed.sum(axis=1).astype(np.int64)
+    width = max(int(counts.max()) if len(counts) else 0, len(pooled), 1)
+    history = np.zeros((len(counts), width), dtype=np.float64)
+    for t in range(len(counts)):
+        scores = pf[t][fixed[t]]
+        if len(scores):
+            history[t, :len(scores)] = scores
+        elif len(pooled):
+            history[t, :len(pooled)] = pooled
+            counts[t] = len(pooled)
+        else:
+            counts[t] = 1
+    return history, counts
+
+def _league_state(gameweeks):
+    matrix = build_score_matrix(gameweeks)
+    complete = np.array([gw.complete() for gw in gameweeks], dtype=bool)
+    fixed = matrix["played"] & complete[None, :]
+    history, counts = _score_history(matrix["pf"], fixed, matrix["pf"][fixed])
+    return {
+        "matrix": matrix,
+        "complete": complete,
+        "fixed": fixed,
+        "history": history,
+        "counts": counts
+    }
+
+# ── LEAGUE FINISHES ────────────────────────────────────────────────────────────
+
+def _run_league_chunk(current_pts, current_pf, away, home, history, counts, n_sims, seed):
+    rng = np.random.default_rng(seed)
+    team_count = len(current_pts)
+    fixture_count = len(away)
+
+    pts = np.broadcast_to(current_pts.astype(np.float64), (n_sims, team_count)).copy()
+    pf = np.broadcast_to(current_pf, (n_sims, team_count)).copy()
+    if fixture_count:
+        away_scores = _sample(history, counts, np.broadcast_to(away, (n_sims, fixture_count)), rng)
+        home_scores = _sample(history, counts, np.broadcast_to(home, (n_sims, fixture_count)), rng)
+        away_pts = np.where(away_scores > home_scores, 3.0, np.where(away_scores == home_scores, 1.0, 0.0))
+        home_pts = np.where(home_scores > away_scores, 3.0, np.where(away_scores == home_scores, 1.0, 0.0))
+
+        # fixtures × teams incidence so per-team totals are a matrix product.
+        away_onehot = np.zeros((fixture_count, team_count))
+        away_onehot[np.arange(fixture_count), away] = 1.0
+        home_onehot = np.zeros((fixture_count, team_count))
+        home_onehot[np.arange(fixture_count), home] = 1.0
+        pts += away_pts @ away_onehot + home_pts @ home_onehot
+        pf += away_scores @ away_onehot + home_scores @ home_onehot
+
+    # Points, then PF, then a coin toss for exact ties.
+    key = pts * 1e6 + pf + rng.random((n_sims, team_count)) * 1e-3
+    order = np.argsort(-key, axis=1)
+    flat = order * team_count + np.arange(team_count)[None, :]
+    positions = np.bincount(flat.ravel(), minlength=team_count * team_count)
+    return positions.reshape(team_count, team_count), pts.sum(axis=0)
+
+def simulate_league(gameweeks, n_sims, seed):
+    state = _league_state(gameweeks)
+    matrix = state["matrix"]
+    fixed = state["fixed"]
+    result = matrix["result"]
+
+    current_pts = ((result == WIN) & fixed).sum(axis=1) * 3 + ((result == DRAW) & fixed).sum(axis=1)
+    current_pf = np.where(fixed, matrix["pf"], 0.0).sum(axis=1)
+
+    # Anything in a gameweek that hasn't finished is re-simulated, live scores included.
+    home_idx, gw_idx = np.nonzero(matrix["is_home"] & ~fixed & (matrix["opponent"] >= 0))
+    away_idx = matrix["opponent"][home_idx, gw_idx]
+
+    chunks = _run_chunks(
+        _run_league_chunk,
+        (current_pts, current_pf, away_idx, home_idx, state["history"], state["counts"]),
+        n_sims, seed
+    )
+    positions = sum(c[0] for c in chunks)
+    total_pts = sum(c[1] for c in chunks)
+
+    teams = []
+    for i, team_id in enumerate(matrix["team_ids"]):
+        probs = positions[i] / n_sims
+        teams.append({
+            "teamId": team_id,
+            "team": matrix["team_names"][i],
+            "current_pts": int(current_pts[i]),
+            "expected_pts": round(float(total_pts[i] / n_sims), 2),
+            "expected_position": round(float((probs * np.arange(1, len(probs) + 1)).sum()), 2),
+            "positions": [round(float(p), 4) for p in probs]
+        })
+    teams.sort(key=lambda t: t["expected_position"])
+    return {"remaining_fixtures": len(home_idx), "teams": teams}
+
+def get_league_projection(league_key, sims=None):
+    n_sims = _clamp_sims(sims)
+    gameweeks, version = get_versioned_gameweeks(league_key)
+    state = (version, count_ended(gameweeks))
+    cache_key = ("league", league_key, n_sims)
+    cached = _projection_cache.get(cache_key)
+    if cached and cached[0] == state:
+        return cached[1]
+
+    with _projection_lock:
+        cached = _projection_cache.get(cache_key)
+        if cached and cached[0] == state:
+            return cached[1]
+        result = {
+            "league": league_key,
+            "version": version,
+            "sims": n_sims,
+            **simulate_league(gameweeks, n_sims, _seed_for(version))
+        }
+        _projection_cache.set(cache_key, (state, result))
+        return result
+
+# ── CUP ODDS ───────────────────────────────────────────────────────────────────
+
+def _leg_scores(inputs, teams, gw, rng):
+    sampled = _sample(inputs["history"], inputs["counts"], teams, rng)
+    if gw >= inputs["known_mask"].shape[1]:
+        return sampled
+    return np.where(inputs["known_mask"][teams, gw], inputs["known_score"][teams, gw], sampled)
+
+def _run_cup_chunk(inputs, rounds, n_sims, seed):
+    rng = np.random.default_rng(seed)
+    team_count = len(inputs["counts"])
+    reach = []
+    alive = None
+
+    for spec in rounds:
+        if spec["matches"]:
+            pairs = np.array([(m[0], m[1]) for m in spec["matches"]], dtype=np.int64)
+            home = np.broadcast_to(pairs[:, 0], (n_sims, len(pairs)))
+            away = np.broadcast_to(pairs[:, 1], (n_sims, len(pairs)))
+            decided = np.broadcast_to(np.array([m[2] for m in spec["matches"]], dtype=np.int64), home.shape)
+            byes = None
+        else:
+            if alive is None or not spec["drawable"] or alive.shape[1] < 2:
+                break
+            # Random draw among each simulation's surviving teams.
+            shuffled = np.take_along_axis(alive, np.argsort(rng.random(alive.shape), axis=1), axis=1)
+            pair_count = shuffled.shape[1] // 2
+            home = shuffled[:, 0:pair_count * 2:2]
+            away = shuffled[:, 1:pair_count * 2:2]
+            byes = shuffled[:, pair_count * 2:]
+            decided = np.full(home.shape, -1, dtype=np.int64)
+
+        entrants = np.concatenate([home, away] + ([byes] if byes is not None else []), axis=1)
+        reach.append(np.bincount(entrants.ravel(), minlength=team_count))
+
+        home_agg = np.zeros(home.shape)
+        away_agg = np.zeros(away.shape)
+        for gw in spec["legs"]:
+            home_agg += _leg_scores(inputs, home, gw, rng)
+            away_agg += _leg_scores(inputs, away, gw, rng)
+        coin = rng.random(home.shape) < 0.5
+        home_wins = (home_agg > away_agg) | ((home_agg == away_agg) & coin)
+        winners = np.where(decided >= 0, decided, np.where(home_wins, home, away))
+        alive = winners if byes is None else np.concatenate([winners, byes], axis=1)
+
+    champions = None
+    if len(reach) == len(rounds) and alive is not None and alive.shape[1] == 1:
+        champions = np.bincount(alive[:, 0], minlength=team_count)
+    return reach, champions
+
+def _cup_inputs(config, league_states):
+    team_ids = []
+    index_by_id = {}
+    team_league = []
+
+    def add(team_id, league_key=None):
+        if team_id not in index_by_id:
+            index_by_id[team_id] = len(team_ids)
+            team_ids.append(team_id)
+            team_league.append(league_key)
+        elif league_key and team_league[index_by_id[team_id]] is None:
+            team_league[index_by_id[team_id]] = league_key
+
+    for league_key, teams in config.get("team_ids", {}).items():
+        for team_id in teams.values():
+            add(team_id, league_key)
+
+    rounds = []
+    for round_name in ROUNDS:
+        round_cfg = config.get(round_name, {})
+        leg_cfg = config.get("schedule", {}).get(round_name, {})
+        matches = []
+        legs = [leg_cfg.get("leg1"), leg_cfg.get("leg2")]
+        for match in round_cfg.get("matches", []):
+            add(match["home"])
+            add(match["away"])
+            winner = match.get("winner")
+            if winner:
+                add(winner)
+            matches.append((index_by_id[match["home"]], index_by_id[match["away"]],
+                            index_by_id[winner] if winner else -1))
+            legs = [match.get("leg1_gw"), match.get("leg2_gw")]
+        rounds.append({
+            "name": round_name,
+            "legs": [gw for gw in legs if gw],
+            "matches": matches,
+            "drawable": round_name in DRAW_SOURCE_ROUND
+        })
+
+    max_gw = max([len(s["complete"]) for s in league_states.values()] +
+                 [gw for r in rounds for gw in r["legs"]] + [0])
+    team_count = len(team_ids)
+    known_mask = np.zeros((team_count, max_gw + 1), dtype=bool)
+    known_score = np.zeros((team_count, max_gw + 1), dtype=np.float64)
+    all_scores = [s["matrix"]["pf"][s["fixed"]] for s in league_states.values()]
+    pooled = np.concatenate(all_scores) if all_scores else np.zeros(0)
+    histories = []
+
+    for i, team_id in enumerate(team_ids):
+        state = league_states.get(team_league[i])
+        row = state["matrix"]["index_by_id"].get(team_id) if state else None
+        if row is None:
+            histories.append(pooled)
+            continue
+        fixed = state["fixed"][row]
+        gw_count = len(fixed)
+        known_mask[i, 1:gw_count + 1] = fixed
+        known_score[i, 1:gw_count + 1] = state["matrix"]["pf"][row]
+        histories.append(state["matrix"]["pf"][row][fixed])
+
+    width = max([len(h) for h in histories] + [1])
+    history = np.zeros((team_count, width), dtype=np.float64)
+    counts = np.ones(team_count, dtype=np.int64)
+    for i, scores in enumerate(histories):
+        if len(scores):
+            history[i, :len(scores)] = scores
+            counts[i] = len(scores)
+
+    inputs = {
+        "history": history,
+        "counts": counts,
+        "known_mask": known_mask,
+        "known_score": known_score
+    }
+    return team_ids, team_league, inputs, rounds
+
+def simulate_cup(config, gameweeks_by_league, n_sims, seed):
+    league_states = {key: _league_state(gameweeks) for key, gameweeks in gameweeks_by_league.items()}
+    team_ids, team_league, inputs, rounds = _cup_inputs(config, league_states)
+    chunks = _run_chunks(_run_cup_chunk, (inputs, rounds), n_sims, seed)
+
+    simulated = min(len(c[0]) for c in chunks)
+    reach = [sum(c[0][r] for c in chunks) for r in range(simulated)]
+    champions = None
+    if all(c[1] is not None for c in chunks):
+        champions = sum(c[1] for c in chunks)
+
+    names = {}
+    for state in league_states.values():
+        names.update(zip(state["matrix"]["team_ids"], state["matrix"]["team_names"]))
+    for group in config.get("groups", {}).values():
+        for team in group.get("teams", []):
+            names.setdefault(team["id"], team["name"])
+
+    teams = []
+    for i, team_id in enumerate(team_ids):
+        reach_probs = {rounds[r]["name"]: round(float(reach[r][i] / n_sims), 4) for r in range(simulated)}
+        if not any(reach_probs.values()):
+            continue
+        teams.append({
+            "id": team_id,
+            "name": names.get(team_id, team_id),
+            "league": team_league[i],
+            "reach": reach_probs,
+            "win": round(float(champions[i] / n_sims), 4) if champions is not None else None
+        })
+    teams.sort(key=lambda t: (t["win"] or 0, [t["reach"].get(r["name"], 0) for r in rounds[::-1]]), reverse=True)
+    return {
+        "rounds": [rounds[r]["name"] for r in range(simulated)],
+        "complete_bracket": champions is not None,
+        "teams": teams
+    }
+
+def get_cup_odds(sims=None):
+    n_sims = _clamp_sims(sims)
+    config = load_cup_config()
+    gameweeks_by_league = {}
+    versions = [get_config_version(config)]
+    ended = 0
+    for league_key in LEAGUES:
+        gameweeks_by_league[league_key], league_version = get_versioned_gameweeks(league_key)
+        versions.append(league_version)
+        ended += count_ended(gameweeks_by_league[league_key])
+    version = hashlib.sha1("|".join(versions).encode("utf-8")).hexdigest()[:16]
+    state = (version, ended)
+
+    cache_key = ("cup", None, n_sims)
+    cached = _projection_cache.get(cache_key)
+    if cached and cached[0] == state:
+        return cached[1]
+
+    with _projection_lock:
+        cached = _projection_cache.get(cache_key)
+        if cached and cached[0] == state:
+            return cached[1]
+        result = {
+            "version": version,
+            "sims": n_sims,
+            **simulate_cup(config, gameweeks_by_league, n_sims, _seed_for(version))
+        }
+        _projection_cache.set(cache_key, (state, result))
+        return result
@@ -0,0 +1,129 @@
+"""Full season report: every league's standings, every MOTM month, cup groups and rounds.
+
+    python3 report.py [--format json|csv] [--out PATH]
+
+Each league's schedule and standings are fetched once, concurrently, and
+the sections are then computed in parallel from those results. JSON goes
+to stdout unless --out is given; CSV needs --out and writes one file per
+table into that directory.
+"""
+import os
+import sys
+import csv
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from fantrax import LEAGUES, LEAGUE_NAMES, get_gameweeks, get_standings, get_team_id_map
+from motm import calculate_motm, load_motm_config
+from cup import ROUNDS, load_cup_config, calculate_group_standings
+from models import CupMatch
+from upstream import BACKGROUND, set_default_priority
+
+def _fetch_league(league_key):
+    gameweeks = get_gameweeks(league_key)
+    standings = get_standings(league_key, gameweeks=gameweeks)
+    return league_key, gameweeks, standings
+
+def _cup_rounds(config, id_map):
+    rounds = {}
+    for round_name in ROUNDS:
+        matches = []
+        for match in map(CupMatch.from_dict, config.get(round_name, {}).get("matches", [])):
+            matches.append({
+                **match.to_dict(),
+                "home_name": id_map.get(match.home, match.home),
+                "away_name": id_map.get(match.away, match.away),
+                "winner_name": id_map.get(match.winner, match.winner) if match.winner else None,
+                "home_agg": match.home_agg,
+                "away_agg": match.away_agg
+            })
+        rounds[round_name] = matches
+    return rounds
+
+def build_report(workers=8):
+    cup_config = load_cup_config()
+    months = list(load_motm_config())
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched = list(pool.map(_fetch_league, LEAGUES))
+
+        id_map = {}
+        for league_key, gameweeks, _ in fetched:
+            id_map.update(get_team_id_map(league_key, gameweeks=gameweeks))
+
+        motm_jobs = {
+            (league_key, month): pool.submit(calculate_motm, league_key, month, gameweeks=gameweeks)
+            for league_key, gameweeks, _ in fetched
+            for month in months
+        }
+        groups_job = pool.submit(calculate_group_standings, id_map)
+        rounds_job = pool.submit(_cup_rounds, cup_config, id_map)
+
+        leagues = {}
+        for league_key, _, standings in fetched:
+            leagues[league_key] = {
+                "league_name": LEAGUE_NAMES[league_key],
+                "standings": standings,
+                "motm": {month: motm_jobs[(league_key, month)].result() for month in months}
+            }
+        cup = {"groups": groups_job.result(), "rounds": rounds_job.result()}
+
+    return {"leagues": leagues, "cup": cup}
+
+def _write_csv(path, fieldnames, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+def write_csv(report, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+
+    standings_rows = []
+    motm_rows = []
+    for league_key, league in report["leagues"].items():
+        for row in league["standings"]:
+            standings_rows.append({"league": league_key, **row})
+        for month, result in league["motm"].items():
+            for row in result.get("results", []):
+                motm_rows.append({"league": league_key, "month": month,
+                                  "month_complete": result["month_complete"], **row})
+
+    _write_csv(os.path.join(out_dir, "standings.csv"),
+               ["league", "rank", "teamId", "teamName", "pts", "w", "d", "l", "pf", "pa", "pd", "winPercentage"],
+               standings_rows)
+    _write_csv(os.path.join(out_dir, "motm.csv"),
+               ["league", "month", "month_complete", "rank", "teamId", "team", "pts", "w", "d", "l", "pf", "pa", "winner"],
+               motm_rows)
+    _write_csv(os.path.join(out_dir, "cup_groups.csv"),
+               ["group", "rank", "id", "name", "league", "pts", "w", "d", "l", "pf", "pa"],
+               [{"group": name, **row} for name, rows in report["cup"]["groups"].items() for row in rows])
+    _write_csv(os.path.join(out_dir, "cup_rounds.csv"),
+               ["round", "home", "home_name", "away", "away_name", "leg1_gw", "leg1_home", "leg1_away",
+                "leg2_gw", "leg2_home", "leg2_away", "home_agg", "away_agg", "winner", "winner_name"],
+               [{"round": name, **row} for name, rows in report["cup"]["rounds"].items() for row in rows])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a full season report.")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--out", help="output file (json) or directory (csv)")
+    args = parser.parse_args(argv)
+    set_default_priority(BACKGROUND)
+
+    if args.format == "csv" and not args.out:
+        parser.error("--out is required for csv output")
+
+    report = build_report()
+    if args.format == "csv":
+        write_csv(report, args.out)
+    elif args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import os
+import json
+import gzip
+import hashlib
+from cache import LRUCache
+
+try:
+    import orjson
+except ImportError:  # listed in requirements.txt; without it the stdlib encoder is used
+    orjson = None
+
+# JSON bodies at least this large are gzipped for clients that accept it.
+GZIP_MIN_BYTES = int(os.environ.get("GZIP_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+
+# Encoded API responses kept, bounded by count and by total body bytes.
+RESPONSE_CACHE_ENTRIES = int(os.environ.get("RESPONSE_CACHE_ENTRIES", "512"))
+RESPONSE_CACHE_MB = float(os.environ.get("RESPONSE_CACHE_MB", "32"))
+# Cached API bodies are revalidated against their ETag on each poll.
+API_CACHE = "no-cache"
+
+def dumps(value):
+    """Compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass  # e.g. an integer wider than 64 bits; the stdlib copes
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _response_bytes(item):
+    return sum(len(body) for body in item["variants"].values())
+
+# (path, query, data version) -> {"etag", "mimetype", "variants"}
+_responses = LRUCache(RESPONSE_CACHE_ENTRIES, int(RESPONSE_CACHE_MB * 1024 * 1024), sizer=_response_bytes)
+
+def get_response(key):
+    return _responses.get(key)
+
+def store_response(key, body):
+    """Cache an encoded body with its gzip variant, so hits never re-encode."""
+    variants = {"identity": body}
+    if len(body) >= GZIP_MIN_BYTES:
+        variants["gzip"] = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    item = {
+        "etag": hashlib.sha1(body).hexdigest()[:16],
+        "mimetype": "application/json",
+        "variants": variants
+    }
+    _responses.set(key, item)
+    return item
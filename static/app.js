@@ -0,0 +1,1122 @@
+const MOTM_MONTHS = [
+  'August', 'September', 'October', 'November',
+  'December', 'January', 'February', 'March', 'April', 'May'
+];
+const HOME_REFRESH_MS = 60000;
+const CUP_REFRESH_MS = 60000;
+
+// ── MONTH END DATES ──────────────────────────────────────────────────────────
+const MONTH_END = {
+  August:"2025-09-11", September:"2025-10-02", October:"2025-10-30",
+  November:"2025-11-27", December:"2026-01-08", January:"2026-01-29",
+  February:"2026-02-26", March:"2026-03-26", April:"2026-04-23", May:"2026-05-28"
+};
+
+function isMonthComplete(month) {
+  return MONTH_END[month] ? new Date() > new Date(MONTH_END[month]) : false;
+}
+
+// ── NAVIGATION ───────────────────────────────────────────────────────────────
+let homeRefreshTimer = null;
+let cupRefreshTimer = null;
+
+function clearHomeAutoRefresh() {
+  if (!homeRefreshTimer) return;
+  clearInterval(homeRefreshTimer);
+  homeRefreshTimer = null;
+}
+
+function clearCupAutoRefresh() {
+  if (!cupRefreshTimer) return;
+  clearInterval(cupRefreshTimer);
+  cupRefreshTimer = null;
+}
+
+let liveVersion = null;
+
+// Resolves true when scores changed since the last check (or on first use).
+async function hasLiveChanges() {
+  try {
+    const query = liveVersion === null ? '' : `?since=${liveVersion}`;
+    const json = await fetch(`/api/changes${query}`).then(r => r.json());
+    if (!json.success) return true;
+    const changed = liveVersion === null || json.data.reset || json.data.changes.length > 0;
+    liveVersion = json.data.version;
+    return changed;
+  } catch (e) {
+    return true;
+  }
+}
+
+function startHomeAutoRefresh() {
+  clearHomeAutoRefresh();
+  homeRefreshTimer = setInterval(async () => {
+    const section = document.getElementById('section-home');
+    if (!section || !section.classList.contains('active')) return;
+    if (await hasLiveChanges()) {
+      loadHome(true);
+    } else {
+      // Cup results and MOTM month_complete can change with no score change
+      // (cup-sync writes, gameweek deadlines), so these two always refresh.
+      loadHomeMOTM();
+      loadHomeCup();
+    }
+  }, HOME_REFRESH_MS);
+}
+
+function startCupAutoRefresh() {
+  clearCupAutoRefresh();
+  cupRefreshTimer = setInterval(() => {
+    const section = document.getElementById('section-cup');
+    if (!section || !section.classList.contains('active')) return;
+    refreshActiveCupRound(true);
+  }, CUP_REFRESH_MS);
+}
+
+function setNavActive(navKey) {
+  document.querySelectorAll('.nav-btn').forEach(b => b.classList.remove('active'));
+  if (!navKey) return;
+  const btn = document.querySelector(`.nav-btn[data-nav="${navKey}"]`);
+  if (btn) btn.classList.add('active');
+}
+
+function goHome() {
+  showSection('home', document.querySelector('.nav-btn[data-nav="home"]'));
+}
+
+function goToTeams() {
+  showSection('teams', document.querySelector('.nav-btn[data-nav="teams"]'));
+}
+
+function showSection(name, btn) {
+  document.querySelectorAll('.section').forEach(s => s.classList.remove('active'));
+  document.getElementById('section-' + name).classList.add('active');
+  if (btn && btn.dataset.nav) setNavActive(btn.dataset.nav);
+  clearHomeAutoRefresh();
+  clearCupAutoRefresh();
+  if (name === 'home') {
+    startHomeAutoRefresh();
+    loadHome();
+  }
+  if (name === 'standings') loadStandings();
+  if (name === 'motm')      loadMOTM();
+  if (name === 'cup') {
+    startCupAutoRefresh();
+    drawAdminKeyByRound = {};
+    initCup();
+    refreshActiveCupRound(true);
+  }
+  if (name === 'teams')     loadTeams();
+  if (name === 'rules') {
+    rulesAdminKey = '';
+    loadRules();
+  }
+}
+
+function formatRoundLabel(roundName) {
+  const labels = {
+    groups: 'Group Stage',
+    playoff: 'Playoff',
+    round_of_16: 'Round of 16',
+    quarter_final: 'Quarter Final',
+    semi_final: 'Semi Final',
+    final: 'Final'
+  };
+  return labels[roundName] || (roundName || '').replaceAll('_', ' ');
+}
+
+function formatScore(value) {
+  const n = Number(value);
+  if (!Number.isFinite(n)) return '0';
+  const fixed = n.toFixed(2);
+  return fixed.endsWith('00') ? n.toFixed(0) : fixed.replace(/0$/, '');
+}
+
+function getCurrentMOTMMonth() {
+  const nowMonth = new Date().toLocaleString('en-US', { month: 'long' });
+  return MOTM_MONTHS.includes(nowMonth) ? nowMonth : 'May';
+}
+
+function teamLink(label, teamId) {
+  if (!teamId) return label;
+  return `<button class="team-link" onclick="openTeamProfile('${teamId}')">${label}</button>`;
+}
+
+function formatOrdinal(n) {
+  const v = Number(n);
+  if (!Number.isFinite(v)) return n;
+  const mod100 = v % 100;
+  if (mod100 >= 11 && mod100 <= 13) return `${v}th`;
+  const mod10 = v % 10;
+  if (mod10 === 1) return `${v}st`;
+  if (mod10 === 2) return `${v}nd`;
+  if (mod10 === 3) return `${v}rd`;
+  return `${v}th`;
+}
+
+function escapeHtml(str) {
+  return `${str}`
+    .replaceAll('&', '&amp;')
+    .replaceAll('<', '&lt;')
+    .replaceAll('>', '&gt;')
+    .replaceAll('"', '&quot;')
+    .replaceAll("'", '&#39;');
+}
+
+function renderMarkdown(md) {
+  if (window.marked && typeof window.marked.parse === 'function') {
+    return window.marked.parse(md || '');
+  }
+  return `<p>${escapeHtml(md || '').replaceAll('\n', '<br>')}</p>`;
+}
+
+function normalizeRulesTables(rootEl) {
+  if (!rootEl) return;
+  const tables = rootEl.querySelectorAll('table');
+  tables.forEach(table => {
+    table.classList.remove('rules-table-2col');
+    const headerCols = table.querySelectorAll('thead tr th').length;
+    let cols = headerCols;
+    if (!cols) {
+      const firstRow = table.querySelector('tr');
+      cols = firstRow ? firstRow.children.length : 0;
+    }
+    if (cols === 2) table.classList.add('rules-table-2col');
+  });
+}
+
+function setRulesDisplay(markdownText) {
+  const display = document.getElementById('rules-display');
+  if (!display) return;
+  display.innerHTML = markdownText.trim()
+    ? renderMarkdown(markdownText)
+    : '<div class="empty" style="padding:1rem 0">No rules added yet</div>';
+  normalizeRulesTables(display);
+}
+
+// ── HOME ─────────────────────────────────────────────────────────────────────
+let homeLoaded = false;
+
+async function loadHomeMOTM() {
+  const motmMonthEl = document.getElementById('home-motm-month');
+  const motmEl = document.getElementById('home-motm-content');
+  if (!motmMonthEl || !motmEl) return;
+
+  const month = getCurrentMOTMMonth();
+  motmMonthEl.textContent = month;
+  try {
+    const motmJson = await Promise.all(LEAGUE_ORDER.map(leagueKey =>
+      fetch(`/api/motm/${leagueKey}/${month}`).then(r => r.json())
+    ));
+    const motmByLeague = {};
+    motmJson.forEach((json, idx) => {
+      if (json.success) motmByLeague[LEAGUE_ORDER[idx]] = json.data;
+    });
+    motmEl.innerHTML = renderHomeMOTM(motmByLeague);
+  } catch (e) {
+    motmEl.innerHTML = `<div class="error">Error loading MOTM: ${e.message}</div>`;
+  }
+}
+
+async function loadHomeCup() {
+  const cupTitleEl = document.getElementById('home-cup-title');
+  const cupEl = document.getElementById('home-cup-content');
+  if (!cupTitleEl || !cupEl) return;
+
+  try {
+    const cupRoundJson = await fetch('/api/cup/current_round').then(r => r.json());
+    const roundName = cupRoundJson.success ? cupRoundJson.data : 'groups';
+    cupTitleEl.textContent = `Latest Round: ${formatRoundLabel(roundName)}`;
+    const roundRes = await fetch(`/api/cup/round/${roundName}`);
+    const roundJson = await roundRes.json();
+    if (!roundJson.success) throw new Error(roundJson.error || 'Failed to load round');
+    cupEl.innerHTML = renderHomeCup(roundJson.data || []);
+  } catch (e) {
+    cupEl.innerHTML = `<div class="error">Error loading latest cup round: ${e.message}</div>`;
+  }
+}
+
+async function loadHome(force = false) {
+  const leadersEl = document.getElementById('home-leaders-content');
+  const cupTitleEl = document.getElementById('home-cup-title');
+  const cupEl = document.getElementById('home-cup-content');
+  const motmMonthEl = document.getElementById('home-motm-month');
+  const motmEl = document.getElementById('home-motm-content');
+  const gwEl = document.getElementById('home-gw-content');
+
+  if (!leadersEl || !cupEl || !motmEl || !gwEl || !cupTitleEl || !motmMonthEl) return;
+  if (homeLoaded && !force) return;
+
+  if (!force) {
+    leadersEl.innerHTML = '<div class="loading">Loading</div>';
+    cupEl.innerHTML = '<div class="loading">Loading</div>';
+    motmEl.innerHTML = '<div class="loading">Loading</div>';
+    gwEl.innerHTML = '<div class="loading">Loading</div>';
+  }
+
+  try {
+    const standingsReqs = LEAGUE_ORDER.map(leagueKey =>
+      fetch(`/api/standings/${leagueKey}`).then(r => r.json())
+    );
+    const gwReq = fetch('/api/gameweek/current').then(r => r.json());
+
+    const [standingsJson, gameweekJson] = await Promise.all([
+      Promise.all(standingsReqs),
+      gwReq,
+      loadHomeMOTM(),
+      loadHomeCup()
+    ]);
+
+    const standingsByLeague = {};
+    standingsJson.forEach((json, idx) => {
+      if (json.success) standingsByLeague[LEAGUE_ORDER[idx]] = json.data;
+    });
+    leadersEl.innerHTML = renderHomeLeaders(standingsByLeague);
+
+    if (gameweekJson.success) {
+      gwEl.innerHTML = renderHomeGameweek(gameweekJson.data);
+    } else {
+      gwEl.innerHTML = `<div class="error">Error loading current gameweek: ${gameweekJson.error || 'Unknown error'}</div>`;
+    }
+
+    homeLoaded = true;
+  } catch (e) {
+    leadersEl.innerHTML = `<div class="error">Error loading league leaders: ${e.message}</div>`;
+    gwEl.innerHTML = `<div class="error">Error loading current gameweek: ${e.message}</div>`;
+  }
+}
+
+function renderHomeLeaders(standingsByLeague) {
+  const cards = LEAGUE_ORDER.map(leagueKey => {
+    const rows = (standingsByLeague[leagueKey] || []).slice(0, 3);
+    const body = rows.length
+      ? rows.map(t => `
+        <div class="leader-row">
+          <span class="leader-rank">${t.rank}</span>
+          <span>${teamLink(t.teamName, t.teamId)}</span>
+          <span class="leader-record">W${t.w} D${t.d} L${t.l}</span>
+          <span class="leader-pts">${t.pts}pts</span>
+        </div>
+      `).join('')
+      : '<div class="empty" style="padding:0.8rem 0">No data</div>';
+    return `
+      <div class="leader-card">
+        <div class="leader-title">${LEAGUE_LABELS[leagueKey]}</div>
+        <div class="leader-list">${body}</div>
+      </div>
+    `;
+  }).join('');
+  return `<div class="leaders-grid">${cards}</div>`;
+}
+
+function renderHomeCup(matches) {
+  if (!matches.length) {
+    return '<div class="empty" style="padding:0.9rem 0">No matchups available yet</div>';
+  }
+  const cards = matches.map(m => {
+    return `
+      <div class="home-cup-card">
+        <div class="home-cup-line">
+          <span class="home-cup-team">${teamLink(m.home, m.home_id)}</span>
+          <span class="home-cup-score">${formatScore(m.home_agg || 0)} - ${formatScore(m.away_agg || 0)}</span>
+          <span class="home-cup-team">${teamLink(m.away, m.away_id)}</span>
+        </div>
+        <div class="home-cup-winner ${m.winner ? '' : 'pending'}">${m.winner ? 'Decided' : 'In progress'}</div>
+      </div>
+    `;
+  }).join('');
+  return `<div class="home-cup-list">${cards}</div>`;
+}
+
+function renderHomeMOTM(motmByLeague) {
+  const cards = LEAGUE_ORDER.map(leagueKey => {
+    const entry = motmByLeague[leagueKey];
+    const played = entry ? entry.results.filter(r => (r.w + r.d + r.l) > 0) : [];
+    if (!entry || !played.length) {
+      return `
+        <div class="home-motm-card">
+          <div class="home-motm-head">
+            <span class="home-motm-league">${LEAGUE_LABELS[leagueKey]}</span>
+            <span class="home-motm-status">No games</span>
+          </div>
+          <div class="empty" style="padding:0.8rem 0">No games played yet</div>
+        </div>
+      `;
+    }
+
+    const top3 = played.slice(0, 3);
+    const rows = top3.map((r, idx) => `
+      <div class="leader-row motm-row">
+        <span class="leader-rank">${r.rank}</span>
+        <span>${teamLink(r.team, r.teamId)}${idx === 0 && entry.month_complete ? ' <span class="leader-badge winner">Winner</span>' : ''}</span>
+        <span class="leader-record">W${r.w} D${r.d} L${r.l}</span>
+        <span class="leader-pf">PF ${formatScore(r.pf)}</span>
+        <span class="leader-pts">${r.pts}pts</span>
+      </div>
+    `).join('');
+
+    return `
+      <div class="home-motm-card">
+        <div class="home-motm-head">
+          <span class="home-motm-league">${LEAGUE_LABELS[leagueKey]}</span>
+          <span class="home-motm-status">${entry.month_complete ? 'Complete' : 'In progress'}</span>
+        </div>
+        <div class="home-motm-list">${rows}</div>
+      </div>
+    `;
+  }).join('');
+  return `<div class="home-motm-grid">${cards}</div>`;
+}
+
+function renderHomeGameweek(gameweekByLeague) {
+  const cards = LEAGUE_ORDER.map(leagueKey => {
+    const data = gameweekByLeague[leagueKey];
+    const gwLabel = data && data.gw ? `GW${data.gw}` : 'No completed GW';
+    const matches = (data && data.matches) || [];
+    const rows = matches.length
+      ? matches.map(m => `
+        <div class="home-gw-row">
+          <span class="home-team-home">${m.home}</span>
+          <span class="home-gw-score">${formatScore(m.home_score)} - ${formatScore(m.away_score)}</span>
+          <span class="home-team-away">${m.away}</span>
+        </div>
+      `).join('')
+      : '<div class="empty" style="padding:0.8rem 0">No completed fixtures</div>';
+
+    return `
+      <div class="home-gw-card">
+        <div class="home-gw-head">${LEAGUE_LABELS[leagueKey]} · ${gwLabel}</div>
+        <div class="home-gw-list">${rows}</div>
+      </div>
+    `;
+  }).join('');
+  return `<div class="home-gw-grid">${cards}</div>`;
+}
+
+// ── RULES ────────────────────────────────────────────────────────────────────
+let rulesAdminKey = '';
+let rulesMarkdown = '';
+
+async function loadRules() {
+  const display = document.getElementById('rules-display');
+  const editorWrap = document.getElementById('rules-editor-wrap');
+  const adminArea = document.getElementById('rules-admin-area');
+  if (!display || !editorWrap || !adminArea) return;
+
+  display.innerHTML = '<div class="loading">Loading</div>';
+  editorWrap.classList.remove('active');
+  adminArea.innerHTML = '';
+  try {
+    const res = await fetch('/api/rules');
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error || 'Failed to load rules');
+    rulesMarkdown = json.data.markdown || '';
+    setRulesDisplay(rulesMarkdown);
+    adminArea.innerHTML = '<button class="btn-discreet" onclick="unlockRulesAdmin(this)">Admin</button>';
+  } catch (e) {
+    display.innerHTML = `<div class="error">Error loading rules: ${e.message}</div>`;
+  }
+}
+
+async function unlockRulesAdmin(btn) {
+  const key = prompt('Enter admin key to edit rules');
+  if (!key) return;
+  try {
+    const res = await fetch('/api/rules/auth', {
+      headers: { 'X-Admin-Key': key }
+    });
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error || 'Unauthorized');
+    rulesAdminKey = key;
+    if (btn) btn.remove();
+    const editorWrap = document.getElementById('rules-editor-wrap');
+    const textarea = document.getElementById('rules-editor');
+    textarea.value = rulesMarkdown;
+    editorWrap.classList.add('active');
+    textarea.focus();
+  } catch (e) {
+    alert(`Admin access denied: ${e.message}`);
+  }
+}
+
+function cancelRulesEdit() {
+  rulesAdminKey = '';
+  document.getElementById('rules-editor-wrap').classList.remove('active');
+  document.getElementById('rules-admin-area').innerHTML = '<button class="btn-discreet" onclick="unlockRulesAdmin(this)">Admin</button>';
+}
+
+async function saveRules() {
+  if (!rulesAdminKey) {
+    alert('Admin key required');
+    return;
+  }
+  const markdown = document.getElementById('rules-editor').value;
+  try {
+    const res = await fetch('/api/rules', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'X-Admin-Key': rulesAdminKey
+      },
+      body: JSON.stringify({ markdown })
+    });
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error || 'Failed to save');
+    rulesMarkdown = markdown;
+    setRulesDisplay(rulesMarkdown);
+    document.getElementById('rules-editor-wrap').classList.remove('active');
+    rulesAdminKey = '';
+    document.getElementById('rules-admin-area').innerHTML = '<button class="btn-discreet" onclick="unlockRulesAdmin(this)">Admin</button>';
+    alert('Rules saved');
+  } catch (e) {
+    alert(`Error saving rules: ${e.message}`);
+  }
+}
+
+// ── TEAMS ────────────────────────────────────────────────────────────────────
+let teamsDirectoryData = null;
+
+async function loadTeams(force = false) {
+  const el = document.getElementById('teams-content');
+  if (!force && teamsDirectoryData) {
+    renderTeamsDirectory();
+    return;
+  }
+  el.innerHTML = '<div class="loading">Loading</div>';
+  try {
+    const res = await fetch('/api/teams');
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error);
+    teamsDirectoryData = json.data;
+    renderTeamsDirectory();
+    prefetchTeamProfiles(force);
+  } catch (e) {
+    el.innerHTML = `<div class="error">Error: ${e.message}</div>`;
+  }
+}
+
+function filterTeamsList() {
+  if (!teamsDirectoryData) return;
+  renderTeamsDirectory();
+}
+
+function renderTeamsDirectory() {
+  const el = document.getElementById('teams-content');
+  if (!teamsDirectoryData) {
+    el.innerHTML = '<div class="empty">No team data</div>';
+    return;
+  }
+  const query = (document.getElementById('teams-search')?.value || '').trim().toLowerCase();
+  const cards = LEAGUE_ORDER
+    .filter(key => teamsDirectoryData[key])
+    .map(key => teamsDirectoryData[key])
+    .map(league => {
+    const teams = league.teams.filter(t => !query || t.teamName.toLowerCase().includes(query));
+    const rows = teams.map(t => `<tr>
+      <td class="rank">${t.rank}</td>
+      <td>${teamLink(t.teamName, t.teamId)}</td>
+      <td class="num">${t.pts}</td>
+    </tr>`).join('');
+    const body = rows || '<tr><td colspan="3" class="empty" style="padding:1rem">No matching teams</td></tr>';
+    return `<div class="table-wrap">
+      <div class="table-title">${league.league_name}</div>
+      <div class="table-scroll"><table>
+        <thead><tr><th>#</th><th>Team</th><th class="num">Pts</th></tr></thead>
+        <tbody>${body}</tbody>
+      </table></div>
+    </div>`;
+  }).join('');
+  el.innerHTML = `<div class="teams-grid">${cards}</div>`;
+}
+
+// ── STANDINGS ────────────────────────────────────────────────────────────────
+async function loadStandings() {
+  const league = document.getElementById('standings-league').value;
+  const el = document.getElementById('standings-content');
+  el.innerHTML = '<div class="loading">Loading</div>';
+  try {
+    const res  = await fetch(`/api/standings/${league}`);
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error);
+    el.innerHTML = renderStandings(json.data, league);
+  } catch(e) {
+    el.innerHTML = `<div class="error">Error: ${e.message}</div>`;
+  }
+}
+
+function renderStandings(data, leagueKey) {
+  const leagueId = FANTRAX_LEAGUE_IDS[leagueKey];
+  const links = leagueId ? `
+    <div class="quick-links-card">
+      <div class="quick-links-title">Quick Links</div>
+      <div class="quick-links-list">
+        <a class="quick-link" href="https://www.fantrax.com/fantasy/league/${leagueId}/standings" target="_blank" rel="noopener noreferrer">Fantrax Standings</a>
+        <a class="quick-link" href="https://www.fantrax.com/fantasy/league/${leagueId}/live-scoring" target="_blank" rel="noopener noreferrer">Live Scores</a>
+        <a class="quick-link" href="https://www.fantrax.com/fantasy/league/${leagueId}/transactions" target="_blank" rel="noopener noreferrer">Transaction History</a>
+      </div>
+    </div>
+  ` : '';
+
+  const rows = data.map(t => {
+    let rankClass = '', badge = '';
+    if (t.rank === 1) {
+      rankClass = 'rank-1';
+      badge = '<span class="badge badge-gold">Leader</span>';
+    } else if (t.rank === 2 && leagueKey !== 'premier_league') {
+      rankClass = 'rank-2';
+      badge = '<span class="badge badge-green">Promotion</span>';
+    } else if ((t.rank === 11 || t.rank === 12) && leagueKey !== 'league_one') {
+      rankClass = 'rank-rel';
+      badge = '<span class="badge badge-red">Relegation</span>';
+    }
+    const pd      = t.pd >= 0 ? `+${t.pd.toFixed(2)}` : t.pd.toFixed(2);
+    const pdColor = t.pd >= 0 ? 'var(--accent)' : 'var(--accent2)';
+    return `<tr>
+      <td class="rank ${rankClass}">${t.rank}</td>
+      <td>${teamLink(t.teamName, t.teamId)}${badge}</td>
+      <td class="num">${t.w}</td>
+      <td class="num">${t.d}</td>
+      <td class="num">${t.l}</td>
+      <td class="num">${t.pf.toFixed(2)}</td>
+      <td class="num">${t.pa.toFixed(2)}</td>
+      <td class="num" style="color:${pdColor}">${pd}</td>
+      <td class="num" style="color:var(--accent);font-weight:700">${t.pts}</td>
+    </tr>`;
+  }).join('');
+
+  return `${links}<div class="table-wrap"><div class="table-scroll"><table>
+    <thead><tr>
+      <th>#</th><th>Team</th>
+      <th class="num">W</th><th class="num">D</th><th class="num">L</th>
+      <th class="num">PF</th><th class="num">PA</th>
+      <th class="num">PD</th><th class="num">Pts</th>
+    </tr></thead>
+    <tbody>${rows}</tbody>
+  </table></div></div>`;
+}
+
+// ── MOTM ─────────────────────────────────────────────────────────────────────
+async function loadMOTM() {
+  const league = document.getElementById('motm-league').value;
+  const month  = document.getElementById('motm-month').value;
+  const el     = document.getElementById('motm-content');
+  el.innerHTML = '<div class="loading">Loading</div>';
+  try {
+    const res  = await fetch(`/api/motm/${league}/${month}`);
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error);
+    el.innerHTML = renderMOTM(json.data, month);
+  } catch(e) {
+    el.innerHTML = `<div class="error">Error: ${e.message}</div>`;
+  }
+}
+
+function renderMOTM(data, month) {
+  const complete = (typeof data.month_complete === 'boolean')
+    ? data.month_complete
+    : isMonthComplete(month);
+  const played   = data.results.filter(r => (r.w + r.d + r.l) > 0);
+
+  let banner = '';
+  if (played.length === 0) {
+    banner = `<div class="motm-banner motm-pending-card">
+      <div class="motm-trophy">📅</div>
+      <div>
+        <div class="motm-label">${month} — Not Started</div>
+        <div class="motm-name motm-name-none">No games played yet</div>
+      </div>
+    </div>`;
+  } else if (complete) {
+    const w = played[0];
+    banner = `<div class="motm-banner motm-winner-card">
+      <div class="motm-trophy">🏆</div>
+      <div>
+        <div class="motm-label">${month} Manager of the Month</div>
+        <div class="motm-name motm-name-won">${w.team}</div>
+        <div class="motm-detail">${w.pts} pts · ${w.w}W ${w.d}D ${w.l}L · ${w.pf.toFixed(2)} PF</div>
+      </div>
+    </div>`;
+  } else {
+    const l = played[0];
+    banner = `<div class="motm-banner motm-pending-card">
+      <div class="motm-trophy">📊</div>
+      <div>
+        <div class="motm-label">${month} — In Progress</div>
+        <div class="motm-name motm-name-live">${l.team} leads</div>
+        <div class="motm-detail">${l.pts} pts · ${l.w}W ${l.d}D ${l.l}L · Winner declared when month ends</div>
+      </div>
+    </div>`;
+  }
+
+  const rows = data.results.map(r => `<tr>
+    <td class="rank ${r.rank===1?'rank-1':''}">${r.rank}</td>
+    <td>${teamLink(r.team, r.teamId)}</td>
+    <td class="num">${r.pts}</td>
+    <td class="num">${r.w}</td>
+    <td class="num">${r.d}</td>
+    <td class="num">${r.l}</td>
+    <td class="num">${r.pf.toFixed(2)}</td>
+    <td class="num">${r.pa.toFixed(2)}</td>
+  </tr>`).join('');
+
+  return `${banner}
+    <div class="table-wrap">
+      <div class="table-title">Gameweeks: ${data.gameweeks.join(', ')}</div>
+      <div class="table-scroll"><table>
+        <thead><tr>
+          <th>#</th><th>Team</th>
+          <th class="num">Pts</th><th class="num">W</th><th class="num">D</th><th class="num">L</th>
+          <th class="num">PF</th><th class="num">PA</th>
+        </tr></thead>
+        <tbody>${rows}</tbody>
+      </table></div>
+    </div>`;
+}
+
+// ── CUP ──────────────────────────────────────────────────────────────────────
+let cupInitialised = false;
+const DRAW_ENABLED_ROUNDS = new Set(['quarter_final', 'semi_final', 'final']);
+const DRAW_TEAMS_BY_ROUND = {};
+let drawAdminKeyByRound = {};
+
+function getAdminHeaders(round) {
+  const key = drawAdminKeyByRound[round] || '';
+  return key ? { 'X-Admin-Key': key } : {};
+}
+
+async function unlockDrawAdmin(round, triggerBtn = null) {
+  const key = prompt('Enter admin key to manage cup draws');
+  if (!key) return;
+
+  try {
+    const res = await fetch(`/api/cup/draw/options/${round}`, {
+      headers: { 'X-Admin-Key': key }
+    });
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error || 'Admin check failed');
+    drawAdminKeyByRound[round] = key;
+    if (triggerBtn) {
+      const wrap = triggerBtn.closest('.draw-unlock');
+      if (wrap) wrap.remove();
+    }
+    openDrawBuilder(round);
+  } catch (e) {
+    alert(`Admin access denied: ${e.message}`);
+  }
+}
+
+async function initCup() {
+  if (cupInitialised) return;
+  cupInitialised = true;
+  try {
+    const res  = await fetch('/api/cup/current_round');
+    const json = await res.json();
+    const round = json.success ? json.data : 'groups';
+    activateCupTab(round);
+    if (round === 'groups') loadCupGroups();
+    else loadCupRound(round);
+  } catch(e) {
+    activateCupTab('groups');
+    loadCupGroups();
+  }
+}
+
+function activateCupTab(round) {
+  document.querySelectorAll('.cup-tab').forEach(t => {
+    t.classList.toggle('active', t.dataset.round === round);
+  });
+  document.querySelectorAll('.cup-round').forEach(r => r.classList.remove('active'));
+  document.getElementById('cup-' + round).classList.add('active');
+}
+
+function showCupRound(round, btn) {
+  activateCupTab(round);
+  if (round === 'groups') loadCupGroups();
+  else loadCupRound(round);
+}
+
+async function loadCupGroups() {
+  const el = document.getElementById('cup-groups');
+  if (el.dataset.loaded) return;
+  el.innerHTML = '<div class="loading">Loading</div>';
+  try {
+    const res  = await fetch('/api/cup/groups');
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error);
+    el.innerHTML = renderGroups(json.data);
+    el.dataset.loaded = '1';
+  } catch(e) {
+    el.innerHTML = `<div class="error">Error: ${e.message}</div>`;
+  }
+}
+
+function renderGroups(groups) {
+  const topWinnerIds = new Set(
+    Object.values(groups)
+      .map(teams => teams.find(t => t.rank === 1))
+      .filter(Boolean)
+      .sort((a, b) => (b.pts - a.pts) || (b.pf - a.pf))
+      .slice(0, 8)
+      .map(t => t.id)
+  );
+
+  const cards = Object.entries(groups).map(([name, teams]) => {
+    const rows = teams.map(t => {
+      let rankClass = '', badge = '';
+      if (t.rank === 1 && topWinnerIds.has(t.id)) {
+        rankClass = 'rank-1';
+        badge = '<span class="badge badge-gold">R16</span>';
+      } else if (t.rank === 1 || t.rank === 2) {
+        rankClass = 'rank-2';
+        badge = '<span class="badge badge-green">PO</span>';
+      }
+      return `<tr>
+        <td class="rank ${rankClass}">${t.rank}</td>
+        <td>${teamLink(t.name, t.id)}${badge}</td>
+        <td class="num">${t.pts}</td>
+        <td class="num">${t.w}</td>
+        <td class="num">${t.d}</td>
+        <td class="num">${t.l}</td>
+        <td class="num">${t.pf.toFixed(1)}</td>
+      </tr>`;
+    }).join('');
+    return `<div class="table-wrap">
+      <div class="table-title">Group ${name}</div>
+      <div class="table-scroll"><table>
+        <thead><tr>
+          <th>#</th><th>Team</th>
+          <th class="num">Pts</th><th class="num">W</th><th class="num">D</th><th class="num">L</th>
+          <th class="num">PF</th>
+        </tr></thead>
+        <tbody>${rows}</tbody>
+      </table></div>
+    </div>`;
+  }).join('');
+  return `<div class="groups-grid">${cards}</div>`;
+}
+
+async function loadCupRound(round, force = false) {
+  const el = document.getElementById('cup-' + round);
+  if (el.dataset.loaded && !force) return;
+  el.innerHTML = '<div class="loading">Loading</div>';
+  try {
+    const res  = await fetch(`/api/cup/round/${round}`);
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error);
+    if (!json.data.length) {
+      const drawUi = DRAW_ENABLED_ROUNDS.has(round)
+        ? `<div class="draw-unlock" style="display:flex;justify-content:center;margin-top:0.75rem">
+             <button class="btn" onclick="unlockDrawAdmin('${round}', this)">Admin Unlock</button>
+           </div>
+           <div id="draw-builder-${round}" style="margin-top:0.75rem"></div>`
+        : '';
+      el.innerHTML = `<div class="empty">No matches drawn yet</div>${drawUi}`;
+      return;
+    }
+    el.innerHTML = renderCupRound(json.data, round);
+    el.dataset.loaded = '1';
+  } catch(e) {
+    el.innerHTML = `<div class="error">Error: ${e.message}</div>`;
+  }
+}
+
+function refreshActiveCupRound(force = false) {
+  const activeTab = document.querySelector('.cup-tab.active');
+  if (!activeTab) return;
+  const round = activeTab.dataset.round;
+  if (!round || round === 'groups') return;
+  loadCupRound(round, force);
+}
+
+function renderCupRound(matches, round) {
+  const cards = matches.map(m => {
+    const homeWin = m.winner === m.home;
+    const awayWin = m.winner === m.away;
+    const l1h = m.leg1_home !== null ? m.leg1_home : '–';
+    const l1a = m.leg1_away !== null ? m.leg1_away : '–';
+    const l2h = m.leg2_home !== null ? m.leg2_home : '–';
+    const l2a = m.leg2_away !== null ? m.leg2_away : '–';
+
+    return `<div class="match-card">
+      <div class="match-agg">
+        <div class="match-team home" style="${homeWin?'color:var(--gold)':''}">${teamLink(m.home, m.home_id)}</div>
+        <div class="match-score">${m.home_agg ?? 0} – ${m.away_agg ?? 0}</div>
+        <div class="match-team" style="${awayWin?'color:var(--gold)':''}">${teamLink(m.away, m.away_id)}</div>
+      </div>
+      <div class="match-leg-row">
+        <span class="leg-label">GW${m.leg1_gw} · Leg 1</span>
+        <div class="leg-scores">
+          <span class="leg-home">${l1h}</span>
+          <span class="leg-dash">–</span>
+          <span class="leg-away">${l1a}</span>
+        </div>
+        <span class="leg-spacer" aria-hidden="true"></span>
+      </div>
+      <div class="match-leg-row">
+        <span class="leg-label">GW${m.leg2_gw} · Leg 2</span>
+        <div class="leg-scores">
+          <span class="leg-home">${l2h}</span>
+          <span class="leg-dash">–</span>
+          <span class="leg-away">${l2a}</span>
+        </div>
+        <span class="leg-spacer" aria-hidden="true"></span>
+      </div>
+      ${m.winner
+        ? `<div class="match-winner-label" style="color:var(--gold)">⚡ ${teamLink(m.winner, m.winner_id)} advances</div>`
+        : `<div class="match-winner-label" style="color:var(--muted)">In progress</div>`}
+    </div>`;
+  }).join('');
+
+  return `<div style="max-width:680px">
+    <div style="display:flex;justify-content:flex-end;margin-bottom:1rem">
+      <button class="btn btn-secondary" onclick="refreshCupRound('${round}')">↻ Refresh Scores</button>
+    </div>
+    ${cards}
+  </div>`;
+}
+
+async function renderDrawBuilder(round) {
+  try {
+    const res = await fetch(`/api/cup/draw/options/${round}`, { headers: getAdminHeaders(round) });
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error);
+    const teams = json.data.teams || [];
+    if (teams.length < 2) return '<div class="empty">No advanced teams available yet</div>';
+    if (teams.length % 2 !== 0) return '<div class="error">Advanced team count is invalid for draw creation</div>';
+
+    DRAW_TEAMS_BY_ROUND[round] = teams;
+    const opts = teams
+      .map(t => `<option value="${t.id}">${t.name}</option>`)
+      .join('');
+    const pairCount = teams.length / 2;
+    const rows = Array.from({ length: pairCount }).map((_, i) => `
+      <div class="draw-row">
+        <select id="draw-${round}-home-${i}" onchange="updateDrawOptions('${round}', ${pairCount})">
+          <option value="">Home team</option>
+          ${opts}
+        </select>
+        <div class="draw-vs">vs</div>
+        <select id="draw-${round}-away-${i}" onchange="updateDrawOptions('${round}', ${pairCount})">
+          <option value="">Away team</option>
+          ${opts}
+        </select>
+      </div>
+    `).join('');
+
+    return `
+      <div class="draw-builder">
+        <h3>Create ${round.replaceAll('_', ' ')}</h3>
+        ${rows}
+        <div class="draw-actions">
+          <button class="btn" onclick="saveDraw('${round}', ${pairCount})">Save Draw</button>
+        </div>
+      </div>
+    `;
+  } catch (e) {
+    if (`${e.message}`.toLowerCase().includes('unauthorized')) {
+      return `<div class="error">Admin access required to create draws</div>`;
+    }
+    return `<div class="error">Error loading draw options: ${e.message}</div>`;
+  }
+}
+
+async function openDrawBuilder(round) {
+  const mount = document.getElementById(`draw-builder-${round}`);
+  if (!mount) return;
+  mount.innerHTML = '<div class="loading">Loading</div>';
+  const html = await renderDrawBuilder(round);
+  mount.innerHTML = html;
+  const teams = DRAW_TEAMS_BY_ROUND[round] || [];
+  if (teams.length >= 2) updateDrawOptions(round, teams.length / 2);
+}
+
+function updateDrawOptions(round, pairCount) {
+  const teams = DRAW_TEAMS_BY_ROUND[round] || [];
+  if (!teams.length) return;
+
+  const selected = new Set();
+  for (let i = 0; i < pairCount; i++) {
+    const home = document.getElementById(`draw-${round}-home-${i}`)?.value;
+    const away = document.getElementById(`draw-${round}-away-${i}`)?.value;
+    if (home) selected.add(home);
+    if (away) selected.add(away);
+  }
+
+  for (let i = 0; i < pairCount; i++) {
+    const ids = [
+      `draw-${round}-home-${i}`,
+      `draw-${round}-away-${i}`
+    ];
+    for (const id of ids) {
+      const select = document.getElementById(id);
+      if (!select) continue;
+      const current = select.value;
+      const placeholder = id.includes('-home-') ? 'Home team' : 'Away team';
+      const options = teams
+        .filter(t => t.id === current || !selected.has(t.id))
+        .map(t => `<option value="${t.id}">${t.name}</option>`)
+        .join('');
+      select.innerHTML = `<option value="">${placeholder}</option>${options}`;
+      select.value = current;
+    }
+  }
+}
+
+async function saveDraw(round, pairCount) {
+  const matches = [];
+  const used = new Set();
+
+  for (let i = 0; i < pairCount; i++) {
+    const home = document.getElementById(`draw-${round}-home-${i}`).value;
+    const away = document.getElementById(`draw-${round}-away-${i}`).value;
+    if (!home || !away) {
+      alert('Please select all teams before saving the draw.');
+      return;
+    }
+    if (home === away) {
+      alert('A team cannot be drawn against itself.');
+      return;
+    }
+    if (used.has(home) || used.has(away)) {
+      alert('Each team can only appear once in the draw.');
+      return;
+    }
+    used.add(home);
+    used.add(away);
+    matches.push({ home, away });
+  }
+
+  try {
+    const res = await fetch(`/api/cup/draw/${round}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', ...getAdminHeaders(round) },
+      body: JSON.stringify({ matches })
+    });
+    const json = await res.json();
+    if (!json.success) throw new Error(json.error || 'Failed to save draw');
+    alert('Draw saved');
+    const el = document.getElementById('cup-' + round);
+    delete el.dataset.loaded;
+    loadCupRound(round);
+  } catch (e) {
+    alert(`Error saving draw: ${e.message}`);
+  }
+}
+
+async function refreshCupRound(round) {
+  const el = document.getElementById('cup-' + round);
+  delete el.dataset.loaded;
+  await loadCupRound(round, true);
+}
+
+function fixtureLine(f) {
+  const venue = f.is_home ? 'vs' : '@';
+  const opp = f.opponent_rank ? `${f.opponent} (${formatOrdinal(f.opponent_rank)})` : f.opponent;
+  if (!f.played) return `GW${f.gw} · ${venue} ${opp}`;
+  return `GW${f.gw} · ${f.result} ${f.team_score}-${f.opp_score} ${venue} ${opp}`;
+}
+
+// Profiles carry live scores and fixtures, so cached ones are refetched after this.
+const PROFILE_TTL_MS = 60000;
+let profileCache = {};
+let profilePrefetch = null;
+let profilePrefetchAt = 0;
+
+function isProfileFresh(fetchedAt) {
+  return Date.now() - fetchedAt < PROFILE_TTL_MS;
+}
+
+function prefetchTeamProfiles(force = false) {
+  if (profilePrefetch && !force && isProfileFresh(profilePrefetchAt)) return profilePrefetch;
+  profilePrefetchAt = Date.now();
+  profilePrefetch = fetch('/api/team/profiles')
+    .then(r => r.json())
+    .then(json => {
+      if (!json.success) return;
+      const fetchedAt = Date.now();
+      Object.entries(json.data.profiles).forEach(([teamId, data]) => {
+        profileCache[teamId] = { data, fetchedAt };
+      });
+    })
+    .catch(() => {});
+  return profilePrefetch;
+}
+
+async function fetchTeamProfile(teamId) {
+  const cached = profileCache[teamId];
+  if (cached && isProfileFresh(cached.fetchedAt)) return cached.data;
+  const res = await fetch(`/api/team/profile/${teamId}`);
+  const json = await res.json();
+  if (!json.success) throw new Error(json.error || 'Failed to load profile');
+  profileCache[teamId] = { data: json.data, fetchedAt: Date.now() };
+  return json.data;
+}
+
+async function openTeamProfile(teamId) {
+  clearHomeAutoRefresh();
+  clearCupAutoRefresh();
+  const content = document.getElementById('team-profile-content');
+  const title = document.getElementById('profile-title');
+  const subtitle = document.getElementById('profile-subtitle');
+  document.querySelectorAll('.section').forEach(s => s.classList.remove('active'));
+  document.getElementById('section-team-profile').classList.add('active');
+  setNavActive('teams');
+  content.innerHTML = '<div class="loading">Loading</div>';
+  title.textContent = 'Team Profile';
+  subtitle.textContent = '';
+
+  try {
+    const p = await fetchTeamProfile(teamId);
+    title.textContent = p.team.name;
+    subtitle.textContent = `${p.team.league_name} · ${formatOrdinal(p.league.rank)}`;
+
+    const last5 = p.fixtures.last5.length
+      ? p.fixtures.last5.map(f => `<div class="profile-list-item"><span>${fixtureLine(f)}</span></div>`).join('')
+      : '<div class="empty" style="padding:0.8rem 0">No results yet</div>';
+    const next5 = p.fixtures.next5.length
+      ? p.fixtures.next5.map(f => `<div class="profile-list-item"><span>${fixtureLine(f)}</span></div>`).join('')
+      : '<div class="empty" style="padding:0.8rem 0">No upcoming fixtures</div>';
+    const motmAwards = p.motm.awards.length
+      ? p.motm.awards.map(a => `<div class="profile-list-item"><span>${a.month}</span><span>${a.league}</span></div>`).join('')
+      : '<div class="empty" style="padding:0.8rem 0">No MOTM awards</div>';
+    const fantraxLink = p.team.fantrax_url
+      ? `<a class="profile-link" href="${p.team.fantrax_url}" target="_blank" rel="noopener noreferrer">Open public Fantrax page</a>`
+      : '<span class="empty" style="padding:0.8rem 0">Fantrax link unavailable</span>';
+
+    content.innerHTML = `
+      <div class="profile-grid">
+        <div class="profile-block">
+          <div class="profile-title">League Snapshot</div>
+          <div class="profile-row"><span>Position</span><span>${formatOrdinal(p.league.rank)}</span></div>
+          <div class="profile-row"><span>Played</span><span>${p.league.played}</span></div>
+          <div class="profile-row"><span>Total Points Scored</span><span>${p.league.pf.toFixed(2)}</span></div>
+          <div class="profile-row"><span>Average PPG</span><span>${p.league.avg_ppg.toFixed(2)}</span></div>
+          <div class="profile-row"><span>Cup Progress</span><span>${p.cup.progress}</span></div>
+        </div>
+        <div class="profile-block">
+          <div class="profile-title">Manager Of The Month</div>
+          <div class="profile-row"><span>Total Awards</span><span>${p.motm.count}</span></div>
+          <div class="profile-list">${motmAwards}</div>
+        </div>
+        <div class="profile-block">
+          <div class="profile-title">Last 5 Results</div>
+          <div class="profile-list">${last5}</div>
+        </div>
+        <div class="profile-block">
+          <div class="profile-title">Next 5 Fixtures</div>
+          <div class="profile-list">${next5}</div>
+        </div>
+        <div class="profile-block" style="grid-column:1 / -1">
+          <div class="profile-title">Links</div>
+          ${fantraxLink}
+        </div>
+      </div>
+    `;
+  } catch (e) {
+    content.innerHTML = `<div class="error">Error loading profile: ${e.message}</div>`;
+  }
+}
+
+// ── INIT ─────────────────────────────────────────────────────────────────────
+loadHome();
+startHomeAutoRefresh();
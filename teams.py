@@ -0,0 +1,86 @@
+import os
+import json
+import logging
+import threading
+from fantrax import add_schedule_listener, get_team_id_map, normalize
+from cup import load_cup_config
+
+logger = logging.getLogger(__name__)
+
+# Last known id -> {"name", "league"} for every team, kept across restarts.
+TEAM_DIRECTORY_FILE = os.environ.get("TEAM_DIRECTORY_FILE", "data/teams.json")
+
+_lock = threading.Lock()
+# Both replaced, never mutated, so readers can use them without the lock.
+_teams = {}
+_names = {}
+# Bumped whenever they are replaced.
+_version = 0
+
+def _seed():
+    """cup.json team_ids, overlaid with the names last seen in the schedules."""
+    teams = {}
+    for league_key, ids_by_name in load_cup_config().get("team_ids", {}).items():
+        for name, team_id in ids_by_name.items():
+            teams[team_id] = {"name": normalize(name), "league": league_key}
+    if os.path.exists(TEAM_DIRECTORY_FILE):
+        try:
+            with open(TEAM_DIRECTORY_FILE, encoding="utf-8") as f:
+                teams.update(json.load(f))
+        except (OSError, ValueError):
+            logger.exception("Ignoring unreadable team directory %s", TEAM_DIRECTORY_FILE)
+    return teams
+
+def _save(teams):
+    directory = os.path.dirname(TEAM_DIRECTORY_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = TEAM_DIRECTORY_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(teams, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, TEAM_DIRECTORY_FILE)
+
+def update_from_gameweeks(league_key, gameweeks):
+    """Record new teams and renames from a fetched schedule; returns the changed ids."""
+    global _teams, _names, _version
+    seen = get_team_id_map(league_key, gameweeks=gameweeks)
+    with _lock:
+        changed = {
+            team_id: {"name": name, "league": league_key}
+            for team_id, name in seen.items()
+            if _teams.get(team_id) != {"name": name, "league": league_key}
+        }
+        if not changed:
+            return []
+        teams = {**_teams, **changed}
+        _teams = teams
+        _names = {team_id: team["name"] for team_id, team in teams.items()}
+        _version += 1
+        try:
+            _save(teams)
+        except OSError:
+            logger.exception("Failed to save team directory")
+    return list(changed)
+
+def _on_schedule_change(league_key, previous, gameweeks):
+    try:
+        update_from_gameweeks(league_key, gameweeks)
+    except Exception:
+        # Never let the directory break the fetch that triggered it.
+        logger.exception("Failed to update team directory from %s", league_key)
+
+def get_team_names():
+    """id -> name for every known team. Shared, so treat as read-only; never fetches."""
+    return _names
+
+def get_directory_version():
+    return _version
+
+def get_team_league(team_id):
+    team = _teams.get(team_id)
+    return team["league"] if team else None
+
+_teams = _seed()
+_names = {team_id: team["name"] for team_id, team in _teams.items()}
+# Every schedule fetch, from viewers, warm-up or the live poller, carries renames in.
+add_schedule_listener(_on_schedule_change)
@@ -0,0 +1,133 @@
+import os
+import time
+import heapq
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Priority classes, most urgent first.
+LIVE = 0        # refreshing a gameweek that is being played
+USER = 1        # a viewer's request missed the cache
+BACKGROUND = 2  # warm-up, exports, reports, archiving
+PRIORITY_NAMES = {LIVE: "live", USER: "user", BACKGROUND: "background"}
+
+# Longest a call of each class queues for budget before giving up.
+DEADLINES = {LIVE: 15.0, USER: 5.0, BACKGROUND: 120.0}
+
+# Sustained Fantrax requests per second (0 = unlimited) and how many may burst.
+UPSTREAM_RPS = float(os.environ.get("FANTRAX_RPS", "2"))
+UPSTREAM_BURST = float(os.environ.get("FANTRAX_BURST", "4"))
+
+class UpstreamBusy(Exception):
+    """The request budget couldn't fit a call before its deadline."""
+
+class RequestScheduler:
+    """Token bucket shared by every upstream call.
+
+    Waiting calls are granted strictly by priority class, then arrival
+    order, so a burst of cold misses can't starve live refreshes.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._queue = []  # heap of (priority, seq) tickets
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stats = {name: {"calls": 0, "expired": 0, "waited": 0.0} for name in PRIORITY_NAMES.values()}
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=USER, timeout=None):
+        """Block until a call of this priority may go upstream; raises UpstreamBusy on deadline."""
+        stats = self._stats[PRIORITY_NAMES[priority]]
+        if self.rate <= 0:
+            with self._cond:
+                stats["calls"] += 1
+            return
+        started = time.monotonic()
+        deadline = started + (DEADLINES[priority] if timeout is None else timeout)
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    first = self._queue[0] == ticket
+                    if first and self._tokens >= 1:
+                        self._tokens -= 1
+                        heapq.heappop(self._queue)
+                        stats["calls"] += 1
+                        stats["waited"] += now - started
+                        return
+                    if now >= deadline:
+                        self._queue.remove(ticket)
+                        heapq.heapify(self._queue)
+                        stats["expired"] += 1
+                        raise UpstreamBusy(
+                            f"Fantrax request budget exhausted ({PRIORITY_NAMES[priority]} call "
+                            f"waited {now - started:.1f}s)"
+                        )
+                    wait = deadline - now
+                    if first:
+                        wait = min(wait, (1 - self._tokens) / self.rate)
+                    self._cond.wait(wait)
+            finally:
+                # Let the next ticket re-check whether it is now at the head.
+                self._cond.notify_all()
+
+    def refund(self, priority):
+        """Hand back a grant that wasn't used, e.g. another caller already fetched the data."""
+        with self._cond:
+            self._stats[PRIORITY_NAMES[priority]]["calls"] -= 1
+            if self.rate > 0:
+                self._refill(time.monotonic())
+                self._tokens = min(self.burst, self._tokens + 1)
+                self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "queued": len(self._queue),
+                "classes": {
+                    name: {**s, "waited": round(s["waited"], 2)} for name, s in self._stats.items()
+                }
+            }
+
+scheduler = RequestScheduler(UPSTREAM_RPS, UPSTREAM_BURST)
+
+_priority = contextvars.ContextVar("upstream_priority", default=None)
+_default_priority = USER
+
+def set_default_priority(priority):
+    """Priority for calls made outside any upstream_priority() block.
+
+    The export, report and archive CLIs set BACKGROUND, so batch jobs never
+    compete with viewers or live refreshes for the request budget. A default
+    is needed there because their worker pools don't inherit context.
+    """
+    global _default_priority
+    _default_priority = priority
+
+def current_priority():
+    priority = _priority.get()
+    return _default_priority if priority is None else priority
+
+@contextmanager
+def upstream_priority(priority):
+    """Run upstream calls made in this block (on this thread) at `priority`."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
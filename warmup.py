@@ -0,0 +1,135 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fantrax import (
+    CACHE_MAX_LEAGUES,
+    LEAGUES,
+    get_active_leagues,
+    get_cached_leagues,
+    get_data_ages,
+    get_gameweeks,
+    get_standings,
+    restore_snapshots
+)
+from cup import get_cup_index
+from upstream import BACKGROUND, scheduler, upstream_priority
+
+logger = logging.getLogger(__name__)
+
+# /readyz fails once a warmed or active league's schedule or standings are older than this.
+READY_MAX_AGE = float(os.environ.get("READY_MAX_AGE", "600"))
+# After warm-up, warmed and active leagues are refetched at this age even
+# without viewers so a quiet instance stays ready.
+WARM_REFRESH_SECONDS = READY_MAX_AGE / 2
+# A cached league stays active this long after its last request (or while a
+# gameweek is in progress). Other leagues are left to age out of the LRU and
+# be fetched again lazily.
+WARM_ACTIVE_SECONDS = float(os.environ.get("WARM_ACTIVE_SECONDS", "3600"))
+
+_state = {"finished_at": None, "restored": [], "warmed": [], "errors": {}}
+_lock = threading.Lock()
+_worker = None
+
+def _warm_league(league_key, max_age=None):
+    with upstream_priority(BACKGROUND):
+        gameweeks = get_gameweeks(league_key, max_age=max_age)
+        get_standings(league_key, gameweeks=gameweeks, max_age=max_age)
+
+def warm_start(workers=4):
+    """Restore snapshots, fetch leagues older than the TTL and build the cup index.
+
+    Only as many leagues as the cache holds are fetched; the rest would just
+    evict each other.
+    """
+    with _lock:
+        _state["finished_at"] = None
+        _state["errors"] = {}
+    restored = restore_snapshots()
+    fetched = list(LEAGUES)[:CACHE_MAX_LEAGUES]
+    with _lock:
+        _state["restored"] = restored
+        _state["warmed"] = [league_key for league_key in LEAGUES if league_key in restored or league_key in fetched]
+
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        jobs = {league_key: pool.submit(_warm_league, league_key) for league_key in fetched}
+        for league_key, job in jobs.items():
+            try:
+                job.result()
+            except Exception as e:
+                logger.exception("Warm start failed for %s", league_key)
+                errors[league_key] = str(e)
+    try:
+        get_cup_index()
+    except Exception as e:
+        logger.exception("Warm start failed for cup index")
+        errors["cup"] = str(e)
+
+    with _lock:
+        _state["errors"] = errors
+        _state["finished_at"] = time.time()
+    return errors
+
+def _tracked_leagues():
+    """Active leagues plus those warm-up fetched or restored that are still cached.
+
+    Refreshing a league that is already cached never evicts another one.
+    """
+    with _lock:
+        warmed = list(_state["warmed"])
+    cached = set(get_cached_leagues())
+    tracked = get_active_leagues(WARM_ACTIVE_SECONDS)
+    tracked += [league_key for league_key in warmed if league_key in cached and league_key not in tracked]
+    return tracked
+
+def _warm_loop(interval):
+    warm_start()
+    while interval > 0:
+        time.sleep(interval)
+        for league_key in _tracked_leagues():
+            try:
+                _warm_league(league_key, max_age=interval)
+            except Exception:
+                logger.exception("Keep-warm refresh failed for %s", league_key)
+
+def start_warmup(interval=None):
+    """Warm the caches in the background, then keep tracked leagues within READY_MAX_AGE."""
+    global _worker
+    interval = WARM_REFRESH_SECONDS if interval is None else interval
+    if _worker is not None:
+        return None
+    _worker = threading.Thread(target=_warm_loop, args=(interval,), name="warmup", daemon=True)
+    _worker.start()
+    return _worker
+
+def readiness():
+    """(ready, detail): warm-up has finished, every league it failed on has some
+    data, and every warmed or active league has fresh data.
+
+    Other leagues, cached ("idle") or not ("cold"), are listed but don't
+    affect readiness; they are fetched on the next request.
+    """
+    with _lock:
+        state = dict(_state)
+    cached = set(get_cached_leagues())
+    leagues = {league_key: get_data_ages(league_key) for league_key in _tracked_leagues()}
+    stale = [
+        league_key for league_key, ages in leagues.items()
+        if any(age is not None and age > READY_MAX_AGE for age in ages.values())
+    ]
+    failed = [league_key for league_key in state["errors"] if league_key in LEAGUES and league_key not in cached]
+    ready = state["finished_at"] is not None and not stale and not failed
+    return ready, {
+        "ready": ready,
+        "warmed": state["finished_at"] is not None,
+        "restored": state["restored"],
+        "errors": state["errors"],
+        "failed": failed,
+        "stale": stale,
+        "leagues": leagues,
+        "idle": [league_key for league_key in LEAGUES if league_key in cached and league_key not in leagues],
+        "cold": [league_key for league_key in LEAGUES if league_key not in cached],
+        "upstream": scheduler.stats()
+    }